@@ -0,0 +1,213 @@
+"""
+Activity analytics
+Loads every run timestamp of the activity log into NumPy arrays in one
+pass, memory-mapping large files, and computes histograms, AI ratio,
+gaps and rolling success rates with vectorized operations.
+"""
+
+import gzip
+from pathlib import Path
+
+import numpy as np
+
+from log_segments import SegmentedLog
+
+# Live logs above this size are memory-mapped instead of read
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Every entry ends with 'YYYY-MM-DD HH:MM:SS UTC'
+SUFFIX = np.frombuffer(b" UTC", dtype=np.uint8)
+STAMP_WIDTH = 19
+ENTRY_TAIL = STAMP_WIDTH + len(SUFFIX)
+
+KIND_OTHER, KIND_AI, KIND_TEMPLATE = 0, 1, 2
+KIND_PREFIXES = (
+    (KIND_AI, np.frombuffer(b"[AI] ", dtype=np.uint8)),
+    (KIND_TEMPLATE, np.frombuffer(b"[Template] ", dtype=np.uint8)),
+)
+
+SECONDS_PER_DAY = 86400
+
+
+def days_from_civil(year, month, day):
+    """Days since 1970-01-01 for arrays of proleptic Gregorian dates"""
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_buffer(buf):
+    """(epoch seconds, kinds) of every entry line in a uint8 buffer"""
+    ends = np.flatnonzero(buf == ord("\n"))
+    if len(buf) and buf[-1] != ord("\n"):
+        ends = np.append(ends, len(buf))
+    starts = np.concatenate(([0], ends[:-1] + 1)) if len(ends) else ends
+
+    # Drop Windows line endings
+    has_cr = (ends > starts) & (buf[np.maximum(ends - 1, 0)] == ord("\r"))
+    ends = ends - has_cr
+
+    candidates = ends - starts >= ENTRY_TAIL
+    starts, ends = starts[candidates], ends[candidates]
+
+    suffix = buf[ends[:, None] + np.arange(-len(SUFFIX), 0)]
+    entries = (suffix == SUFFIX).all(axis=1)
+    starts, ends = starts[entries], ends[entries]
+
+    stamps = buf[(ends - ENTRY_TAIL)[:, None] + np.arange(STAMP_WIDTH)]
+    valid = ((stamps[:, [4, 7]] == ord("-")).all(axis=1)
+             & (stamps[:, 10] == ord(" "))
+             & (stamps[:, [13, 16]] == ord(":")).all(axis=1))
+    starts, stamps = starts[valid], stamps[valid]
+
+    digits = stamps.astype(np.int64) - ord("0")
+
+    def field(first, width):
+        value = digits[:, first]
+        for column in range(first + 1, first + width):
+            value = value * 10 + digits[:, column]
+        return value
+
+    days = days_from_civil(field(0, 4), field(5, 2), field(8, 2))
+    seconds = days * SECONDS_PER_DAY + field(11, 2) * 3600 + field(14, 2) * 60 + field(17, 2)
+
+    kinds = np.full(len(starts), KIND_OTHER, dtype=np.int8)
+    for kind, prefix in KIND_PREFIXES:
+        head = buf[np.minimum(starts[:, None] + np.arange(len(prefix)), len(buf) - 1)]
+        kinds[(head == prefix).all(axis=1)] = kind
+
+    return seconds, kinds
+
+
+def load_buffer(path):
+    """Bytes of a live log as uint8 array, memory-mapped when large"""
+    size = path.stat().st_size if path.exists() else 0
+    if not size:
+        return np.zeros(0, dtype=np.uint8)
+    if size >= MMAP_THRESHOLD:
+        return np.memmap(path, dtype=np.uint8, mode='r')
+    return np.fromfile(path, dtype=np.uint8)
+
+
+def load_activity(log_file="autonomous_logs.txt", segments_dir="logs"):
+    """Timestamps and kinds of every run, across segments and the live log"""
+    activity_log = SegmentedLog(log_file, segments_dir)
+
+    parts = []
+    for segment in activity_log.manifest["segments"]:
+        with gzip.open(activity_log.segment_path(segment), 'rb') as f:
+            parts.append(parse_buffer(np.frombuffer(f.read(), dtype=np.uint8)))
+    parts.append(parse_buffer(load_buffer(Path(log_file))))
+
+    seconds = np.concatenate([part[0] for part in parts])
+    kinds = np.concatenate([part[1] for part in parts])
+
+    # Hand-edited logs can be out of order
+    if len(seconds) > 1 and (np.diff(seconds) < 0).any():
+        order = np.argsort(seconds, kind='stable')
+        seconds, kinds = seconds[order], kinds[order]
+    return seconds, kinds
+
+
+def format_seconds(seconds):
+    """'YYYY-MM-DD HH:MM:SS' of epoch seconds"""
+    return str(np.datetime64(int(seconds), 's')).replace("T", " ")
+
+
+def format_day(day):
+    """'YYYY-MM-DD' of a day number"""
+    return str(np.datetime64(int(day), 'D'))
+
+
+def analyze(seconds, kinds, gap_hours=12, window_days=7, expected_per_day=4):
+    """Activity report of run timestamps as a JSON-ready dict"""
+    report = {
+        "runs": int(len(seconds)),
+        "first_run": None,
+        "last_run": None,
+        "ai_runs": int((kinds == KIND_AI).sum()),
+        "template_runs": int((kinds == KIND_TEMPLATE).sum()),
+        "ai_ratio": None,
+        "runs_per_hour": [0] * 24,
+        "gap_hours": gap_hours,
+        "gaps": [],
+        "window_days": window_days,
+        "expected_per_day": expected_per_day,
+        "success_rate": None,
+        "daily": []
+    }
+    if not len(seconds):
+        return report
+
+    report["first_run"] = format_seconds(seconds[0])
+    report["last_run"] = format_seconds(seconds[-1])
+
+    generated = report["ai_runs"] + report["template_runs"]
+    if generated:
+        report["ai_ratio"] = round(report["ai_runs"] / generated, 4)
+
+    report["runs_per_hour"] = np.bincount(seconds % SECONDS_PER_DAY // 3600, minlength=24).tolist()
+
+    gaps = np.diff(seconds)
+    long_gaps = np.flatnonzero(gaps > gap_hours * 3600)
+    report["gaps"] = [
+        {
+            "from": format_seconds(seconds[i]),
+            "to": format_seconds(seconds[i + 1]),
+            "hours": round(float(gaps[i]) / 3600, 1)
+        }
+        for i in long_gaps
+    ]
+
+    # Runs per calendar day, including the days without any run
+    days = seconds // SECONDS_PER_DAY
+    first_day = int(days[0])
+    per_day = np.bincount(days - first_day)
+
+    # Rolling window sums from one cumulative sum
+    cumulative = np.concatenate(([0], np.cumsum(per_day)))
+    positions = np.arange(1, len(per_day) + 1)
+    window_starts = np.maximum(positions - window_days, 0)
+    window_runs = cumulative[positions] - cumulative[window_starts]
+    window_lengths = positions - window_starts
+    rolling = np.minimum(window_runs / (window_lengths * expected_per_day), 1.0)
+
+    report["success_rate"] = round(float(np.minimum(per_day / expected_per_day, 1.0).mean()), 4)
+    report["daily"] = [
+        {"date": format_day(first_day + i), "runs": int(runs), "rolling_success_rate": round(float(rate), 4)}
+        for i, (runs, rate) in enumerate(zip(per_day, rolling))
+    ]
+    return report
+
+
+def format_table(report, days=14):
+    """Plain text rendering of an activity report"""
+    lines = [
+        f"{'runs:':<20} {report['runs']}",
+        f"{'first_run:':<20} {report['first_run']}",
+        f"{'last_run:':<20} {report['last_run']}",
+        f"{'ai / template:':<20} {report['ai_runs']} / {report['template_runs']} (ratio {report['ai_ratio']})",
+        f"{'success_rate:':<20} {report['success_rate']} ({report['expected_per_day']} runs/day expected)",
+        "",
+        "Runs per hour (UTC):"
+    ]
+
+    peak = max(report["runs_per_hour"]) or 1
+    for hour, runs in enumerate(report["runs_per_hour"]):
+        if runs:
+            lines.append(f"  {hour:02d}:00 {runs:>7}  {'#' * max(1, round(runs / peak * 40))}")
+
+    lines.append("")
+    lines.append(f"Last {min(days, len(report['daily']))} days ({report['window_days']}-day rolling success):")
+    lines.append(f"  {'date':<12} {'runs':>6} {'rolling':>9}")
+    for day in report["daily"][-days:]:
+        lines.append(f"  {day['date']:<12} {day['runs']:>6} {day['rolling_success_rate']:>9.1%}")
+
+    lines.append("")
+    lines.append(f"Gaps over {report['gap_hours']} hours: {len(report['gaps'])}")
+    for gap in report["gaps"][-days:]:
+        lines.append(f"  {gap['from']} -> {gap['to']}  {gap['hours']:>8.1f} h")
+    return "\n".join(lines)
@@ -6,33 +6,124 @@ Author: blogecoin
 Features: AI learning notes, code challenges, smart patterns
 """
 
-import json
+import argparse
+import asyncio
 import os
 import random
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import google.generativeai as genai
 
-class AIBot:
+from bot_core import BaseBot
+from archive_store import ArchiveStore, read_content
+from content_spool import ContentSpool
+from content_validator import add_title, close_fences, is_valid, repair_prompt, splice_sections, validate
+from file_locks import append_text, append_with_header, locked
+from fingerprints import FingerprintIndex, hamming_distance, match_subject, simhash
+from gemini_client import GeminiClient
+from readme_template import ReadmeTemplate
+from response_cache import ResponseCache
+from search_index import SearchIndex, extract_title, split_note_entries
+from state_store import atomic_write_text
+from stream_segment import StreamSegment
+from token_ledger import TokenLedger
+
+README_LAYOUT = """# AI-Powered Autonomous Bot v4.0
+
+**Gemini AI Enhanced** - Real content generation
+
+[![Bot Status](https://img.shields.io/badge/Bot-Active-success)](https://github.com/Gynzrt/daily-logs)
+[![Version](https://img.shields.io/badge/Version-4.0-blue)](https://github.com/Gynzrt/daily-logs)
+[![AI](https://img.shields.io/badge/AI-Gemini-purple)](https://github.com/Gynzrt/daily-logs)
+
+## Live Statistics
+
+<!-- readme-stats -->
+```
+Bot Name:        {bot_name}
+Version:         {version}
+Total Runs:      {total_runs}
+AI Mode:         {ai_mode}
+Last Update:     {last_run} UTC
+Status:          ACTIVE
+```
+<!-- /readme-stats -->
+
+## v4.0 Features
+
+### AI-Powered Content
+- **Learning Notes**: AI-generated technical explanations
+- **Coding Challenges**: Daily algorithm problems with solutions
+- **Smart Patterns**: Weekday/weekend activity variance
+
+### Technology
+- **Gemini AI**: Google's latest AI model
+- **Python 3.9**: Modern Python features
+- **GitHub Actions**: Fully automated
+
+### Content Quality
+- Real educational value
+- Unique AI-generated content
+- Professional explanations
+- Practical code examples
+
+## Project Structure
+
+```
+auto-daily-logs/
+├── ai_notes/           # AI learning notes
+├── coding_challenges/  # Daily challenges
+├── archive/            # Closed months, compressed
+├── ai_snippets/        # AI code snippets
+├── autonomous_logs.txt # Activity log
+├── README.md           # This file (auto-updated)
+└── ai_bot_v4.py        # AI bot core
+```
+
+## How It Works
+
+1. **Gemini AI generates** real learning content
+2. **Smart patterns** mimic natural developer behavior
+3. **Multiple commits/day** with diverse content
+4. **Fully autonomous** on GitHub Actions
+
+---
+
+<!-- readme-stats -->
+**AI-Powered | Last updated: {last_run} UTC**
+<!-- /readme-stats -->
+"""
+
+# Run counter and timestamps alone only refresh the README at the interval
+README_TEMPLATE = ReadmeTemplate(README_LAYOUT, volatile=("total_runs", "last_run"))
+
+class AIBot(BaseBot):
     """AI-Powered bot with Gemini integration"""
 
+    bot_key = "ai"
+    run_label = "AI Bot"
+
     def __init__(self):
-        self.config_file = Path("bot_config.json")
-        self.log_file = Path("autonomous_logs.txt")
-        self.status_file = Path("bot_status.json")
-        self.readme_file = Path("README.md")
+        super().__init__()
 
         # Directories
         self.notes_dir = Path("ai_notes")
         self.challenges_dir = Path("coding_challenges")
         self.snippets_dir = Path("ai_snippets")
         self.quotes_file = Path("daily_quotes.txt")
-
-        # Load config
-        self.config = self.load_config()
+        self.spool = ContentSpool(Path("ai_spool"))
+        self.search_index = None
+        self.archive = None
+        self.fingerprints = {}
+        self.api_calls = 0
+        self.api_latency_ms = 0.0
+        # Set by a hosting daemon, see run_coroutine()
+        self.event_loop = None
 
         # Initialize Gemini AI
         self.setup_gemini()
+        self.response_cache = self.setup_response_cache()
+        self.gemini = self.setup_gemini_client()
 
         # Learning topics pool
         self.learning_topics = [
@@ -62,51 +153,133 @@ class AIBot:
             "Bit manipulation"
         ]
 
+    model_name = 'gemini-2.5-flash'
+
     def setup_gemini(self):
         """Setup Gemini AI with API key"""
         api_key = os.environ.get('GEMINI_API_KEY')
         if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+            # Imported lazily, template mode never pays for the SDK import
+            import google.generativeai as genai
+
+            endpoint = os.environ.get('GEMINI_API_ENDPOINT')
+            if endpoint:
+                # REST transport reaches local stand-ins such as benchmarks/gemini_standin.py
+                genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+                print(f"Gemini endpoint: {endpoint}")
+            else:
+                genai.configure(api_key=api_key)
+            self.model = genai.GenerativeModel(self.model_name)
             self.ai_enabled = True
             print("AI Mode: ENABLED (Gemini 2.5 Flash)")
         else:
             self.ai_enabled = False
             print("AI Mode: DISABLED (fallback to templates)")
 
+    def setup_gemini_client(self):
+        """Wrap the model with rate limiting, retries, the persisted circuit breaker and token budget"""
+        if not self.ai_enabled:
+            return None
+
+        ledger = TokenLedger(
+            self.state.status.get("ai_tokens", {}).get("days"),
+            self.config.get("ai_features", {}).get("token_budget", {}),
+            clock=self.get_utc_timestamp
+        )
+        return GeminiClient(
+            self.model,
+            self.config.get("ai_features", {}).get("resilience", {}),
+            self.state.status.get("ai_circuit"),
+            metrics=self.metrics,
+            ledger=ledger
+        )
+
+    def refresh(self):
+        """Keep the model and its connections, rebuild what depends on config and status"""
+        changed = super().refresh()
+        self.api_calls = 0
+        self.api_latency_ms = 0.0
+
+        if changed:
+            if self.response_cache is not None:
+                self.response_cache.close()
+            self.response_cache = self.setup_response_cache()
+            # Dedup distance and archive location may have moved
+            self.fingerprints = {}
+            self.archive = None
+        elif self.response_cache is not None:
+            self.response_cache.hits = 0
+            self.response_cache.misses = 0
+
+        # Breaker state and token ledger come from the refreshed status, the model stays warm
+        self.gemini = self.setup_gemini_client()
+        return changed
+
+    def setup_response_cache(self):
+        """Open the on-disk prompt/response cache if enabled"""
+        cache_config = self.config.get("ai_features", {}).get("response_cache", {})
+        if not self.ai_enabled or not cache_config.get("enabled", True):
+            return None
+
+        try:
+            return ResponseCache(
+                cache_config.get("path", ".bot_cache/ai_responses.sqlite3"),
+                ttl_seconds=cache_config.get("ttl_hours", 2) * 3600,
+                max_entries=cache_config.get("max_entries", 200)
+            )
+        except Exception as e:
+            print(f"Response cache unavailable: {e}")
+            return None
+
     def load_config(self):
         """Load bot configuration"""
-        default_config = {
-            "bot_name": "blogecoin Bot",
+        return self.state.load_config({
             "version": "4.0",
             "mode": "ai_enhanced",
-            "commits_per_day": {"min": 2, "max": 5},
             "ai_features": {
                 "learning_notes": True,
                 "coding_challenges": True,
-                "smart_patterns": True
-            },
-            "enabled": True
-        }
-
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                return {**default_config, **config}
-            except Exception:
-                pass
-
-        self.config_file.write_text(json.dumps(default_config, indent=2), encoding='utf-8')
-        return default_config
-
-    def get_utc_timestamp(self):
-        """Get current UTC timestamp"""
-        return datetime.now(timezone.utc)
-
-    def format_timestamp(self, dt):
-        """Format timestamp for logs"""
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+                "smart_patterns": True,
+                "concurrent_generation": True,
+                "streaming": False,
+                "generation_timeout": 60,
+                "response_cache": {
+                    "enabled": True,
+                    "ttl_hours": 2,
+                    "max_entries": 200
+                },
+                "dedup": {
+                    "enabled": True,
+                    "max_distance": 3
+                },
+                "validation": {
+                    "enabled": True,
+                    "repair": True
+                },
+                "archive": {
+                    "enabled": True,
+                    "dir": "archive"
+                },
+                "resilience": {
+                    "requests_per_minute": 10,
+                    "max_retries": 3,
+                    "retry_base_delay": 1.0,
+                    "retry_max_delay": 20.0,
+                    "failure_threshold": 3,
+                    "cooldown_minutes": 60
+                },
+                "token_budget": {
+                    "enabled": True,
+                    "daily_tokens": 200000,
+                    "monthly_tokens": 4000000,
+                    "max_output_tokens": 2048,
+                    "reduced_output_tokens": 1024,
+                    "reduce_at": 0.8,
+                    "input_usd_per_million": 0.30,
+                    "output_usd_per_million": 2.50
+                }
+            }
+        })
 
     def ensure_directories(self):
         """Ensure all directories exist"""
@@ -114,13 +287,235 @@ class AIBot:
         self.challenges_dir.mkdir(exist_ok=True)
         self.snippets_dir.mkdir(exist_ok=True)
 
-    def generate_ai_learning_note(self, topic):
-        """Generate AI-powered learning note"""
-        if not self.ai_enabled:
-            return self.generate_fallback_note(topic)
+    def get_generation_timeout(self):
+        """Per-call deadline for AI generation in seconds"""
+        return self.config.get("ai_features", {}).get("generation_timeout", 60)
+
+    def streaming_enabled(self):
+        """Whether responses are streamed to disk as they arrive"""
+        return self.config.get("ai_features", {}).get("streaming", False)
+
+    def record_api_call(self, started):
+        """Account one Gemini round trip for the run event"""
+        self.api_calls += 1
+        self.api_latency_ms += (time.perf_counter() - started) * 1000
+
+    def get_cached_text(self, prompt, reject=None):
+        """Cached response for prompt, None on a miss or when reject(text) holds"""
+        if self.response_cache is None:
+            return None
+        text = self.response_cache.get(self.model_name, prompt)
+        if text is not None and reject is not None and reject(text):
+            return None
+        return text
+
+    def store_cached_text(self, prompt, text):
+        """Remember a successful response"""
+        if self.response_cache is not None:
+            self.response_cache.put(self.model_name, prompt, text)
+
+    def store_cached_segment(self, prompt, segment):
+        """Remember a streamed response, copied into the cache chunk by chunk"""
+        if self.response_cache is not None:
+            self.response_cache.put_chunks(self.model_name, prompt, segment.iter_chunks())
+
+    def request_ai_text(self, prompt, use_cache=True, reject=None):
+        """Send a prompt to Gemini and return the response text"""
+        cached = self.get_cached_text(prompt, reject) if use_cache else None
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            text = self.gemini.generate(prompt, self.get_generation_timeout())
+        finally:
+            self.record_api_call(started)
+        self.store_cached_text(prompt, text)
+        return text
+
+    async def request_ai_text_async(self, prompt, executor, use_cache=True, reject=None):
+        """Async variant of request_ai_text"""
+        cached = self.get_cached_text(prompt, reject) if use_cache else None
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            text = await self.gemini.generate_async(prompt, self.get_generation_timeout(), executor)
+        finally:
+            self.record_api_call(started)
+        self.store_cached_text(prompt, text)
+        return text
+
+    def request_ai_stream(self, prompt, reject=None):
+        """Stream a Gemini response into a temp segment, cached text on a hit"""
+        cached = self.get_cached_text(prompt, reject)
+        if cached is not None:
+            return cached
+
+        segment = StreamSegment()
+        started = time.perf_counter()
+        try:
+            self.gemini.generate_stream(prompt, self.get_generation_timeout(), segment)
+        except Exception:
+            segment.discard()
+            raise
+        finally:
+            self.record_api_call(started)
+
+        self.store_cached_segment(prompt, segment)
+        return segment
+
+    async def request_ai_stream_async(self, prompt, executor, reject=None):
+        """Async variant of request_ai_stream"""
+        cached = self.get_cached_text(prompt, reject)
+        if cached is not None:
+            return cached
+
+        segment = StreamSegment()
+        started = time.perf_counter()
+        try:
+            await self.gemini.generate_stream_async(prompt, self.get_generation_timeout(), segment, executor)
+        except Exception:
+            segment.discard()
+            raise
+        finally:
+            self.record_api_call(started)
+
+        self.store_cached_segment(prompt, segment)
+        return segment
+
+    async def generate_with_deadline(self, plan, executor):
+        """Generate one piece of content, falling back when the deadline expires"""
+        timeout = self.get_generation_timeout()
+        request = self.request_ai_stream_async if self.streaming_enabled() else self.request_ai_text_async
+        try:
+            reject = self.duplicate_check(plan["kind"], plan["subject"], plan["fallback"])
+            content = await asyncio.wait_for(request(plan["prompt"], executor, reject=reject), timeout)
+            return await self.ensure_structure_async(plan["kind"], plan["subject"], content, executor)
+        except asyncio.TimeoutError:
+            print(f"AI generation timed out after {timeout}s: {plan['subject']}")
+        except Exception as e:
+            print(f"AI generation failed: {e}")
+        self.metrics.record_fallback(plan["kind"])
+        return plan["fallback"](plan["subject"])
 
+    async def gather_generations(self, plans):
+        """Run all planned generations at once"""
+        executor = ThreadPoolExecutor(max_workers=len(plans))
         try:
-            prompt = f"""Write a concise technical learning note about: {topic}
+            return await asyncio.gather(*[self.generate_with_deadline(plan, executor) for plan in plans])
+        finally:
+            # Do not wait for calls abandoned after their deadline
+            executor.shutdown(wait=False)
+
+    def describe_ai_update(self, update_func):
+        """Spool kind, subject pool and generators of an AI update"""
+        if update_func == self.update_ai_learning_note:
+            return ("learning_note", self.learning_topics, self.build_learning_note_prompt,
+                    self.generate_ai_learning_note, self.generate_fallback_note)
+        return ("coding_challenge", self.challenge_types, self.build_challenge_prompt,
+                self.generate_ai_coding_challenge, self.generate_fallback_challenge)
+
+    def plan_ai_updates(self, selected):
+        """Take spooled content or pick a subject and prompt for each update"""
+        plans = []
+        for update_func in selected:
+            kind, subjects, build_prompt, generate, fallback = self.describe_ai_update(update_func)
+            item = self.take_spooled(kind, fallback)
+
+            if item:
+                print(f"Using spooled {kind}: {item['subject']}")
+                subject, content = item["subject"], item["content"]
+            else:
+                subject, content = self.choose_subject(kind, subjects), None
+
+            plans.append({
+                "kind": kind,
+                "update": update_func,
+                "subject": subject,
+                "prompt": build_prompt(subject),
+                "generate": generate,
+                "fallback": fallback,
+                "content": content
+            })
+        return plans
+
+    def run_coroutine(self, coroutine):
+        """Run a coroutine to completion from a stage thread
+
+        Under the daemon it runs on the daemon's loop, so the SDK's async
+        client and its connections outlive the run; otherwise on a new loop.
+        """
+        if self.event_loop is not None:
+            return asyncio.run_coroutine_threadsafe(coroutine, self.event_loop).result()
+        return asyncio.run(coroutine)
+
+    def run_ai_updates(self, selected):
+        """Produce content for the selected updates, then write them in order"""
+        plans = self.plan_ai_updates(selected)
+        missing = [plan for plan in plans if plan["content"] is None]
+
+        concurrent = self.config.get("ai_features", {}).get("concurrent_generation", True)
+        if missing and self.ai_enabled and concurrent:
+            contents = self.run_coroutine(self.gather_generations(missing))
+            for plan, content in zip(missing, contents):
+                plan["content"] = content
+        else:
+            for plan in missing:
+                print(f"Generating: {plan['subject']}...")
+                plan["content"] = plan["generate"](plan["subject"])
+
+        # Writes stay serialized and in selection order
+        return [plan["update"](plan["subject"], plan["content"]) for plan in plans]
+
+    def prefetch(self, count):
+        """Generate count notes and challenges ahead of time into the spool"""
+        if not self.ai_enabled:
+            print("Prefetch needs AI mode, nothing spooled")
+            return False
+
+        timestamp = self.format_timestamp(self.get_utc_timestamp())
+        spooled = 0
+
+        for update_func in (self.update_ai_learning_note, self.update_coding_challenge):
+            kind, subjects, build_prompt, _, fallback = self.describe_ai_update(update_func)
+
+            # Waiting items and this batch's picks count as coverage too
+            pending, waiting = {}, []
+            for item in self.spool.items(kind):
+                pending[item["subject"]] = pending.get(item["subject"], 0) + 1
+                waiting.append(self.content_fingerprint(item["content"]))
+
+            for _ in range(count):
+                subject = self.choose_subject(kind, subjects, pending)
+                pending[subject] = pending.get(subject, 0) + 1
+                try:
+                    # Bypass the cache, every spooled item must be fresh
+                    content = self.request_ai_text(build_prompt(subject), use_cache=False)
+                    content = self.ensure_structure(kind, subject, content)
+                except Exception as e:
+                    print(f"Prefetch failed for {subject}: {e}")
+                    continue
+
+                fingerprint = self.content_fingerprint(content)
+                if self.is_near_duplicate(kind, subject, content, fallback, fingerprint):
+                    continue
+                if self.near_spooled(kind, fingerprint, waiting):
+                    print(f"Rejected near-duplicate {kind}: {subject} (matches a spooled item)")
+                    continue
+
+                self.spool.push(kind, subject, content, timestamp)
+                waiting.append(fingerprint)
+                spooled += 1
+
+            print(f"Spool {kind}: {self.spool.size(kind)} ready")
+
+        return spooled > 0
+
+    def build_learning_note_prompt(self, topic):
+        """Prompt for an AI learning note"""
+        return f"""Write a concise technical learning note about: {topic}
 
 Requirements:
 - 150-250 words
@@ -147,11 +542,23 @@ Format:
 - [Takeaway 3]
 """
 
-            response = self.model.generate_content(prompt)
-            return response.text
+    def generate_ai_learning_note(self, topic):
+        """Generate AI-powered learning note"""
+        if not self.ai_enabled:
+            return self.generate_fallback_note(topic)
+
+        try:
+            prompt = self.build_learning_note_prompt(topic)
+            reject = self.duplicate_check("learning_note", topic, self.generate_fallback_note)
+            if self.streaming_enabled():
+                content = self.request_ai_stream(prompt, reject=reject)
+            else:
+                content = self.request_ai_text(prompt, reject=reject)
+            return self.ensure_structure("learning_note", topic, content)
 
         except Exception as e:
             print(f"AI generation failed: {e}")
+            self.metrics.record_fallback("learning_note")
             return self.generate_fallback_note(topic)
 
     def generate_fallback_note(self, topic):
@@ -178,13 +585,9 @@ def example():
 - Best learned through practice
 """
 
-    def generate_ai_coding_challenge(self, challenge_type):
-        """Generate AI-powered coding challenge solution"""
-        if not self.ai_enabled:
-            return self.generate_fallback_challenge(challenge_type)
-
-        try:
-            prompt = f"""Create a coding challenge and solution for: {challenge_type}
+    def build_challenge_prompt(self, challenge_type):
+        """Prompt for an AI coding challenge"""
+        return f"""Create a coding challenge and solution for: {challenge_type}
 
 Requirements:
 - Medium difficulty level
@@ -212,11 +615,23 @@ Format:
 [Brief explanation of approach]
 """
 
-            response = self.model.generate_content(prompt)
-            return response.text
+    def generate_ai_coding_challenge(self, challenge_type):
+        """Generate AI-powered coding challenge solution"""
+        if not self.ai_enabled:
+            return self.generate_fallback_challenge(challenge_type)
+
+        try:
+            prompt = self.build_challenge_prompt(challenge_type)
+            reject = self.duplicate_check("coding_challenge", challenge_type, self.generate_fallback_challenge)
+            if self.streaming_enabled():
+                content = self.request_ai_stream(prompt, reject=reject)
+            else:
+                content = self.request_ai_text(prompt, reject=reject)
+            return self.ensure_structure("coding_challenge", challenge_type, content)
 
         except Exception as e:
             print(f"AI challenge failed: {e}")
+            self.metrics.record_fallback("coding_challenge")
             return self.generate_fallback_challenge(challenge_type)
 
     def generate_fallback_challenge(self, challenge_type):
@@ -241,52 +656,313 @@ def solve(arr):
 Standard approach for {challenge_type.lower()}.
 """
 
-    def update_ai_learning_note(self):
+    def validation_settings(self):
+        """Section validation and repair switches"""
+        return self.config.get("ai_features", {}).get("validation", {})
+
+    def check_structure(self, kind, subject, content):
+        """(text, sections to regenerate) of invalid content, (None, []) when valid"""
+        segment = isinstance(content, StreamSegment)
+        report = validate(content.iter_lines() if segment else content, kind)
+        if is_valid(report):
+            return None, []
+
+        # Only a response that needs repair is read into memory
+        text = content.read_text() if segment else content
+
+        # A missing title is restored without asking the model
+        if not report["title"]:
+            text = add_title(text, kind, subject)
+        return text, report["missing"] + report["broken"]
+
+    def finish_structure(self, kind, content, text, names):
+        """Validated replacement text, the original stream segment is dropped"""
+        if names:
+            remaining = validate(text, kind)
+            fixed = is_valid(remaining)
+            self.metrics.record_repair(kind, fixed)
+            print(f"Repaired {kind} sections: {', '.join(names)}" if fixed
+                  else f"Unrepaired {kind} sections: {', '.join(remaining['missing'] + remaining['broken'])}")
+
+        if isinstance(content, StreamSegment):
+            content.discard()
+        return close_fences(text)
+
+    def ensure_structure(self, kind, subject, content):
+        """Check AI content against the prompt layout, asking only for what is missing"""
+        settings = self.validation_settings()
+        if not settings.get("enabled", True):
+            return content
+
+        text, names = self.check_structure(kind, subject, content)
+        if text is None:
+            return content
+
+        if names and settings.get("repair", True):
+            try:
+                repair = self.request_ai_text(repair_prompt(kind, subject, text, names), use_cache=False)
+                text = splice_sections(text, repair, names, kind)
+            except Exception as e:
+                print(f"Section repair failed: {e}")
+        return self.finish_structure(kind, content, text, names)
+
+    async def ensure_structure_async(self, kind, subject, content, executor):
+        """Async variant of ensure_structure"""
+        settings = self.validation_settings()
+        if not settings.get("enabled", True):
+            return content
+
+        text, names = self.check_structure(kind, subject, content)
+        if text is None:
+            return content
+
+        if names and settings.get("repair", True):
+            try:
+                repair = await asyncio.wait_for(
+                    self.request_ai_text_async(repair_prompt(kind, subject, text, names), executor, use_cache=False),
+                    self.get_generation_timeout()
+                )
+                text = splice_sections(text, repair, names, kind)
+            except asyncio.TimeoutError:
+                print(f"Section repair timed out: {subject}")
+            except Exception as e:
+                print(f"Section repair failed: {e}")
+        return self.finish_structure(kind, content, text, names)
+
+    def archive_settings(self):
+        """Archive store switches"""
+        return self.config.get("ai_features", {}).get("archive", {})
+
+    def get_archive(self):
+        """Archive store of closed months, opened once"""
+        if self.archive is None:
+            self.archive = ArchiveStore(self.archive_settings().get("dir", "archive"))
+        return self.archive
+
+    def iter_content_files(self, kind):
+        """(path, bytes) of every notes or challenge file, archived ones included"""
+        if kind == "learning_note":
+            paths = {path.as_posix() for path in self.notes_dir.glob("learning_*.md")}
+        else:
+            paths = {path.as_posix() for path in self.challenges_dir.glob("challenge_*.md")}
+
+        store = self.get_archive()
+        paths.update(store.paths(kind))
+        for path in sorted(paths):
+            yield Path(path), read_content(path, store)
+
+    def archive_closed_months(self):
+        """Move notes and challenges of closed months into the archive store"""
+        if not self.archive_settings().get("enabled", True):
+            return []
+
+        store = self.get_archive()
+        moved = store.archive_closed(self.notes_dir, self.challenges_dir,
+                                     self.get_utc_timestamp().strftime("%Y-%m"))
+        if not moved:
+            return []
+        print(f"Archived {len(moved)} files of closed months into {store.archive_dir}")
+        return moved + [store.archive_dir.as_posix()]
+
+    def update_search_index(self, path):
+        """Index a freshly written notes or challenge file"""
+        try:
+            if self.search_index is None:
+                self.search_index = SearchIndex(self.notes_dir, self.challenges_dir)
+            self.search_index.sync_file(path)
+        except Exception as e:
+            print(f"Search index update failed: {e}")
+
+    def dedup_enabled(self):
+        """Whether near-duplicate checks are switched on"""
+        return self.config.get("ai_features", {}).get("dedup", {}).get("enabled", True)
+
+    def challenge_header(self, date_str):
+        """Header written at the top of every challenge file"""
+        return (f"# Daily Coding Challenge - {date_str}\n\n"
+                "*Auto-generated by AI Bot v4.0*\n\n")
+
+    def get_fingerprint_index(self, kind):
+        """Fingerprint index of a content kind, seeded from the archive once"""
+        if kind in self.fingerprints:
+            return self.fingerprints[kind]
+
+        max_distance = self.config.get("ai_features", {}).get("dedup", {}).get("max_distance", 3)
+        directory = self.notes_dir if kind == "learning_note" else self.challenges_dir
+        index = FingerprintIndex(directory / "fingerprints.jsonl", max_distance)
+
+        if not index.loaded:
+            # Files do not record their subject, recover it from the text
+            if kind == "learning_note":
+                for path, data in self.iter_content_files(kind):
+                    for _, generated, text in split_note_entries(data):
+                        subject = match_subject(extract_title(text), text, self.learning_topics)
+                        index.add(simhash(text), subject, path.as_posix(), generated, save=False)
+            else:
+                for path, data in self.iter_content_files(kind):
+                    text = data.decode('utf-8')
+                    date_str = path.stem.replace("challenge_", "")
+                    header = self.challenge_header(date_str)
+                    if text.startswith(header):
+                        text = text[len(header):]
+                    subject = match_subject(extract_title(text), text, self.challenge_types)
+                    index.add(simhash(text), subject, path.as_posix(), date_str, save=False)
+            index.save()
+
+        self.fingerprints[kind] = index
+        return index
+
+    def choose_subject(self, kind, subjects, pending=None):
+        """Steer towards the least covered subject when dedup is on"""
+        if not self.dedup_enabled():
+            return random.choice(subjects)
+        try:
+            return self.get_fingerprint_index(kind).least_covered(subjects, pending)
+        except Exception as e:
+            print(f"Fingerprint index unavailable: {e}")
+            return random.choice(subjects)
+
+    def near_spooled(self, kind, fingerprint, waiting):
+        """Whether a fingerprint is within the dedup distance of a waiting spool item"""
+        if fingerprint is None:
+            return False
+        max_distance = self.get_fingerprint_index(kind).max_distance
+        return any(other is not None and hamming_distance(fingerprint, other) <= max_distance
+                   for other in waiting)
+
+    def content_fingerprint(self, content):
+        """SimHash of text or a stream segment, read in chunks; None when dedup is off"""
+        if not self.dedup_enabled():
+            return None
+        return simhash(content.iter_chunks() if isinstance(content, StreamSegment) else content)
+
+    def is_near_duplicate(self, kind, subject, content, fallback, fingerprint=None):
+        """Reject AI content that is a near-duplicate of the archive"""
+        # Template content is identical by design and costs no API call
+        if not self.dedup_enabled() or content == fallback(subject):
+            return False
+
+        try:
+            if fingerprint is None:
+                fingerprint = self.content_fingerprint(content)
+            match = self.get_fingerprint_index(kind).find_near_duplicate(fingerprint)
+        except Exception as e:
+            print(f"Fingerprint index unavailable: {e}")
+            return False
+
+        if match:
+            print(f"Rejected near-duplicate {kind}: {subject} (matches {match['path']} {match['generated']})")
+            return True
+        return False
+
+    def duplicate_check(self, kind, subject, fallback):
+        """Predicate rejecting near-duplicate candidates, None when dedup is off"""
+        if not self.dedup_enabled():
+            return None
+        return lambda content: self.is_near_duplicate(kind, subject, content, fallback)
+
+    def take_spooled(self, kind, fallback):
+        """Oldest spooled item that is no near-duplicate, None when none is left
+
+        Checked before the run falls back to generating, so a duplicate
+        costs neither a Gemini call nor the update.
+        """
+        while True:
+            item = self.spool.pop(kind)
+            if not item or not self.is_near_duplicate(kind, item["subject"], item["content"], fallback):
+                return item
+
+    def record_fingerprint(self, kind, subject, fingerprint, path, generated):
+        """Add the content_fingerprint() of a written entry to the index"""
+        if fingerprint is None:
+            return
+        try:
+            index = self.get_fingerprint_index(kind)
+            if kind == "coding_challenge":
+                index.remove_path(path.as_posix())
+            index.add(fingerprint, subject, path.as_posix(), generated)
+        except Exception as e:
+            print(f"Fingerprint index update failed: {e}")
+
+    def update_ai_learning_note(self, topic=None, content=None):
         """Create AI-generated learning note"""
-        topic = random.choice(self.learning_topics)
+        topic = topic or self.choose_subject("learning_note", self.learning_topics)
         timestamp = self.get_utc_timestamp()
         date_str = timestamp.strftime("%Y-%m")
 
         notes_file = self.notes_dir / f"learning_{date_str}.md"
 
-        print(f"Generating AI note: {topic}...")
-        content = self.generate_ai_learning_note(topic)
+        if content is None:
+            item = self.take_spooled("learning_note", self.generate_fallback_note)
+            if item:
+                topic, content = item["subject"], item["content"]
+            else:
+                print(f"Generating AI note: {topic}...")
+                content = self.generate_ai_learning_note(topic)
 
-        separator = "\n\n" + "="*60 + "\n\n"
+        # A streamed segment is only read in chunks, splice_append copies it
+        segment = content if isinstance(content, StreamSegment) else None
+        fingerprint = self.content_fingerprint(content)
 
-        if notes_file.exists():
-            with open(notes_file, 'a', encoding='utf-8') as f:
-                f.write(separator)
-                f.write(f"*Generated: {self.format_timestamp(timestamp)} UTC*\n\n")
-                f.write(content)
-        else:
-            header = f"# AI Learning Notes - {date_str}\n\n"
-            header += "*Auto-generated by AI Bot v4.0 using Gemini*\n\n"
-            with open(notes_file, 'w', encoding='utf-8') as f:
-                f.write(header)
-                f.write(f"*Generated: {self.format_timestamp(timestamp)} UTC*\n\n")
-                f.write(content)
+        if self.is_near_duplicate("learning_note", topic, content, self.generate_fallback_note, fingerprint):
+            if segment:
+                segment.discard()
+            return None
 
+        separator = "\n\n" + "="*60 + "\n\n"
+
+        # Header or separator depends on the file existing, decide under its lock
+        with locked(notes_file):
+            if notes_file.exists():
+                prefix = separator
+            else:
+                prefix = f"# AI Learning Notes - {date_str}\n\n"
+                prefix += "*Auto-generated by AI Bot v4.0 using Gemini*\n\n"
+            prefix += f"*Generated: {self.format_timestamp(timestamp)} UTC*\n\n"
+
+            if segment:
+                segment.splice_append(notes_file, prefix)
+            else:
+                append_text(notes_file, prefix + content)
+
+        self.update_search_index(notes_file)
+        self.record_fingerprint("learning_note", topic, fingerprint, notes_file, self.format_timestamp(timestamp))
         return str(notes_file)
 
-    def update_coding_challenge(self):
+    def update_coding_challenge(self, challenge_type=None, content=None):
         """Create AI-generated coding challenge"""
-        challenge_type = random.choice(self.challenge_types)
+        challenge_type = challenge_type or self.choose_subject("coding_challenge", self.challenge_types)
         timestamp = self.get_utc_timestamp()
         date_str = timestamp.strftime("%Y-%m-%d")
 
         challenge_file = self.challenges_dir / f"challenge_{date_str}.md"
 
-        print(f"Generating challenge: {challenge_type}...")
-        content = self.generate_ai_coding_challenge(challenge_type)
-
-        header = f"# Daily Coding Challenge - {date_str}\n\n"
-        header += "*Auto-generated by AI Bot v4.0*\n\n"
-
-        with open(challenge_file, 'w', encoding='utf-8') as f:
-            f.write(header)
-            f.write(content)
+        if content is None:
+            item = self.take_spooled("coding_challenge", self.generate_fallback_challenge)
+            if item:
+                challenge_type, content = item["subject"], item["content"]
+            else:
+                print(f"Generating challenge: {challenge_type}...")
+                content = self.generate_ai_coding_challenge(challenge_type)
+
+        segment = content if isinstance(content, StreamSegment) else None
+        fingerprint = self.content_fingerprint(content)
+
+        if self.is_near_duplicate("coding_challenge", challenge_type, content, self.generate_fallback_challenge,
+                                  fingerprint):
+            if segment:
+                segment.discard()
+            return None
+
+        if segment:
+            segment.splice_replace(challenge_file, self.challenge_header(date_str))
+        else:
+            # Same lock and temp file as splice_replace
+            with locked(challenge_file):
+                atomic_write_text(challenge_file, self.challenge_header(date_str) + content)
 
+        self.update_search_index(challenge_file)
+        self.record_fingerprint("coding_challenge", challenge_type, fingerprint, challenge_file, date_str)
         return str(challenge_file)
 
     def update_main_log(self):
@@ -294,16 +970,11 @@ Standard approach for {challenge_type.lower()}.
         utc_now = self.get_utc_timestamp()
         timestamp_str = self.format_timestamp(utc_now)
 
-        if not self.log_file.exists():
-            self.log_file.write_text(
-                "# AI-Powered Autonomous Bot Logs\n"
-                "# Version 4.0 - Gemini AI Enhanced\n\n",
-                encoding='utf-8'
-            )
+        append_with_header(self.log_file, "# AI-Powered Autonomous Bot Logs\n"
+                                          "# Version 4.0 - Gemini AI Enhanced\n\n")
 
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            mode = "AI" if self.ai_enabled else "Template"
-            f.write(f"[{mode}] Update at {timestamp_str} UTC\n")
+        mode = "AI" if self.ai_enabled else "Template"
+        self.activity_log.append(f"[{mode}] Update at {timestamp_str} UTC", utc_now)
 
         return "autonomous_logs.txt"
 
@@ -327,6 +998,7 @@ Standard approach for {challenge_type.lower()}.
 
     def update_status(self):
         """Update bot status file"""
+        previous = self.state.status
         status = {
             "bot_name": self.config["bot_name"],
             "version": self.config["version"],
@@ -337,22 +1009,43 @@ Standard approach for {challenge_type.lower()}.
             "ai_enabled": self.ai_enabled
         }
 
-        with open(self.status_file, 'w', encoding='utf-8') as f:
-            json.dump(status, f, indent=2)
-
+        cache_stats = previous.get("ai_cache", {})
+        if self.response_cache is not None:
+            cache_stats = {
+                "hits": cache_stats.get("hits", 0) + self.response_cache.hits,
+                "misses": cache_stats.get("misses", 0) + self.response_cache.misses,
+                "entries": len(self.response_cache)
+            }
+        if cache_stats:
+            status["ai_cache"] = cache_stats
+
+        circuit = self.gemini.breaker.to_dict() if self.gemini else previous.get("ai_circuit")
+        if circuit:
+            status["ai_circuit"] = circuit
+
+        tokens = previous.get("ai_tokens")
+        if self.gemini:
+            tokens = {**self.gemini.ledger.usage(), "days": self.gemini.ledger.to_dict()}
+        if tokens:
+            status["ai_tokens"] = tokens
+
+        self.state.replace_status(status)
+
+        # Counters are merged with runs that flushed in the meantime
+        self.state.increment("total_runs")
+        if cache_stats:
+            cache = self.response_cache
+            self.state.increment(("ai_cache", "hits"), cache.hits if cache is not None else 0)
+            self.state.increment(("ai_cache", "misses"), cache.misses if cache is not None else 0)
+        if self.gemini:
+            for day, field, amount in self.gemini.ledger.increments():
+                self.state.increment(("ai_tokens", "days", day, field), amount)
+        elif tokens:
+            for day, entry in tokens.get("days", {}).items():
+                for field in entry:
+                    self.state.increment(("ai_tokens", "days", day, field), 0)
         print(f"Status updated: Run #{status['total_runs']}")
 
-    def get_total_runs(self):
-        """Get total number of runs"""
-        if self.status_file.exists():
-            try:
-                with open(self.status_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return data.get('total_runs', 0)
-            except Exception:
-                pass
-        return 0
-
     def update_readme(self):
         """Update README with AI stats"""
         stats = {
@@ -363,133 +1056,77 @@ Standard approach for {challenge_type.lower()}.
             "ai_mode": "Gemini AI" if self.ai_enabled else "Template Mode"
         }
 
-        readme = f"""# AI-Powered Autonomous Bot v4.0
-
-**Gemini AI Enhanced** - Real content generation
-
-[![Bot Status](https://img.shields.io/badge/Bot-Active-success)](https://github.com/Gynzrt/daily-logs)
-[![Version](https://img.shields.io/badge/Version-4.0-blue)](https://github.com/Gynzrt/daily-logs)
-[![AI](https://img.shields.io/badge/AI-Gemini-purple)](https://github.com/Gynzrt/daily-logs)
-
-## Live Statistics
-
-```
-Bot Name:        {stats['bot_name']}
-Version:         {stats['version']}
-Total Runs:      {stats['total_runs']}
-AI Mode:         {stats['ai_mode']}
-Last Update:     {stats['last_run']} UTC
-Status:          ACTIVE
-```
-
-## v4.0 Features
-
-### AI-Powered Content
-- **Learning Notes**: AI-generated technical explanations
-- **Coding Challenges**: Daily algorithm problems with solutions
-- **Smart Patterns**: Weekday/weekend activity variance
-
-### Technology
-- **Gemini AI**: Google's latest AI model
-- **Python 3.9**: Modern Python features
-- **GitHub Actions**: Fully automated
-
-### Content Quality
-- Real educational value
-- Unique AI-generated content
-- Professional explanations
-- Practical code examples
-
-## Project Structure
-
-```
-auto-daily-logs/
-├── ai_notes/           # AI learning notes
-├── coding_challenges/  # Daily challenges
-├── ai_snippets/        # AI code snippets
-├── autonomous_logs.txt # Activity log
-├── README.md           # This file (auto-updated)
-└── ai_bot_v4.py        # AI bot core
-```
-
-## How It Works
-
-1. **Gemini AI generates** real learning content
-2. **Smart patterns** mimic natural developer behavior
-3. **Multiple commits/day** with diverse content
-4. **Fully autonomous** on GitHub Actions
-
----
-
-**AI-Powered | Last updated: {stats['last_run']} UTC**
-"""
-
-        self.readme_file.write_text(readme, encoding='utf-8')
+        if not self.write_readme(README_TEMPLATE, stats):
+            return None
         return "README.md"
 
-    def run(self):
-        """Main bot execution"""
-        if not self.config.get("enabled", True):
-            print("Bot is disabled in configuration")
-            return False
+    def run_mode(self):
+        """Mode recorded for this run"""
+        return "ai_enhanced" if self.ai_enabled else "template"
+
+    def api_usage(self):
+        """(calls, total latency ms) of Gemini calls this run"""
+        return self.api_calls, round(self.api_latency_ms, 1) if self.api_calls else None
 
+    def print_banner(self):
+        """Start banner"""
         print("=" * 50)
         print(f"AI Bot v{self.config['version']}")
         print(f"Mode: {'Gemini AI' if self.ai_enabled else 'Template'}")
         print("=" * 50)
 
-        # Smart pattern: skip occasionally
-        if self.should_skip_today():
-            print("Smart skip: Simulating busy day")
-            return True
+    def prepare(self):
+        """Ensure output directories before the stages start"""
+        self.ensure_directories()
 
-        try:
-            self.ensure_directories()
-            modified_files = []
+    def output_dirs(self):
+        """Directories the content stages write to"""
+        return [".", self.notes_dir, self.challenges_dir]
 
-            # Core updates
-            modified_files.append(self.update_main_log())
-            modified_files.append(self.update_readme())
+    def update_ai_content(self):
+        """Generate and write a random selection of the enabled AI updates"""
+        ai_updates = []
 
-            # AI content generation
-            ai_updates = []
+        if self.config.get("ai_features", {}).get("learning_notes", True):
+            ai_updates.append(self.update_ai_learning_note)
 
-            if self.config.get("ai_features", {}).get("learning_notes", True):
-                ai_updates.append(self.update_ai_learning_note)
+        if self.config.get("ai_features", {}).get("coding_challenges", True):
+            ai_updates.append(self.update_coding_challenge)
 
-            if self.config.get("ai_features", {}).get("coding_challenges", True):
-                ai_updates.append(self.update_coding_challenge)
+        if not ai_updates:
+            return []
 
-            # Random selection
-            num_updates = random.randint(1, len(ai_updates))
-            selected = random.sample(ai_updates, num_updates)
+        # Random selection
+        num_updates = random.randint(1, len(ai_updates))
+        selected = random.sample(ai_updates, num_updates)
 
-            for update_func in selected:
-                file_path = update_func()
-                modified_files.append(file_path)
-                print(f"Created: {file_path}")
+        created = [file_path for file_path in self.run_ai_updates(selected) if file_path]
+        for file_path in created:
+            print(f"Created: {file_path}")
+        return created
 
-            # Update status
-            self.update_status()
-            modified_files.append("bot_status.json")
-
-            print(f"\nAI Bot completed successfully")
-            print(f"Modified files: {len(modified_files)}")
-            print(f"Files: {', '.join(modified_files)}")
-
-            return True
-
-        except Exception as e:
-            print(f"AI Bot failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+    def build_pipeline(self, pipeline):
+        """Log, README and AI content run side by side, status waits for all"""
+        pipeline.add("log", self.update_main_log)
+        pipeline.add("readme", self.update_readme)
+        # Notes and challenges share the search and fingerprint indexes, one stage writes both
+        pipeline.add("ai_content", self.update_ai_content)
+        # Closed months leave the working tree once today's content is written
+        pipeline.add("archive", self.archive_closed_months, depends=["ai_content"])
 
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="AI-Powered Autonomous Bot v4.0")
+    parser.add_argument("--prefetch", type=int, metavar="N",
+                        help="generate N notes and N challenges into the spool instead of running")
+    args = parser.parse_args()
+
     bot = AIBot()
-    success = bot.run()
+    if args.prefetch:
+        success = bot.prefetch(args.prefetch)
+    else:
+        success = bot.run()
     exit(0 if success else 1)
 
 
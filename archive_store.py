@@ -0,0 +1,196 @@
+"""
+Content-addressed archive
+Moves closed months of ai_notes/ and coding_challenges/ into archive/ as
+zlib-compressed blobs named by the SHA-256 of each distinct entry, with an
+index that rebuilds every original file byte for byte.
+"""
+
+import hashlib
+import json
+import re
+import zlib
+from pathlib import Path
+
+from file_locks import locked
+from search_index import GENERATED_PATTERN, SEPARATOR
+
+NOTE_FILE_PATTERN = re.compile(r"^learning_(\d{4}-\d{2})\.md$")
+CHALLENGE_FILE_PATTERN = re.compile(r"^challenge_((\d{4}-\d{2})-\d{2})\.md$")
+CHALLENGE_HEADER_PATTERN = re.compile(rb"\A# Daily Coding Challenge - [^\n]*\n\n\*Auto-generated[^\n]*\*\n\n")
+ENTRY_START_PATTERN = re.compile(rb"\n*")
+
+
+def split_parts(data, kind):
+    """Alternating [literal, body, literal, ..., literal] byte pieces of a file
+
+    Bodies are the generated entries worth deduplicating, literals are the
+    headers, timestamps and separators around them.
+    """
+    if kind == "coding_challenge":
+        header = CHALLENGE_HEADER_PATTERN.match(data)
+        start = header.end() if header else 0
+        return [data[:start], data[start:], b""]
+
+    parts = []
+    position = 0
+    markers = list(GENERATED_PATTERN.finditer(data))
+    for i, marker in enumerate(markers):
+        start = ENTRY_START_PATTERN.match(data, marker.end()).end()
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(data)
+        if data[start:end].endswith(SEPARATOR):
+            end -= len(SEPARATOR)
+
+        parts.append(data[position:start])
+        parts.append(data[start:end])
+        position = end
+
+    parts.append(data[position:])
+    return parts
+
+
+class ArchiveStore:
+    """Blob store plus the index mapping archived files to their pieces"""
+
+    def __init__(self, archive_dir="archive", level=9):
+        self.archive_dir = Path(archive_dir)
+        self.blobs_dir = self.archive_dir / "blobs"
+        # Timestamps and separators repeat in every entry, the index compresses well too
+        self.index_file = self.archive_dir / "index.json.z"
+        self.level = level
+        self.loaded_index = None
+
+    @property
+    def index(self):
+        """Archived file table, read on first use"""
+        if self.loaded_index is None:
+            self.loaded_index = self.load_index()
+        return self.loaded_index
+
+    def load_index(self):
+        """Load the archived file table, empty when nothing was archived yet"""
+        if self.index_file.exists():
+            try:
+                return json.loads(zlib.decompress(self.index_file.read_bytes()).decode('utf-8'))
+            except Exception:
+                pass
+        return {"version": 1, "files": {}}
+
+    def save_index(self):
+        """Write the compressed index via temp file and rename"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(self.index, indent=1, sort_keys=True).encode('utf-8')
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        tmp_file.write_bytes(zlib.compress(data, self.level))
+        tmp_file.replace(self.index_file)
+
+    def blob_path(self, digest):
+        """Fan-out location of a blob"""
+        return self.blobs_dir / digest[:2] / f"{digest}.z"
+
+    def put_blob(self, data):
+        """Store data once under its digest, return the digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = path.with_name(path.name + ".tmp")
+            tmp_file.write_bytes(zlib.compress(data, self.level))
+            tmp_file.replace(path)
+        return digest
+
+    def get_blob(self, digest):
+        """Original bytes of a blob"""
+        return zlib.decompress(self.blob_path(digest).read_bytes())
+
+    def __contains__(self, path):
+        return Path(path).as_posix() in self.index["files"]
+
+    def paths(self, kind=None):
+        """Archived file paths, optionally of one kind"""
+        return [path for path, entry in sorted(self.index["files"].items())
+                if kind is None or entry["kind"] == kind]
+
+    def find(self, kind, date):
+        """Archived paths of a kind for a month (YYYY-MM) or a day"""
+        return [path for path, entry in sorted(self.index["files"].items())
+                if entry["kind"] == kind and entry["date"].startswith(date)]
+
+    def size(self, path):
+        """Original size in bytes of an archived file"""
+        return self.index["files"][Path(path).as_posix()]["size"]
+
+    def read_bytes(self, path):
+        """Original bytes of an archived file"""
+        entry = self.index["files"][Path(path).as_posix()]
+        pieces = []
+        for i, part in enumerate(entry["parts"]):
+            pieces.append(self.get_blob(part) if i % 2 else part.encode('utf-8'))
+        return b"".join(pieces)
+
+    def read_text(self, path):
+        """Original markdown of an archived file"""
+        return self.read_bytes(path).decode('utf-8')
+
+    def add(self, path, kind, date, data):
+        """Archive one file's bytes without touching the file itself"""
+        parts = split_parts(data, kind)
+        self.index["files"][Path(path).as_posix()] = {
+            "kind": kind,
+            "date": date,
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "parts": [self.put_blob(part) if i % 2 else part.decode('utf-8')
+                      for i, part in enumerate(parts)]
+        }
+
+    def archive_closed(self, notes_dir, challenges_dir, current_month):
+        """Move every file of a month before current_month into the store
+
+        Originals are removed only after the index is saved and each file
+        reads back identical, so an interrupted run simply repeats. The
+        whole move runs under the index lock on a freshly read index, so
+        overlapping runs never save an index missing the other's files.
+        """
+        candidates = []
+        for path in sorted(Path(notes_dir).glob("learning_*.md")):
+            match = NOTE_FILE_PATTERN.match(path.name)
+            if match and match.group(1) < current_month:
+                candidates.append((path, "learning_note", match.group(1)))
+        for path in sorted(Path(challenges_dir).glob("challenge_*.md")):
+            match = CHALLENGE_FILE_PATTERN.match(path.name)
+            if match and match.group(2) < current_month:
+                candidates.append((path, "coding_challenge", match.group(1)))
+
+        if not candidates:
+            return []
+
+        with locked(self.index_file):
+            self.loaded_index = None
+
+            originals = {}
+            for path, kind, date in candidates:
+                # Another run may have archived it while this one waited
+                if not path.exists():
+                    continue
+                originals[path] = path.read_bytes()
+                self.add(path, kind, date, originals[path])
+            if not originals:
+                return []
+            self.save_index()
+
+            moved = []
+            for path, data in originals.items():
+                if self.read_bytes(path) != data:
+                    print(f"Archive read-back mismatch, keeping {path}")
+                    continue
+                path.unlink()
+                moved.append(path.as_posix())
+        return moved
+
+
+def read_content(path, store=None):
+    """Bytes of a notes or challenge file, from disk or from the archive"""
+    path = Path(path)
+    if path.exists() or store is None or path not in store:
+        return path.read_bytes()
+    return store.read_bytes(path)
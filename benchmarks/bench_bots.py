@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Bot Benchmark Suite
+Times the hot paths of AIBot, EnhancedBot and AutonomousBot
+Usage: python benchmarks/bench_bots.py [--full] [--baseline FILE] [--save-baseline]
+
+Every benchmark runs in a fresh temp working directory with a stubbed
+Gemini model. Results are written as JSON and compared against the
+committed benchmarks/baseline.json, flagging any benchmark slower than
+the threshold. Refresh the baseline with --save-baseline on the
+reference machine when a change is meant to move the numbers.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from ai_bot_v4 import AIBot  # noqa: E402
+from autonomous_bot import AutonomousBot  # noqa: E402
+from enhanced_bot import EnhancedBot  # noqa: E402
+
+DEFAULT_OUTPUT = REPO_DIR / "benchmarks" / "results" / "latest.json"
+DEFAULT_BASELINE = REPO_DIR / "benchmarks" / "baseline.json"
+
+
+class StubResponse:
+    """Minimal stand-in for a Gemini response"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Gemini stand-in returning unique markdown in the prompt's layout after a fixed latency"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        words = " ".join(f"w{self.calls}x{i}" for i in range(120))
+        sections = [f"## {heading}\n{words if i == 0 else 'Stub.'}\n```python\npass\n```\n"
+                    for i, heading in enumerate(re.findall(r"^## (.+)$", prompt, re.M))]
+        text = f"# Stub entry {self.calls}\n\n" + "\n".join(sections)
+        if stream:
+            return [StubResponse(text[i:i + 256]) for i in range(0, len(text), 256)]
+        return StubResponse(text)
+
+
+@contextlib.contextmanager
+def temp_workdir():
+    """Run the body inside a fresh temp directory"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bot-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            yield Path(workdir)
+        finally:
+            os.chdir(previous)
+
+
+def measure(func, runs):
+    """Wall times in milliseconds of runs calls to func, output silenced"""
+    timings = []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings, **extra):
+    """Summary statistics of a list of timings"""
+    return {
+        "runs": len(timings),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        **extra
+    }
+
+
+def make_ai_bot(latency=0.0):
+    """AIBot wired to a stub model"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot = AIBot()
+    bot.ai_enabled = True
+    bot.model = StubModel(latency)
+    bot.response_cache = bot.setup_response_cache()
+    bot.gemini = bot.setup_gemini_client()
+    bot.should_skip_today = lambda: False
+    return bot
+
+
+def write_synthetic_log(path, lines):
+    """Write a log of lines entries in the current [AI] format"""
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    chunk = []
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Synthetic benchmark log\n\n")
+        for i in range(lines):
+            stamp = (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S")
+            chunk.append(f"[AI] Update at {stamp} UTC\n")
+            if len(chunk) >= 100000:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+
+
+def bench_runs(args, results):
+    """End-to-end run() of each bot"""
+    with temp_workdir():
+        bot = make_ai_bot(args.latency)
+        results["ai_bot_run"] = summarize(measure(bot.run, args.runs), model_latency_s=args.latency)
+
+    with temp_workdir():
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot = EnhancedBot()
+        results["enhanced_bot_run"] = summarize(measure(bot.run, args.runs))
+
+    with temp_workdir():
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot = AutonomousBot()
+        results["autonomous_bot_run"] = summarize(measure(bot.run, args.runs))
+
+
+def bench_uptime(args, results):
+    """calculate_uptime against synthetic logs, cold and warm index"""
+    for lines in args.log_sizes:
+        with temp_workdir():
+            write_synthetic_log("autonomous_logs.txt", lines)
+            with contextlib.redirect_stdout(io.StringIO()):
+                bot = EnhancedBot()
+
+            cold = measure(bot.calculate_uptime, 1)
+            warm = measure(bot.calculate_uptime, args.runs)
+            size = Path("autonomous_logs.txt").stat().st_size
+
+            results[f"uptime_{lines}_cold"] = summarize(cold, log_bytes=size)
+            results[f"uptime_{lines}_warm"] = summarize(warm, log_bytes=size)
+
+
+def bench_readme(args, results):
+    """README rendering of the AI and enhanced bots"""
+    with temp_workdir():
+        bot = make_ai_bot()
+        results["ai_update_readme"] = summarize(measure(bot.update_readme, args.runs))
+
+    with temp_workdir():
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot = EnhancedBot()
+        results["enhanced_update_readme"] = summarize(measure(bot.update_readme_stats, args.runs))
+
+
+def bench_notes_append(args, results):
+    """Monthly notes append against a large existing notes file"""
+    with temp_workdir():
+        bot = make_ai_bot()
+        bot.ensure_directories()
+
+        notes_file = bot.notes_dir / f"learning_{bot.get_utc_timestamp().strftime('%Y-%m')}.md"
+        entry = ("\n\n" + "=" * 60 + "\n\n*Generated: 2020-01-01 00:00:00 UTC*\n\n"
+                 + bot.generate_fallback_note("Benchmark topic"))
+        repeats = max(1, args.notes_mb * 1024 * 1024 // len(entry))
+        notes_file.write_text("# AI Learning Notes - benchmark\n\n" + entry * repeats, encoding='utf-8')
+
+        # First append pays for seeding the sidecar indexes
+        cold = measure(bot.update_ai_learning_note, 1)
+        warm = measure(bot.update_ai_learning_note, args.runs)
+        size = notes_file.stat().st_size
+
+        results["notes_append_cold"] = summarize(cold, notes_bytes=size)
+        results["notes_append_warm"] = summarize(warm, notes_bytes=size)
+
+
+def compare(results, baseline, threshold, min_delta_ms=0.0):
+    """Benchmarks whose best time regressed by more than threshold and min_delta_ms
+
+    The minimum of the repetitions is compared, it is the least disturbed
+    by other load on the machine.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("min_ms"):
+            continue
+        ratio = result["min_ms"] / previous["min_ms"]
+        # Sub-millisecond paths swing by more than the threshold on timer noise alone
+        if ratio > 1 + threshold and result["min_ms"] - previous["min_ms"] > min_delta_ms:
+            regressions.append((name, previous["min_ms"], result["min_ms"], ratio))
+    return regressions
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Bot benchmark suite")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub model latency in seconds")
+    parser.add_argument("--log-sizes", type=lambda v: [int(x) for x in v.split(",")],
+                        default=[10_000, 1_000_000], help="comma separated synthetic log lengths")
+    parser.add_argument("--full", action="store_true", help="include the 10M line log")
+    parser.add_argument("--notes-mb", type=int, default=20, help="size of the large notes file")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="results JSON file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    args = parser.parse_args()
+
+    if args.full and 10_000_000 not in args.log_sizes:
+        args.log_sizes.append(10_000_000)
+
+    random.seed(0)
+    results = {}
+    for bench in (bench_runs, bench_uptime, bench_readme, bench_notes_append):
+        bench(args, results)
+        print(f"done: {bench.__name__}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs
+        },
+        "results": results
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    print(f"\n{'benchmark':<32} {'mean ms':>12} {'min ms':>12}")
+    for name, result in results.items():
+        print(f"{name:<32} {result['mean_ms']:>12.3f} {result['min_ms']:>12.3f}")
+    print(f"\nResults: {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Baseline saved: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline to compare against")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding='utf-8')),
+                          args.threshold, args.min_delta_ms)
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms ({ratio:.2f}x)")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
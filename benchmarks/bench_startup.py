@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Cold start time of 'botctl.py status' against a fixed budget
+Usage: python benchmarks/bench_startup.py [--budget SECONDS] [--runs N]
+
+Fails when the median cold start exceeds the budget or when
+status pulls in google.generativeai or any bot module.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["google.generativeai", "ai_bot_v4", "enhanced_bot", "autonomous_bot"]
+
+PROBE = (
+    "import sys, io, contextlib, botctl\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    botctl.main(['status'])\n"
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+)
+
+
+def time_status(runs):
+    """Wall time of each cold 'botctl.py status' process"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "botctl.py", "status"],
+            cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def imported_heavy_modules():
+    """Heavy modules loaded by the status subcommand"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="botctl status cold start benchmark")
+    parser.add_argument("--budget", type=float, default=0.5, help="median budget in seconds")
+    parser.add_argument("--runs", type=int, default=10, help="number of cold starts")
+    args = parser.parse_args()
+
+    timings = time_status(args.runs)
+    median = statistics.median(timings)
+    heavy = imported_heavy_modules()
+
+    print(f"status cold start: median {median * 1000:.1f} ms, "
+          f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms "
+          f"(budget {args.budget * 1000:.0f} ms)")
+
+    ok = True
+    if median > args.budget:
+        print("FAIL: cold start over budget")
+        ok = False
+    if heavy:
+        print(f"FAIL: status imported {', '.join(heavy)}")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
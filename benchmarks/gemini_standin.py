@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Gemini Stand-in Server
+Local HTTP server speaking the REST generateContent API for offline tests
+Usage: python benchmarks/gemini_standin.py [--port 8765] [--latency lognormal:800:0.5] [--error-rate 0.05]
+
+Point the bot at it with GEMINI_API_ENDPOINT=http://127.0.0.1:8765 and any
+GEMINI_API_KEY. Replies follow the markdown layout the prompt asks for,
+after a latency drawn from the configured distribution, with optional
+server errors, 429 rate limiting, malformed replies and streamed chunks.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MODEL_PATH_PATTERN = re.compile(r"^/v1(?:beta)?/models/([^/:]+):(generateContent|streamGenerateContent)$")
+HEADING_PATTERN = re.compile(r"^## (.+)$", re.MULTILINE)
+
+ERROR_STATUS = {500: "INTERNAL", 503: "UNAVAILABLE", 429: "RESOURCE_EXHAUSTED"}
+
+
+def parse_latency(spec):
+    """Sampler of seconds from 'fixed:MS', 'uniform:LO:HI' or 'lognormal:MEDIAN:SIGMA'"""
+    kind, *values = spec.split(":")
+    values = [float(value) for value in values]
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    raise ValueError(f"bad latency spec '{spec}'")
+
+
+class StandinState:
+    """Behaviour knobs and request statistics shared by all handler threads"""
+
+    def __init__(self, latency="fixed:50", error_rate=0.0, malformed_rate=0.0,
+                 requests_per_minute=0, stream_chunks=4, seed=None):
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.requests_per_minute = requests_per_minute
+        self.stream_chunks = stream_chunks
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window = []
+        self.requests = []
+
+    def draw(self):
+        """Latency, error status and malformed flag of the next request"""
+        with self.lock:
+            now = time.monotonic()
+            status = None
+            if self.requests_per_minute:
+                self.window = [stamp for stamp in self.window if now - stamp < 60]
+                if len(self.window) >= self.requests_per_minute:
+                    status = 429
+                else:
+                    self.window.append(now)
+            if status is None and self.rng.random() < self.error_rate:
+                status = self.rng.choice((500, 503))
+            return self.sample_latency(self.rng), status, self.rng.random() < self.malformed_rate
+
+    def record(self, started, status, streamed, prompt_chars, response_chars):
+        """Keep one served request for the statistics"""
+        with self.lock:
+            self.requests.append({
+                "ms": round((time.perf_counter() - started) * 1000, 3),
+                "status": status,
+                "streamed": streamed,
+                "prompt_chars": prompt_chars,
+                "response_chars": response_chars
+            })
+
+    def stats(self):
+        """Counts by status and served latency percentiles"""
+        with self.lock:
+            requests = list(self.requests)
+        by_status = {}
+        for request in requests:
+            by_status[str(request["status"])] = by_status.get(str(request["status"]), 0) + 1
+        return {
+            "requests": len(requests),
+            "by_status": by_status,
+            "streamed": sum(1 for request in requests if request["streamed"]),
+            "latency_ms": percentiles([request["ms"] for request in requests])
+        }
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Nearest-rank percentiles of values"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {f"p{point}": round(ordered[min(len(ordered) - 1, math.ceil(point / 100 * len(ordered)) - 1)], 3)
+            for point in points}
+
+
+def compose_reply(prompt, rng, malformed):
+    """Markdown in the layout the prompt asks for, one section dropped when malformed"""
+    headings = HEADING_PATTERN.findall(prompt) or ["Overview"]
+    if malformed and len(headings) > 1:
+        headings.pop(rng.randrange(len(headings)))
+
+    words = " ".join(f"w{rng.randrange(10 ** 6)}" for _ in range(60))
+    sections = [f"## {heading}\n{words}\n```python\npass\n```\n" for heading in headings]
+    return f"# Stand-in reply {rng.randrange(10 ** 9)}\n\n" + "\n".join(sections)
+
+
+def response_message(text, prompt, final=True):
+    """generateContent response JSON"""
+    message = {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "index": 0
+        }]
+    }
+    if final:
+        message["candidates"][0]["finishReason"] = "STOP"
+        prompt_tokens = max(1, len(prompt) // 4)
+        output_tokens = max(1, len(text) // 4)
+        message["usageMetadata"] = {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        }
+    return message
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """generateContent and streamGenerateContent endpoints"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Quiet, statistics are collected instead"""
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            self.send_json(200, self.server.state.stats())
+        else:
+            self.send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+    def do_POST(self):
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        match = MODEL_PATH_PATTERN.match(url.path)
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if not match:
+            self.send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+
+        prompt = "".join(part.get("text", "")
+                         for content in request.get("contents", [])
+                         for part in content.get("parts", []))
+        streamed = match.group(2) == "streamGenerateContent"
+        state = self.server.state
+        latency, status, malformed = state.draw()
+
+        if status is not None:
+            # Errors come back fast, like a real overloaded backend
+            time.sleep(min(latency, 0.05))
+            self.send_json(status, {"error": {"code": status, "message": "Stand-in failure",
+                                              "status": ERROR_STATUS[status]}})
+            state.record(started, status, streamed, len(prompt), 0)
+            return
+
+        with state.lock:
+            text = compose_reply(prompt, state.rng, malformed)
+
+        if not streamed:
+            time.sleep(latency)
+            self.send_json(200, response_message(text, prompt))
+        else:
+            self.stream(text, prompt, latency, parse_qs(url.query).get("alt", [""])[0] == "sse")
+        state.record(started, 200, streamed, len(prompt), len(text))
+
+    def stream(self, text, prompt, latency, sse):
+        """Chunked reply spread over the latency, as SSE or a streamed JSON array"""
+        count = max(1, self.server.state.stream_chunks)
+        size = math.ceil(len(text) / count)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json; charset=UTF-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for i, piece in enumerate(pieces):
+            time.sleep(latency / len(pieces))
+            message = json.dumps(response_message(piece, prompt, final=i == len(pieces) - 1))
+            if sse:
+                data = f"data: {message}\r\n\r\n"
+            else:
+                data = ("[" if i == 0 else ",\r\n") + message + ("]" if i == len(pieces) - 1 else "")
+            self.write_chunk(data.encode('utf-8'))
+        self.write_chunk(b"")
+
+    def write_chunk(self, data):
+        """One HTTP/1.1 chunk, the empty chunk ends the body"""
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded stand-in, usable in-process by test harnesses"""
+
+    daemon_threads = True
+
+    def __init__(self, state, host="127.0.0.1", port=0):
+        super().__init__((host, port), StandinHandler)
+        self.state = state
+
+    @property
+    def endpoint(self):
+        """Value for GEMINI_API_ENDPOINT"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a background thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def add_standin_arguments(parser):
+    """Behaviour options shared with the load test"""
+    parser.add_argument("--latency", default="lognormal:800:0.5",
+                        help="fixed:MS, uniform:LO:HI or lognormal:MEDIAN:SIGMA (default: lognormal:800:0.5)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500/503 replies")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of replies missing a section")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute before 429s, 0 for unlimited")
+    parser.add_argument("--stream-chunks", type=int, default=4, help="chunks per streamed reply")
+    parser.add_argument("--seed", type=int, help="random seed")
+
+
+def state_from_args(args):
+    """StandinState from parsed options"""
+    return StandinState(args.latency, args.error_rate, args.malformed_rate,
+                        args.rpm, args.stream_chunks, args.seed)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Local Gemini stand-in server")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address")
+    parser.add_argument("--port", type=int, default=8765, help="listen port")
+    add_standin_arguments(parser)
+    args = parser.parse_args()
+
+    server = StandinServer(state_from_args(args), args.host, args.port)
+    print(f"Gemini stand-in on {server.endpoint} (stats at {server.endpoint}/stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.state.stats(), indent=2))
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
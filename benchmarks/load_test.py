@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Gemini Load Test
+Drives many concurrent AIBot runs against the local Gemini stand-in
+Usage: python benchmarks/load_test.py [--runs 40] [--concurrency 8] [--error-rate 0.1] [--streaming]
+
+Every run is a separate process in its own temp directory, talking to
+the stand-in through the real SDK via GEMINI_API_ENDPOINT. The report
+covers throughput, run and request latency percentiles, retries and
+the share of content that fell back to templates.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from gemini_standin import StandinServer, add_standin_arguments, percentiles, state_from_args  # noqa: E402
+
+DEFAULT_OUTPUT = REPO_DIR / "benchmarks" / "results" / "load_test.json"
+
+# Runs one bot update without the random smart skip and reports the planned content count
+DRIVER = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from ai_bot_v4 import AIBot
+
+bot = AIBot()
+bot.should_skip_today = lambda: False
+planned = []
+run_ai_updates = bot.run_ai_updates
+
+def counted(selected):
+    planned.append(len(selected))
+    return run_ai_updates(selected)
+
+bot.run_ai_updates = counted
+success = bot.run()
+print("LOADTEST " + json.dumps({"items": sum(planned)}))
+sys.exit(0 if success else 1)
+"""
+
+
+def run_config(args):
+    """bot_config.json of every run"""
+    return {
+        "ai_features": {
+            "streaming": args.streaming,
+            "concurrent_generation": not args.sequential,
+            "generation_timeout": args.timeout,
+            "response_cache": {"enabled": False},
+            "resilience": {
+                "requests_per_minute": args.client_rpm,
+                "max_retries": args.max_retries,
+                "retry_base_delay": args.retry_base_delay
+            }
+        }
+    }
+
+
+def one_run(args, endpoint):
+    """Run the driver in a fresh directory, returning wall time and its metrics record"""
+    with tempfile.TemporaryDirectory(prefix="bot-load-") as workdir:
+        Path(workdir, "bot_config.json").write_text(json.dumps(run_config(args), indent=2), encoding='utf-8')
+        env = {**os.environ, "GEMINI_API_KEY": "standin", "GEMINI_API_ENDPOINT": endpoint}
+
+        started = time.perf_counter()
+        process = subprocess.run([sys.executable, "-c", DRIVER, str(REPO_DIR)], cwd=workdir, env=env,
+                                 capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        items = 0
+        for line in process.stdout.splitlines():
+            if line.startswith("LOADTEST "):
+                items = json.loads(line[len("LOADTEST "):])["items"]
+
+        record = None
+        record_file = Path(workdir, ".bot_cache", "metrics", "last_run.json")
+        if record_file.exists():
+            record = json.loads(record_file.read_text(encoding='utf-8'))
+
+        return {"wall_ms": wall_ms, "success": process.returncode == 0, "items": items,
+                "record": record, "stderr": process.stderr[-2000:]}
+
+
+def aggregate(runs, wall_seconds, server_stats):
+    """Throughput, latency percentiles and fallback rates of all runs"""
+    records = [run["record"] for run in runs if run["record"]]
+    calls = [call for record in records for call in record["gemini"]["requests"]]
+    fallbacks = sum(sum(record["fallbacks"].values()) for record in records)
+    items = sum(run["items"] for run in runs)
+    repairs = sum(counts["fixed"] + counts["failed"]
+                  for record in records for counts in record.get("repairs", {}).values())
+
+    return {
+        "runs": len(runs),
+        "failed_runs": sum(1 for run in runs if not run["success"]),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_runs_per_s": round(len(runs) / wall_seconds, 3) if wall_seconds else None,
+        "run_latency_ms": percentiles([run["wall_ms"] for run in runs]),
+        "gemini": {
+            "calls": len(calls),
+            "failed_calls": sum(1 for call in calls if not call["success"]),
+            "errors": sorted({call.get("error") for call in calls if not call["success"]}),
+            "latency_ms": percentiles([call["ms"] for call in calls if call["success"]]),
+            "calls_per_s": round(len(calls) / wall_seconds, 3) if wall_seconds else None
+        },
+        "content_items": items,
+        "fallbacks": fallbacks,
+        "fallback_rate": round(fallbacks / items, 4) if items else None,
+        "repairs": repairs,
+        "server": server_stats
+    }
+
+
+def print_report(report):
+    """Plain text summary"""
+    print(f"\n{report['runs']} runs ({report['failed_runs']} failed) in {report['wall_seconds']}s, "
+          f"{report['throughput_runs_per_s']} runs/s")
+    print(f"{'':<22} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for label, values in (("run latency ms", report["run_latency_ms"]),
+                          ("gemini latency ms", report["gemini"]["latency_ms"]),
+                          ("server latency ms", report["server"]["latency_ms"])):
+        if values:
+            print(f"{label:<22} {values['p50']:>10.1f} {values['p95']:>10.1f} {values['p99']:>10.1f}")
+
+    gemini = report["gemini"]
+    print(f"\nGemini calls: {gemini['calls']} ({gemini['failed_calls']} failed: {', '.join(gemini['errors']) or '-'}), "
+          f"{gemini['calls_per_s']}/s")
+    print(f"Server replies: {report['server']['by_status']}")
+    rate = report["fallback_rate"]
+    print(f"Fallbacks: {report['fallbacks']} of {report['content_items']} items"
+          + (f" ({rate:.1%})" if rate is not None else "") + f", repairs: {report['repairs']}")
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Concurrent AIBot load test against the Gemini stand-in")
+    parser.add_argument("--runs", type=int, default=40, help="bot runs in total")
+    parser.add_argument("--concurrency", type=int, default=8, help="runs in flight at once")
+    parser.add_argument("--streaming", action="store_true", help="stream replies to disk")
+    parser.add_argument("--sequential", action="store_true", help="disable concurrent generation inside a run")
+    parser.add_argument("--timeout", type=float, default=10, help="generation_timeout in seconds")
+    parser.add_argument("--max-retries", type=int, default=3, help="client retries of transient errors")
+    parser.add_argument("--retry-base-delay", type=float, default=0.2, help="client retry base delay")
+    parser.add_argument("--client-rpm", type=int, default=600, help="client-side requests per minute per run")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="report JSON file")
+    add_standin_arguments(parser)
+    parser.set_defaults(latency="lognormal:300:0.5")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("google.generativeai") is None:
+        print("The load test drives the real SDK: pip install google-generativeai")
+        return 1
+
+    server = StandinServer(state_from_args(args)).start()
+    print(f"Stand-in on {server.endpoint}, {args.runs} runs at concurrency {args.concurrency}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        runs = list(executor.map(lambda _: one_run(args, server.endpoint), range(args.runs)))
+    wall_seconds = time.perf_counter() - started
+
+    server.shutdown()
+    server.server_close()
+
+    report = aggregate(runs, wall_seconds, server.state.stats())
+    report["settings"] = {key: value for key, value in vars(args).items() if key != "output"}
+
+    failed = [run for run in runs if not run["success"]]
+    if failed:
+        print(f"First failed run:\n{failed[0]['stderr']}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, default=str), encoding='utf-8')
+
+    print_report(report)
+    print(f"\nReport: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
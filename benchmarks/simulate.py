@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Virtual-Clock Simulation
+Replays months of scheduled bot runs in seconds to expose growth problems
+Usage: python benchmarks/simulate.py [--days 365] [--bots ai,enhanced] [--keep DIR]
+
+Every bot reads time through get_utc_timestamp(), which is swapped for a
+virtual clock stepping through the workflow cron schedule. The Gemini
+model is a stub and everything runs in a temp directory. The report
+tracks file sizes, per-run latency and traced memory over time.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from bench_bots import StubModel, temp_workdir  # noqa: E402
+from botctl import BOTS  # noqa: E402
+
+DEFAULT_OUTPUT = REPO_DIR / "benchmarks" / "results" / "simulation.json"
+
+# Cron hours of the bot workflows, each delayed by up to 30 minutes
+SCHEDULE_HOURS = (9, 14, 18, 22)
+MAX_DELAY_SECONDS = 1800
+
+# Settings that would otherwise tie the simulation to the wall clock: the
+# response cache TTL and the rate limiter both read real time
+SIMULATION_CONFIG = {
+    "ai_features": {
+        "concurrent_generation": False,
+        "response_cache": {"enabled": False},
+        "resilience": {"requests_per_minute": 1000000, "retry_base_delay": 0}
+    }
+}
+
+
+class VirtualClock:
+    """Stand-in for get_utc_timestamp with a settable time"""
+
+    def __init__(self, start):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+
+def schedule(start, days):
+    """Run times of the cron schedule with the workflow's random delay"""
+    for day in range(days):
+        date = start + timedelta(days=day)
+        for hour in SCHEDULE_HOURS:
+            yield date.replace(hour=hour) + timedelta(seconds=random.randrange(MAX_DELAY_SECONDS))
+
+
+def make_bot(name, clock, model):
+    """Bot on the virtual clock, AI bots wired to the stub model"""
+    module_name, class_name = BOTS[name]
+    bot = getattr(importlib.import_module(module_name), class_name)()
+    bot.get_utc_timestamp = clock.now
+
+    if name == "ai":
+        bot.ai_enabled = True
+        bot.model = model
+        bot.response_cache = bot.setup_response_cache()
+        bot.gemini = bot.setup_gemini_client()
+    return bot
+
+
+def directory_size(path):
+    """Total bytes and file count below path"""
+    total, count = 0, 0
+    if path.exists():
+        for file in path.rglob("*"):
+            if file.is_file():
+                total += file.stat().st_size
+                count += 1
+    return total, count
+
+
+def measure_files():
+    """Sizes of the files and directories the bots grow"""
+    sizes = {}
+    for name in ("autonomous_logs.txt", "autonomous_logs.idx.json", "run_events.jsonl",
+                 "bot_status.json", "README.md", "daily_quotes.txt"):
+        path = Path(name)
+        sizes[name] = path.stat().st_size if path.exists() else 0
+
+    for name in ("ai_notes", "coding_challenges", "archive", "notes", "snippets", "logs", ".bot_cache"):
+        total, count = directory_size(Path(name))
+        sizes[f"{name}/"] = total
+        sizes[f"{name}/files"] = count
+
+    notes = list(Path("ai_notes").glob("learning_*.md"))
+    sizes["largest_notes_file"] = max((path.stat().st_size for path in notes), default=0)
+    return sizes
+
+
+def summarize_window(timings):
+    """Latency statistics of one sampling window"""
+    ordered = sorted(timings)
+    return {
+        "runs": len(timings),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+
+def simulate(args):
+    """Replay the schedule and collect samples every sample_days"""
+    os.environ.pop("GEMINI_API_KEY", None)
+    random.seed(args.seed)
+
+    start = datetime(args.start_year, 1, 1, tzinfo=timezone.utc)
+    clock = VirtualClock(start)
+    model = StubModel()
+    bots = args.bots
+
+    Path("bot_config.json").write_text(json.dumps(SIMULATION_CONFIG, indent=2), encoding='utf-8')
+
+    samples = []
+    window, all_timings = [], []
+    next_sample = start + timedelta(days=args.sample_days)
+    failures = 0
+
+    tracemalloc.start()
+    wall_start = time.perf_counter()
+
+    for i, run_at in enumerate(schedule(start, args.days)):
+        clock.current = run_at
+        name = bots[i % len(bots)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            began = time.perf_counter()
+            bot = make_bot(name, clock, model)
+            if not bot.run():
+                failures += 1
+            elapsed = (time.perf_counter() - began) * 1000
+
+        window.append(elapsed)
+        all_timings.append(elapsed)
+
+        if run_at >= next_sample:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            samples.append({
+                "date": run_at.strftime("%Y-%m-%d"),
+                "runs": i + 1,
+                "latency": summarize_window(window),
+                "memory_kb": round(current / 1024, 1),
+                "peak_memory_kb": round(peak / 1024, 1),
+                "files": measure_files()
+            })
+            window = []
+            next_sample += timedelta(days=args.sample_days)
+
+    tracemalloc.stop()
+
+    # Growth: last sampling window against the first one
+    growth = None
+    if len(samples) >= 2:
+        growth = round(samples[-1]["latency"]["mean_ms"] / samples[0]["latency"]["mean_ms"], 2)
+
+    return {
+        "meta": {
+            "days": args.days,
+            "bots": bots,
+            "runs": len(all_timings),
+            "failures": failures,
+            "wall_seconds": round(time.perf_counter() - wall_start, 2),
+            "model_calls": model.calls,
+            "latency_growth": growth
+        },
+        "overall": summarize_window(all_timings) if all_timings else None,
+        "final_files": measure_files(),
+        "samples": samples
+    }
+
+
+def print_report(report):
+    """Plain text table of the samples"""
+    meta = report["meta"]
+    print(f"\nSimulated {meta['runs']} runs over {meta['days']} days "
+          f"({', '.join(meta['bots'])}) in {meta['wall_seconds']}s, {meta['failures']} failed")
+
+    print(f"\n{'date':<12} {'runs':>6} {'mean ms':>9} {'p95 ms':>9} {'mem KB':>9} {'peak KB':>9} "
+          f"{'log KB':>9} {'notes KB':>9} {'max note':>9} {'events KB':>10}")
+    for sample in report["samples"]:
+        files = sample["files"]
+        print(f"{sample['date']:<12} {sample['runs']:>6} {sample['latency']['mean_ms']:>9.2f} "
+              f"{sample['latency']['p95_ms']:>9.2f} {sample['memory_kb']:>9.0f} {sample['peak_memory_kb']:>9.0f} "
+              f"{files['autonomous_logs.txt'] / 1024:>9.1f} {files['ai_notes/'] / 1024:>9.1f} "
+              f"{files['largest_notes_file'] / 1024:>9.1f} {files['run_events.jsonl'] / 1024:>10.1f}")
+
+    if meta["latency_growth"] is not None:
+        print(f"\nPer-run latency, last window vs first: {meta['latency_growth']}x")
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Virtual-clock bot simulation")
+    parser.add_argument("--days", type=int, default=365, help="simulated days")
+    parser.add_argument("--bots", type=lambda v: v.split(","), default=["ai"],
+                        help="comma separated bots, alternated run by run")
+    parser.add_argument("--sample-days", type=int, default=30, help="days between samples")
+    parser.add_argument("--start-year", type=int, default=2030, help="first simulated year")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--keep", type=Path, help="copy the simulated tree here afterwards")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="report JSON file")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.bots if name not in BOTS]
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+
+    with temp_workdir() as workdir:
+        report = simulate(args)
+        if args.keep:
+            shutil.copytree(workdir, args.keep, dirs_exist_ok=True)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    print_report(report)
+    print(f"\nReport: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
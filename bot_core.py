@@ -0,0 +1,223 @@
+"""
+Shared bot core
+State, activity log and run bookkeeping common to every bot version.
+Each bot declares its update stages, run() executes them as a pipeline.
+"""
+
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+
+from log_index import LogIndex
+from log_segments import SegmentedLog
+from metrics import MetricsExporter, RunMetrics, bytes_written, snapshot_files
+from pipeline import Pipeline
+from run_events import RunEventLog, make_event
+from state_store import get_state_store
+
+
+class BaseBot:
+    """Common core, subclasses define the config and the stage pipeline"""
+
+    # Key used in run events and by botctl
+    bot_key = "bot"
+    run_label = "Bot"
+
+    def __init__(self):
+        self.config_file = Path("bot_config.json")
+        self.log_file = Path("autonomous_logs.txt")
+        self.status_file = Path("bot_status.json")
+        self.readme_file = Path("README.md")
+        self.log_index = LogIndex(self.log_file)
+        self.state = get_state_store(self.config_file, self.status_file)
+
+        self.config = self.load_config()
+        self.config_version = self.state.config_version
+        self.activity_log = SegmentedLog.from_config(self.log_file, self.log_index, self.config)
+        self.run_events = RunEventLog(Path("run_events.jsonl"))
+        self.modified_files = []
+        self.stage_timings = {}
+        self.metrics = RunMetrics(self.bot_key)
+        # README bookkeeping of this run, kept in the status record
+        self.readme_state = None
+
+    def load_config(self):
+        """Bot config merged over the defaults"""
+        return self.state.load_config()
+
+    def refresh(self):
+        """Prepare a long-lived bot for another run, True if the config changed
+
+        Config and status are re-read only when their files changed on disk,
+        per-run bookkeeping always starts over.
+        """
+        self.state.refresh()
+        changed = self.state.config_version != self.config_version
+        if changed:
+            self.config = self.load_config()
+            self.config_version = self.state.config_version
+            self.activity_log = SegmentedLog.from_config(self.log_file, self.log_index, self.config)
+
+        self.modified_files = []
+        self.stage_timings = {}
+        self.metrics = RunMetrics(self.bot_key)
+        self.readme_state = None
+        return changed
+
+    def get_utc_timestamp(self):
+        """Get current UTC timestamp"""
+        return datetime.now(timezone.utc)
+
+    def format_timestamp(self, dt):
+        """Format timestamp for logs"""
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    def get_total_runs(self):
+        """Get total number of runs"""
+        return self.state.status.get('total_runs', 0)
+
+    def run_mode(self):
+        """Mode recorded for this run"""
+        return self.config["mode"]
+
+    def api_usage(self):
+        """(calls, total latency ms) of remote API calls this run"""
+        return 0, None
+
+    def print_banner(self):
+        """Print the start banner"""
+        print(f"Bot: {self.config['bot_name']} v{self.config['version']}")
+
+    def should_skip_today(self):
+        """Whether this run is skipped entirely"""
+        return False
+
+    def prepare(self):
+        """Work done before any stage starts"""
+
+    def output_dirs(self):
+        """Directories whose files the stages write, for bytes-written metrics"""
+        return ["."]
+
+    def build_pipeline(self, pipeline):
+        """Register the bot's update stages"""
+        raise NotImplementedError
+
+    def update_status(self):
+        """Update bot status file"""
+        raise NotImplementedError
+
+    def write_readme(self, template, stats):
+        """Refresh README.md from a ReadmeTemplate, True if the file changed"""
+        changed, self.readme_state = template.write(
+            self.readme_file, stats, self.get_utc_timestamp(), self.state.status.get("readme"),
+            self.config.get("readme", {}).get("min_interval_hours", 12)
+        )
+        return changed
+
+    def finish_status(self):
+        """Final stage: write the status record"""
+        readme_state = self.readme_state or self.state.status.get("readme")
+        self.update_status()
+        if readme_state:
+            self.state.status["readme"] = readme_state
+        self.state.flush()
+        return str(self.status_file)
+
+    def record_run_event(self, started, success, files):
+        """Append a structured record of this run"""
+        api_calls, api_latency_ms = self.api_usage()
+        try:
+            self.run_events.append(make_event(
+                self.format_timestamp(self.get_utc_timestamp()),
+                self.bot_key,
+                self.config["version"],
+                self.run_mode(),
+                success=success,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                files=files,
+                api_calls=api_calls,
+                api_latency_ms=api_latency_ms,
+                stage_ms=self.stage_timings or None
+            ))
+        except Exception as e:
+            print(f"Run event not recorded: {e}")
+
+    def record_stage_metrics(self, pipeline, before):
+        """Wall time and bytes written of every stage that ran"""
+        for name, ms in pipeline.timings.items():
+            files = self.collect_files([pipeline.results.get(name)])
+            self.metrics.record_stage(name, ms, bytes_written(files, before))
+
+    def export_metrics(self, started, success):
+        """Write the run's metrics record and Prometheus textfile"""
+        now = self.get_utc_timestamp()
+        try:
+            record = self.metrics.to_dict(
+                self.format_timestamp(now),
+                self.run_mode(),
+                success,
+                round((time.perf_counter() - started) * 1000, 1)
+            )
+            MetricsExporter.from_config(self.config).export(record, now.timestamp())
+        except Exception as e:
+            print(f"Metrics not exported: {e}")
+
+    @staticmethod
+    def collect_files(results):
+        """Files reported by a sequence of stage results"""
+        files = []
+        for result in results:
+            if isinstance(result, (list, tuple)):
+                files.extend(path for path in result if path)
+            elif isinstance(result, str):
+                files.append(result)
+        return files
+
+    def run(self):
+        """Main bot execution"""
+        if not self.config.get("enabled", True):
+            print("Bot is disabled in configuration")
+            return False
+
+        started = time.perf_counter()
+        self.print_banner()
+
+        # Smart pattern: skip occasionally
+        if self.should_skip_today():
+            print("Smart skip: Simulating busy day")
+            return True
+
+        before = {}
+        try:
+            self.prepare()
+            before = snapshot_files(self.output_dirs())
+
+            pipeline = Pipeline(self.config.get("pipeline", {}).get("max_workers", 4))
+            self.build_pipeline(pipeline)
+            # Status always comes last, after every content stage
+            pipeline.add("status", self.finish_status, depends=list(pipeline.stages))
+
+            try:
+                results = pipeline.run()
+            finally:
+                self.stage_timings = pipeline.timings
+                self.record_stage_metrics(pipeline, before)
+
+            self.modified_files = self.collect_files(results[name] for name in pipeline.stages)
+            self.record_run_event(started, True, self.modified_files)
+            self.export_metrics(started, True)
+
+            print(f"\n{self.run_label} completed successfully")
+            print(f"Modified files: {len(self.modified_files)}")
+            print(f"Files: {', '.join(self.modified_files)}")
+            print("Stages: " + ", ".join(f"{name} {ms:.1f}ms" for name, ms in self.stage_timings.items()))
+            return True
+
+        except Exception as e:
+            print(f"{self.run_label} failed: {e}")
+            self.record_run_event(started, False, [])
+            self.export_metrics(started, False)
+            traceback.print_exc()
+            return False
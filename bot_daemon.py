@@ -0,0 +1,169 @@
+"""
+Bot daemon
+Long-running asyncio scheduler that triggers bot runs on the configured
+schedule, keeping each bot, its Gemini model and connections warm in
+between and re-reading config and status only when their files change.
+"""
+
+import asyncio
+import random
+import signal
+from datetime import datetime, timedelta, timezone
+
+from state_store import DEFAULT_CONFIG, get_state_store
+
+
+def parse_schedule(values):
+    """Sorted (hour, minute) pairs of 'HH:MM' entries, bad entries skipped"""
+    times = set()
+    for value in values:
+        try:
+            hour, minute = (int(part) for part in str(value).split(":"))
+            if 0 <= hour < 24 and 0 <= minute < 60:
+                times.add((hour, minute))
+                continue
+        except ValueError:
+            pass
+        print(f"Ignoring schedule entry '{value}', expected HH:MM")
+    return sorted(times)
+
+
+def next_slot(now, times, jitter_minutes=0, rng=random):
+    """Start of the next slot after now plus a random delay, None without slots"""
+    for days in (0, 1):
+        day = now + timedelta(days=days)
+        for hour, minute in times:
+            slot = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if slot > now:
+                return slot + timedelta(seconds=rng.uniform(0, jitter_minutes * 60))
+    return None
+
+
+class BotDaemon:
+    """Scheduler holding one warm instance per bot"""
+
+    def __init__(self, load_bot, bots=None, on_run=None, clock=None, rng=None):
+        self.load_bot = load_bot
+        self.bot_names = bots
+        self.on_run = on_run
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.rng = rng or random.Random()
+        self.state = get_state_store()
+        self.config_version = None
+        self.settings = dict(DEFAULT_CONFIG["daemon"])
+        self.bots = {}
+        self.stopping = None
+        self.runs = 0
+
+    def refresh_settings(self):
+        """Reload the daemon section when bot_config.json changed, True if it did"""
+        self.state.refresh()
+        if self.state.config_version == self.config_version:
+            return False
+
+        self.config_version = self.state.config_version
+        self.settings = self.state.load_config()["daemon"]
+        if self.bot_names:
+            self.settings["bots"] = self.bot_names
+        return True
+
+    def timing(self):
+        """Settings that decide when the next run is due"""
+        return self.settings["schedule"], self.settings["jitter_minutes"]
+
+    async def get_bot(self, name):
+        """Warm bot instance, built off the loop on first use"""
+        if name not in self.bots:
+            loop = asyncio.get_running_loop()
+            bot = await loop.run_in_executor(None, self.load_bot, name)
+            if hasattr(bot, "event_loop"):
+                bot.event_loop = loop
+            self.bots[name] = bot
+        return self.bots[name]
+
+    async def run_bot(self, name):
+        """One run of a bot in a worker thread, the loop stays responsive"""
+        loop = asyncio.get_running_loop()
+        try:
+            bot = await self.get_bot(name)
+            bot.refresh()
+            success = await loop.run_in_executor(None, bot.run)
+        except Exception as e:
+            print(f"Daemon run of {name} failed: {e}")
+            return False
+
+        self.runs += 1
+        if self.on_run:
+            try:
+                await loop.run_in_executor(None, self.on_run, bot, success)
+            except Exception as e:
+                print(f"After-run hook of {name} failed: {e}")
+        return success
+
+    async def run_slot(self):
+        """Run every configured bot once, one after another"""
+        for name in self.settings["bots"]:
+            if self.stopping.is_set():
+                break
+            await self.run_bot(name)
+
+    async def wait_until(self, due):
+        """Sleep until due, False when stopped or the schedule changed first
+
+        Other config changes keep the pending due time, recomputing it
+        inside a slot's jitter window would skip that slot.
+        """
+        while not self.stopping.is_set():
+            remaining = (due - self.clock()).total_seconds()
+            if remaining <= 0:
+                return True
+            try:
+                await asyncio.wait_for(self.stopping.wait(), min(remaining, self.settings["poll_seconds"]))
+            except asyncio.TimeoutError:
+                timing = self.timing()
+                if self.refresh_settings() and self.timing() != timing:
+                    print("Schedule changed, rescheduling")
+                    return False
+        return False
+
+    def install_signal_handlers(self, loop):
+        """Stop after the current run on SIGINT/SIGTERM where supported"""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stopping.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows: Ctrl+C still ends the process through KeyboardInterrupt
+                pass
+
+    async def serve(self, run_now=False, max_runs=None):
+        """Schedule runs until stopped, or until max_runs bot runs happened"""
+        self.stopping = asyncio.Event()
+        self.install_signal_handlers(asyncio.get_running_loop())
+        self.refresh_settings()
+
+        # Pay for imports and model setup before the first slot
+        for name in self.settings["bots"]:
+            try:
+                await self.get_bot(name)
+            except Exception as e:
+                print(f"Could not start {name}: {e}")
+        print(f"Daemon ready: {', '.join(self.settings['bots'])}")
+
+        if run_now:
+            await self.run_slot()
+
+        while not self.stopping.is_set() and (max_runs is None or self.runs < max_runs):
+            self.refresh_settings()
+            due = next_slot(self.clock(), parse_schedule(self.settings["schedule"]),
+                            self.settings["jitter_minutes"], self.rng)
+            if due is None:
+                print("No valid schedule entries, waiting for a config change")
+                due = self.clock() + timedelta(days=1)
+            else:
+                print(f"Next run at {due.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+
+            if await self.wait_until(due):
+                await self.run_slot()
+
+        print(f"Daemon stopped after {self.runs} runs")
+        return True
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Bot Control CLI
+Single entry point for all bot versions
+Author: blogecoin
+Usage: python botctl.py {run,daemon,status,stats,analytics,prefetch,search,events,metrics} [options]
+
+Bot modules and the Gemini SDK are imported only by the
+subcommands that need them, so status queries start instantly.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+
+BOTS = {
+    "ai": ("ai_bot_v4", "AIBot"),
+    "enhanced": ("enhanced_bot", "EnhancedBot"),
+    "autonomous": ("autonomous_bot", "AutonomousBot")
+}
+
+STATUS_FILE = Path("bot_status.json")
+LOG_FILE = Path("autonomous_logs.txt")
+EVENTS_FILE = Path("run_events.jsonl")
+LEGACY_COMMIT_LOG = Path("log.txt")
+
+# Bookkeeping files any run may touch besides its reported outputs
+STATE_PATHS = [
+    "bot_config.json",
+    "run_events.jsonl",
+    "autonomous_logs.idx.json",
+    "logs",
+    "ai_notes/fingerprints.jsonl",
+    "coding_challenges/fingerprints.jsonl",
+    "ai_spool"
+]
+
+
+def load_bot(name):
+    """Import a bot module on demand and build the bot"""
+    module_name, class_name = BOTS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+def commit_changes(paths, message, push=False):
+    """Commit exactly the given paths plus bot bookkeeping files"""
+    from git_commit_engine import GitCommitEngine, GitError
+
+    engine = GitCommitEngine()
+    try:
+        commit = engine.commit(list(paths) + STATE_PATHS, message)
+        if commit is None:
+            print("Nothing to commit")
+            return True
+        print(f"Committed {commit[:7]}: {message}")
+
+        if push:
+            engine.push()
+            print("Pushed")
+        return True
+    except GitError as e:
+        print(f"Commit failed: {e}")
+        return False
+
+
+def cmd_run(args):
+    """Run one bot update"""
+    bot = load_bot(args.bot)
+    success = bot.run()
+    if success and args.commit:
+        return commit_changes(bot.modified_files, args.commit, args.push)
+    return success
+
+
+def cmd_daemon(args):
+    """Run bots on the configured schedule in one long-lived process"""
+    import asyncio
+    from datetime import datetime, timezone
+
+    from bot_daemon import BotDaemon
+
+    def commit_run(bot, success):
+        if success and args.commit:
+            stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+            commit_changes(bot.modified_files, f"{args.commit} - {stamp}", args.push)
+
+    daemon = BotDaemon(load_bot, bots=args.bot, on_run=commit_run)
+    try:
+        return asyncio.run(daemon.serve(run_now=args.now, max_runs=args.max_runs))
+    except KeyboardInterrupt:
+        print("Daemon interrupted")
+        return True
+
+
+def cmd_prefetch(args):
+    """Pre-generate AI content into the spool"""
+    success = load_bot("ai").prefetch(args.count)
+    if success and args.commit:
+        return commit_changes([], args.commit, args.push)
+    return success
+
+
+def cmd_status(args):
+    """Print the status file"""
+    if not STATUS_FILE.exists():
+        print("No status yet, the bot has not run")
+        return False
+
+    with open(STATUS_FILE, 'r', encoding='utf-8') as f:
+        status = json.load(f)
+
+    if args.json:
+        print(json.dumps(status, indent=2))
+    else:
+        for key, value in status.items():
+            print(f"{key + ':':<16} {value}")
+    return True
+
+
+def cmd_stats(args):
+    """Print run statistics from the log index"""
+    from datetime import datetime, timezone
+    from log_index import LogIndex
+    from log_segments import SegmentedLog
+
+    index = LogIndex(LOG_FILE)
+    activity_log = SegmentedLog(LOG_FILE, index=index)
+    stats = {
+        "log_entries": index.entry_count,
+        "first_entry": index.data["first_timestamp"],
+        "last_entry": index.data["last_timestamp"],
+        "uptime_days": index.uptime_days(datetime.now(timezone.utc)),
+        "segments": len(activity_log.manifest["segments"]),
+        "recent": activity_log.tail(args.tail)
+    }
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        for key, value in stats.items():
+            if key != "recent":
+                print(f"{key + ':':<16} {value}")
+        if stats["recent"]:
+            print(f"\nLast {len(stats['recent'])} entries:")
+            for line in stats["recent"]:
+                print(f"  {line}")
+    return True
+
+
+def cmd_analytics(args):
+    """Print vectorized activity analytics over the whole run history"""
+    try:
+        from activity_stats import analyze, format_table, load_activity
+    except ImportError:
+        print("Analytics need NumPy: pip install numpy")
+        return False
+
+    seconds, kinds = load_activity(LOG_FILE)
+    report = analyze(seconds, kinds, args.gap_hours, args.window, args.expected)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(report, args.days))
+    return True
+
+
+def cmd_search(args):
+    """Full-text search over notes and challenges"""
+    from archive_store import ArchiveStore
+    from search_index import SearchIndex
+
+    index = SearchIndex(archive=ArchiveStore())
+    index.sync()
+    hits = index.search(args.query, limit=args.limit)
+
+    if args.json:
+        print(json.dumps(hits, indent=2))
+    else:
+        for hit in hits:
+            print(f"{hit['score']:>7}  {hit['path']}@{hit['offset']}  [{hit['generated']}] {hit['title']}")
+            print(f"         {' '.join(hit['snippet'].split())}")
+        if not hits:
+            print("No matches")
+    return bool(hits)
+
+
+def cmd_events(args):
+    """Summarize structured run events, migrating legacy logs on request"""
+    from log_segments import SegmentedLog
+    from run_events import RunEventLog
+
+    events = RunEventLog(EVENTS_FILE)
+
+    if args.migrate:
+        def legacy_lines():
+            if LEGACY_COMMIT_LOG.exists():
+                with open(LEGACY_COMMIT_LOG, 'r', encoding='utf-8') as f:
+                    yield from f
+            yield from SegmentedLog(LOG_FILE).iter_entries()
+
+        migrated = events.migrate(legacy_lines())
+        print(f"Migrated {migrated} legacy entries into {EVENTS_FILE}")
+
+    summary = events.summarize()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f"{key + ':':<20} {value}")
+    return True
+
+
+def cmd_metrics(args):
+    """Print the metrics record of the last run"""
+    from metrics import MetricsExporter
+    from state_store import get_state_store
+
+    exporter = MetricsExporter.from_config(get_state_store().load_config())
+    if args.prom:
+        if not exporter.textfile.exists():
+            print("No metrics yet, the bot has not run")
+            return False
+        print(exporter.textfile.read_text(encoding='utf-8'), end="")
+        return True
+
+    if not exporter.record_file.exists():
+        print("No metrics yet, the bot has not run")
+        return False
+
+    with open(exporter.record_file, 'r', encoding='utf-8') as f:
+        record = json.load(f)
+
+    if args.json:
+        print(json.dumps(record, indent=2))
+        return True
+
+    print(f"{record['timestamp']}  {record['bot']} ({record['mode']})  "
+          f"{'ok' if record['success'] else 'failed'} in {record['duration_ms']}ms")
+    print("\nStages:")
+    for name, stage in record["stages"].items():
+        print(f"  {name:<14} {stage['ms']:>10.1f}ms {stage['bytes']:>10} bytes")
+
+    gemini = record["gemini"]
+    if gemini["calls"]:
+        tokens = ", ".join(f"{kind} {count}" for kind, count in gemini["tokens"].items()) or "not reported"
+        print(f"\nGemini: {gemini['calls']} calls ({gemini['failed']} failed), {gemini['ms']:.1f}ms, "
+              f"{gemini['prompt_bytes']} bytes out, {gemini['response_bytes']} bytes in, tokens: {tokens}")
+    if record["fallbacks"]:
+        print("Fallbacks: " + ", ".join(f"{kind} {count}" for kind, count in record["fallbacks"].items()))
+    if record.get("repairs"):
+        print("Repairs: " + ", ".join(f"{kind} {counts['fixed']} fixed, {counts['failed']} failed"
+                                      for kind, counts in record["repairs"].items()))
+    return True
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(prog="botctl", description="Daily logs bot control")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run one bot update")
+    run_parser.add_argument("--bot", choices=sorted(BOTS), default="ai", help="bot version (default: ai)")
+    run_parser.add_argument("--commit", metavar="MESSAGE", help="commit the files the run touched")
+    run_parser.add_argument("--push", action="store_true", help="push after committing")
+    run_parser.set_defaults(func=cmd_run)
+
+    daemon_parser = subparsers.add_parser("daemon", help="run bots on a schedule with warm clients")
+    daemon_parser.add_argument("--bot", action="append", choices=sorted(BOTS),
+                               help="bot to schedule, repeatable (default: daemon.bots in the config)")
+    daemon_parser.add_argument("--now", action="store_true", help="run once immediately at start")
+    daemon_parser.add_argument("--max-runs", type=int, help="exit after this many bot runs")
+    daemon_parser.add_argument("--commit", metavar="MESSAGE", help="commit each run's files, timestamp appended")
+    daemon_parser.add_argument("--push", action="store_true", help="push after committing")
+    daemon_parser.set_defaults(func=cmd_daemon)
+
+    status_parser = subparsers.add_parser("status", help="show bot_status.json")
+    status_parser.add_argument("--json", action="store_true", help="raw JSON output")
+    status_parser.set_defaults(func=cmd_status)
+
+    stats_parser = subparsers.add_parser("stats", help="show run statistics")
+    stats_parser.add_argument("--tail", type=int, default=5, help="recent entries to show")
+    stats_parser.add_argument("--json", action="store_true", help="JSON output")
+    stats_parser.set_defaults(func=cmd_stats)
+
+    analytics_parser = subparsers.add_parser("analytics", help="activity histograms, gaps and success rates")
+    analytics_parser.add_argument("--gap-hours", type=float, default=12, help="report gaps longer than this")
+    analytics_parser.add_argument("--window", type=int, default=7, help="rolling success window in days")
+    analytics_parser.add_argument("--expected", type=int, default=4, help="scheduled runs per day")
+    analytics_parser.add_argument("--days", type=int, default=14, help="days shown in the text table")
+    analytics_parser.add_argument("--json", action="store_true", help="JSON output")
+    analytics_parser.set_defaults(func=cmd_analytics)
+
+    prefetch_parser = subparsers.add_parser("prefetch", help="spool AI content ahead of time")
+    prefetch_parser.add_argument("count", type=int, help="notes and challenges to generate")
+    prefetch_parser.add_argument("--commit", metavar="MESSAGE", help="commit the refilled spool")
+    prefetch_parser.add_argument("--push", action="store_true", help="push after committing")
+    prefetch_parser.set_defaults(func=cmd_prefetch)
+
+    search_parser = subparsers.add_parser("search", help="search notes and challenges")
+    search_parser.add_argument("query", help="words to look for")
+    search_parser.add_argument("--limit", type=int, default=10, help="maximum hits")
+    search_parser.add_argument("--json", action="store_true", help="JSON output")
+    search_parser.set_defaults(func=cmd_search)
+
+    events_parser = subparsers.add_parser("events", help="summarize structured run events")
+    events_parser.add_argument("--migrate", action="store_true", help="ingest legacy text logs first")
+    events_parser.add_argument("--json", action="store_true", help="JSON output")
+    events_parser.set_defaults(func=cmd_events)
+
+    metrics_parser = subparsers.add_parser("metrics", help="show the last run's stage and Gemini metrics")
+    metrics_parser.add_argument("--json", action="store_true", help="JSON record")
+    metrics_parser.add_argument("--prom", action="store_true", help="Prometheus textfile")
+    metrics_parser.set_defaults(func=cmd_metrics)
+
+    return parser
+
+
+def main(argv=None):
+    """Main execution"""
+    args = build_parser().parse_args(argv)
+    success = args.func(args)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
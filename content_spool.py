@@ -0,0 +1,104 @@
+"""
+Pre-generated content spool
+FIFO queues of ready-made AI content on disk, one file per item,
+with a small manifest holding head/tail counters per kind.
+"""
+
+import json
+from pathlib import Path
+
+from file_locks import locked
+from state_store import atomic_write_json
+
+SPOOL_KINDS = ("learning_note", "coding_challenge")
+
+
+class ContentSpool:
+    """Spool of AI content generated ahead of the scheduled runs"""
+
+    def __init__(self, spool_dir):
+        self.spool_dir = Path(spool_dir)
+        self.manifest_file = self.spool_dir / "manifest.json"
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self):
+        """Load queue counters, empty queues if there is no manifest"""
+        manifest = {"version": 1, "queues": {kind: {"head": 0, "tail": 0} for kind in SPOOL_KINDS}}
+
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    manifest["queues"].update(json.load(f).get("queues", {}))
+            except Exception:
+                pass
+
+        return manifest
+
+    def save_manifest(self):
+        """Write the manifest via temp file and rename"""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.manifest_file, self.manifest)
+
+    def item_file(self, kind, position):
+        """Path of the item at a queue position"""
+        return self.spool_dir / kind / f"{position:06d}.json"
+
+    def size(self, kind):
+        """Number of items waiting in a queue"""
+        queue = self.manifest["queues"][kind]
+        return queue["tail"] - queue["head"]
+
+    def push(self, kind, subject, content, generated):
+        """Append an item to the tail of a queue"""
+        with locked(self.manifest_file):
+            # Counters on disk win, another process may have pushed or popped
+            self.manifest = self.load_manifest()
+            queue = self.manifest["queues"][kind]
+            item_file = self.item_file(kind, queue["tail"])
+            item_file.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(item_file, 'w', encoding='utf-8') as f:
+                json.dump({"subject": subject, "content": content, "generated": generated}, f, indent=2)
+
+            queue["tail"] += 1
+            self.save_manifest()
+
+    def items(self, kind):
+        """Waiting items of a queue, oldest first, left in the spool"""
+        with locked(self.manifest_file):
+            self.manifest = self.load_manifest()
+            queue = self.manifest["queues"][kind]
+            items = []
+            for position in range(queue["head"], queue["tail"]):
+                try:
+                    with open(self.item_file(kind, position), 'r', encoding='utf-8') as f:
+                        items.append(json.load(f))
+                except Exception:
+                    continue
+            return items
+
+    def pop(self, kind):
+        """Take the oldest item of a queue, None when it is empty"""
+        with locked(self.manifest_file):
+            self.manifest = self.load_manifest()
+            queue = self.manifest["queues"][kind]
+
+            while queue["head"] < queue["tail"]:
+                item_file = self.item_file(kind, queue["head"])
+                queue["head"] += 1
+
+                try:
+                    with open(item_file, 'r', encoding='utf-8') as f:
+                        item = json.load(f)
+                except Exception:
+                    # Missing or corrupt item, skip it
+                    item = None
+
+                if item_file.exists():
+                    item_file.unlink()
+                self.save_manifest()
+
+                if item:
+                    return item
+
+            return None
@@ -0,0 +1,206 @@
+"""
+Content validator
+Single-pass check of generated markdown against the section layout the
+prompts ask for, and the repair helpers that request only the missing or
+broken sections and splice them back into the original response.
+"""
+
+FENCE = "```"
+
+# Required sections in prompt order, with the hint used when asking for a repair
+LAYOUTS = {
+    "learning_note": {
+        "Overview": "[Brief introduction]",
+        "Key Concepts": "[Main concepts with examples]",
+        "Practical Example": "[Code or real-world example]",
+        "Key Takeaways": "- [Takeaway 1]\n- [Takeaway 2]\n- [Takeaway 3]"
+    },
+    "coding_challenge": {
+        "Problem": "[Clear problem description]",
+        "Solution": "```python\n[Well-commented Python code]\n```",
+        "Analysis": "- Time Complexity: O(?)\n- Space Complexity: O(?)",
+        "Explanation": "[Brief explanation of approach]"
+    }
+}
+
+# Sections that are broken without a code block
+CODE_SECTIONS = {"Solution"}
+
+LABELS = {"learning_note": "learning note", "coding_challenge": "coding challenge"}
+
+
+def section_key(heading):
+    """Normalized section name for matching headings"""
+    return heading.strip().strip("*_:").strip().lower()
+
+
+def split_sections(text):
+    """(preamble, [(heading, chunk, has_code, unclosed_fence)]) for the ## sections of text
+
+    Headings inside code blocks are ignored, chunks keep their heading line.
+    """
+    preamble = []
+    sections = []
+    current = None
+    in_fence = False
+
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+            if current is not None:
+                current[2] = True
+        elif not in_fence and line.startswith("## "):
+            if current is not None:
+                sections.append(current)
+            current = [line[3:].strip(), [], False, False]
+
+        if current is None:
+            preamble.append(line)
+        else:
+            current[1].append(line)
+
+        if current is not None:
+            current[3] = in_fence
+
+    if current is not None:
+        sections.append(current)
+
+    return "".join(preamble), [(heading, "".join(lines), code, unclosed)
+                               for heading, lines, code, unclosed in sections]
+
+
+def scan_sections(lines):
+    """(title present, {section key: (has body, has code, unclosed fence)}) of lines
+
+    One pass keeping only flags, so a streamed response is checked without
+    holding its text. The first section of a name counts, as in split_sections.
+    """
+    title = False
+    found = {}
+    current = None
+    in_fence = False
+
+    for line in lines:
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+            if current is not None:
+                current[2] = True
+        elif not in_fence and line.startswith("## "):
+            if current is not None:
+                found.setdefault(current[0], tuple(current[1:]))
+            current = [section_key(line[3:]), False, False, False]
+            continue
+
+        if current is None:
+            title = title or line.startswith("# ")
+        else:
+            current[1] = current[1] or bool(line.strip())
+            current[3] = in_fence
+
+    if current is not None:
+        found.setdefault(current[0], tuple(current[1:]))
+    return title, found
+
+
+def validate(text, kind):
+    """Missing and broken required sections and whether the title is present
+
+    text is a string or an iterable of lines, such as an open file.
+    """
+    layout = LAYOUTS[kind]
+    lines = text.splitlines(keepends=True) if isinstance(text, str) else text
+    title, found = scan_sections(lines)
+
+    missing, broken = [], []
+    for name in layout:
+        entry = found.get(section_key(name))
+        if entry is None:
+            missing.append(name)
+            continue
+
+        body, has_code, unclosed = entry
+        if not body or unclosed or (name in CODE_SECTIONS and not has_code):
+            broken.append(name)
+
+    return {
+        "title": title,
+        "missing": missing,
+        "broken": broken
+    }
+
+
+def is_valid(report):
+    """Whether a validate() report needs no repair"""
+    return report["title"] and not report["missing"] and not report["broken"]
+
+
+def add_title(text, kind, subject):
+    """Prepend the title line the prompt asks for"""
+    title = f"# Challenge: {subject}" if kind == "coding_challenge" else f"# {subject}"
+    return f"{title}\n\n{text.lstrip()}"
+
+
+def close_fences(text):
+    """Terminate an unclosed code block so it cannot swallow later entries"""
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+    if not in_fence:
+        return text
+    return text.rstrip("\n") + f"\n{FENCE}\n"
+
+
+def repair_prompt(kind, subject, text, names):
+    """Prompt asking only for the named sections of an existing response"""
+    layout = LAYOUTS[kind]
+    names = [name for name in layout if name in names]
+    keep = {section_key(name) for name in layout} - {section_key(name) for name in names}
+    preamble, sections = split_sections(text)
+    context = preamble + "".join(chunk for heading, chunk, _, _ in sections if section_key(heading) in keep)
+    wanted = "\n\n".join(f"## {name}\n{layout[name]}" for name in names)
+
+    return f"""This {LABELS[kind]} about "{subject}" is missing or has broken sections: {', '.join(names)}.
+
+Existing content:
+{context.strip()}
+
+Write ONLY the sections listed above, consistent with the existing content.
+Use markdown and exactly these headings:
+
+{wanted}
+"""
+
+
+def splice_sections(text, repair, names, kind):
+    """Replace or insert the named sections of text with those found in repair"""
+    order = [section_key(name) for name in LAYOUTS[kind]]
+    wanted = {section_key(name) for name in names}
+
+    _, fixes = split_sections(repair)
+    replacements = {}
+    for heading, chunk, _, unclosed in fixes:
+        key = section_key(heading)
+        if key in wanted and key not in replacements and not unclosed:
+            replacements[key] = chunk.rstrip("\n") + "\n\n"
+
+    preamble, sections = split_sections(text)
+    result = [(section_key(heading), chunk) for heading, chunk, _, _ in sections]
+
+    # Broken sections are replaced where they stand
+    result = [(key, replacements.pop(key, chunk)) for key, chunk in result]
+
+    # Missing sections go after the last present section that precedes them in the layout
+    for key in order:
+        if key not in replacements:
+            continue
+        position = 0
+        for i, (existing, _) in enumerate(result):
+            if existing in order and order.index(existing) < order.index(key):
+                position = i + 1
+        result.insert(position, (key, replacements.pop(key)))
+
+    if preamble and not preamble.endswith("\n\n"):
+        preamble = preamble.rstrip("\n") + "\n\n"
+    body = "".join(chunk if chunk.endswith("\n\n") else chunk.rstrip("\n") + "\n\n" for _, chunk in result)
+    return preamble + body.rstrip("\n") + "\n"
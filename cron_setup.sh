@@ -116,4 +116,7 @@ echo "🔍 To monitor:"
 echo "- Check logs: tail -f \"$LOG_PATH\""
 echo "- View crontab: crontab -l"
 echo "- Remove cron job: crontab -e (then delete the line)"
+echo ""
+echo "🤖 For the AI bot schedule without per-run cold starts:"
+echo "- Run: python3 botctl.py daemon (slots in the daemon section of bot_config.json)"
 echo ""
\ No newline at end of file
@@ -5,25 +5,11 @@ Automatically updates log.txt with timestamp and commits to Git repository
 """
 
 import os
-import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
-def run_git_command(command):
-    """Run git command and return result"""
-    try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=Path(__file__).parent
-        )
-        return True, result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        return False, e.stderr.strip()
+from git_commit_engine import GitCommitEngine, GitError
 
 def main():
     """Main function to perform daily commit"""
@@ -58,32 +44,26 @@ def main():
         print(f"❌ Error updating log file: {e}")
         return False
 
-    # Step 2: Git add log.txt
-    print("Adding log.txt to git...")
-    success, output = run_git_command("git add log.txt")
-    if not success:
-        print(f"❌ Git add failed: {output}")
-        return False
-    print("✅ File added to git")
-
-    # Step 3: Git commit
+    # Step 2: Stage log.txt and commit in one batched operation
+    engine = GitCommitEngine(script_dir)
     commit_message = f"update {commit_timestamp}"
-    print(f"Committing with message: '{commit_message}'")
-    success, output = run_git_command(f'git commit -m "{commit_message}"')
-    if not success:
-        if "nothing to commit" in output.lower():
-            print("ℹ️ Nothing to commit")
-            return True
-        else:
-            print(f"❌ Git commit failed: {output}")
-            return False
-    print("✅ Changes committed")
+    print(f"Committing log.txt with message: '{commit_message}'")
+    try:
+        commit = engine.commit(["log.txt"], commit_message)
+    except GitError as e:
+        print(f"❌ Git commit failed: {e}")
+        return False
+    if commit is None:
+        print("ℹ️ Nothing to commit")
+        return True
+    print(f"✅ Changes committed ({commit[:7]})")
 
-    # Step 4: Git push to main branch
+    # Step 3: Git push to main branch
     print("Pushing to origin main...")
-    success, output = run_git_command("git push origin main")
-    if not success:
-        print(f"❌ Git push failed: {output}")
+    try:
+        engine.push("origin", "main")
+    except GitError as e:
+        print(f"❌ Git push failed: {e}")
         return False
     print("✅ Changes pushed to GitHub")
 
@@ -6,29 +6,122 @@ Author: blogecoin
 Features: Random timing, diverse content, multi-file commits, auto README
 """
 
-import json
 import os
 import random
-from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-class EnhancedBot:
+from bot_core import BaseBot
+from file_locks import append_with_header, locked
+from readme_template import ReadmeTemplate
+from state_store import atomic_write_text
+
+README_LAYOUT = """# 🤖 Enhanced Autonomous Daily Logs Bot
+
+**Version 3.0 - Natural & Diverse Activity** 🚀
+
+[![🤖 Bot Status](https://img.shields.io/badge/Bot-Active-success)](https://github.com/Gynzrt/daily-logs)
+[![Version](https://img.shields.io/badge/Version-3.0-blue)](https://github.com/Gynzrt/daily-logs)
+
+## 📊 Live Statistics
+
+<!-- readme-stats -->
+```
+🤖 Bot Name:        {bot_name}
+📈 Total Runs:      {total_runs}
+⏱️  Uptime:          {uptime_days} days
+📅 Last Update:     {last_run} UTC
+🔥 Status:          {status}
+```
+<!-- /readme-stats -->
+
+## ✨ Features v3.0
+
+### 🎯 Natural Behavior
+- ✅ Random commit times (8 AM - 11 PM UTC)
+- ✅ Multiple commits per day (2-5 commits)
+- ✅ Diverse commit messages
+- ✅ Multi-file updates
+
+### 📚 Diverse Content
+- 💡 **Daily Quotes** - Inspiration and wisdom
+- 📝 **Learning Notes** - Tech insights and tips
+- 💻 **Code Snippets** - Practical examples
+- 📊 **Auto Stats** - Live metrics
+
+### 🗂️ Project Structure
+
+```
+auto-daily-logs/
+├── 📁 notes/              # Learning notes by month
+├── 📁 snippets/           # Code snippets collection
+├── 📝 autonomous_logs.txt # Main activity log
+├── 💡 daily_quotes.txt    # Daily inspiration
+├── 📊 README.md           # This file (auto-updated)
+├── ⚙️  bot_config.json    # Bot configuration
+└── 📈 bot_status.json     # Runtime statistics
+```
+
+## 🚀 How It Works
+
+1. **GitHub Actions** triggers automatically
+2. **Random timing** - commits at natural hours
+3. **Multiple updates** - 2-5 commits per day
+4. **Diverse content** - quotes, notes, snippets
+5. **Auto stats** - README updates with metrics
+
+## 📈 Activity Breakdown
+
+- 📝 Main logs updated daily
+- 💡 Random quote added
+- 📚 Learning note documented
+- 💻 Code snippet saved
+- 📊 Stats auto-refreshed
+
+## ⚙️ Configuration
+
+Edit `bot_config.json` to customize:
+
+```json
+{{
+  "bot_name": "{bot_name}",
+  "version": "3.0",
+  "commits_per_day": {{"min": 2, "max": 5}},
+  "enabled": true
+}}
+```
+
+## 🎯 Benefits
+
+✅ **Natural patterns** - Looks like real activity
+✅ **Diverse content** - Multiple file types
+✅ **Auto maintenance** - Zero user intervention
+✅ **Professional** - Clean, documented code
+✅ **Insightful** - Real learning value
+
+---
+
+<!-- readme-stats -->
+**🤖 100% Autonomous | Last updated: {last_run} UTC**
+<!-- /readme-stats -->
+"""
+
+# Run counter, uptime and timestamps alone only refresh the README at the interval
+README_TEMPLATE = ReadmeTemplate(README_LAYOUT, volatile=("total_runs", "uptime_days", "last_run"))
+
+class EnhancedBot(BaseBot):
     """🤖 Enhanced bot with natural behavior"""
 
+    bot_key = "enhanced"
+    run_label = "Enhanced operation"
+
     def __init__(self):
-        self.config_file = Path("bot_config.json")
-        self.log_file = Path("autonomous_logs.txt")
-        self.status_file = Path("bot_status.json")
-        self.readme_file = Path("README.md")
+        super().__init__()
 
         # New feature files
         self.notes_dir = Path("notes")
         self.snippets_dir = Path("snippets")
         self.quotes_file = Path("daily_quotes.txt")
 
-        # Load configuration
-        self.config = self.load_config()
-
         # Content databases
         self.commit_messages = [
             "Update daily progress",
@@ -71,33 +164,10 @@ class EnhancedBot:
 
     def load_config(self):
         """📋 Load bot configuration"""
-        default_config = {
-            "bot_name": "blogecoin Bot",
+        return self.state.load_config({
             "version": "3.0",
-            "mode": "enhanced_autonomous",
-            "commits_per_day": {"min": 2, "max": 5},
-            "enabled": True
-        }
-
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                return {**default_config, **config}
-            except Exception:
-                pass
-
-        # Update config to v3.0
-        self.config_file.write_text(json.dumps(default_config, indent=2), encoding='utf-8')
-        return default_config
-
-    def get_utc_timestamp(self):
-        """⏰ Get current UTC timestamp"""
-        return datetime.now(timezone.utc)
-
-    def format_timestamp(self, dt):
-        """📅 Format timestamp for logs"""
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+            "mode": "enhanced_autonomous"
+        })
 
     def get_random_offset_time(self):
         """🎲 Get random time offset for natural commits"""
@@ -117,11 +187,7 @@ class EnhancedBot:
         quote = random.choice(self.quotes)
         timestamp = self.format_timestamp(self.get_utc_timestamp())
 
-        if not self.quotes_file.exists():
-            self.quotes_file.write_text(f"# Daily Quotes & Inspiration\n\n", encoding='utf-8')
-
-        with open(self.quotes_file, 'a', encoding='utf-8') as f:
-            f.write(f"\n## {timestamp}\n{quote}\n")
+        append_with_header(self.quotes_file, "# Daily Quotes & Inspiration\n\n", f"\n## {timestamp}\n{quote}\n")
 
         return "daily_quotes.txt"
 
@@ -133,13 +199,13 @@ class EnhancedBot:
 
         notes_file = self.notes_dir / f"learning_{date_str}.md"
 
-        if not notes_file.exists():
-            notes_file.write_text(f"# Learning Notes - {date_str}\n\n", encoding='utf-8')
-
-        with open(notes_file, 'a', encoding='utf-8') as f:
-            f.write(f"\n## {timestamp}\n")
-            f.write(f"**Topic:** {topic}\n\n")
-            f.write(f"Exploring {topic.lower()}. Key insights and practical applications.\n")
+        append_with_header(
+            notes_file,
+            f"# Learning Notes - {date_str}\n\n",
+            f"\n## {timestamp}\n"
+            f"**Topic:** {topic}\n\n"
+            f"Exploring {topic.lower()}. Key insights and practical applications.\n"
+        )
 
         return str(notes_file)
 
@@ -158,10 +224,11 @@ class EnhancedBot:
         ]
 
         snippet = random.choice(snippets)
-        snippet_file.write_text(
-            f"# Code Snippet - {date_str}\n# Auto-generated by Enhanced Bot\n\n{snippet}",
-            encoding='utf-8'
-        )
+        with locked(snippet_file):
+            atomic_write_text(
+                snippet_file,
+                f"# Code Snippet - {date_str}\n# Auto-generated by Enhanced Bot\n\n{snippet}"
+            )
 
         return str(snippet_file)
 
@@ -170,109 +237,21 @@ class EnhancedBot:
         utc_now = self.get_utc_timestamp()
         timestamp_str = self.format_timestamp(utc_now)
 
-        if not self.log_file.exists():
-            self.log_file.write_text(
-                "# Enhanced Autonomous Bot Logs\n"
-                "# Version 3.0 - Natural & Diverse Activity\n\n",
-                encoding='utf-8'
-            )
+        append_with_header(self.log_file, "# Enhanced Autonomous Bot Logs\n"
+                                          "# Version 3.0 - Natural & Diverse Activity\n\n")
 
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"[OK] Update at {timestamp_str} UTC\n")
+        self.activity_log.append(f"[OK] Update at {timestamp_str} UTC", utc_now)
 
         return "autonomous_logs.txt"
 
     def update_readme_stats(self):
         """📊 Update README with live stats"""
         stats = self.get_current_stats()
+        stats["status"] = stats["status"].upper()
 
-        readme_content = f"""# 🤖 Enhanced Autonomous Daily Logs Bot
-
-**Version 3.0 - Natural & Diverse Activity** 🚀
-
-[![🤖 Bot Status](https://img.shields.io/badge/Bot-Active-success)](https://github.com/Gynzrt/daily-logs)
-[![Version](https://img.shields.io/badge/Version-3.0-blue)](https://github.com/Gynzrt/daily-logs)
-
-## 📊 Live Statistics
-
-```
-🤖 Bot Name:        {stats['bot_name']}
-📈 Total Runs:      {stats['total_runs']}
-⏱️  Uptime:          {stats['uptime_days']} days
-📅 Last Update:     {stats['last_run']} UTC
-🔥 Status:          {stats['status'].upper()}
-```
-
-## ✨ Features v3.0
-
-### 🎯 Natural Behavior
-- ✅ Random commit times (8 AM - 11 PM UTC)
-- ✅ Multiple commits per day (2-5 commits)
-- ✅ Diverse commit messages
-- ✅ Multi-file updates
-
-### 📚 Diverse Content
-- 💡 **Daily Quotes** - Inspiration and wisdom
-- 📝 **Learning Notes** - Tech insights and tips
-- 💻 **Code Snippets** - Practical examples
-- 📊 **Auto Stats** - Live metrics
-
-### 🗂️ Project Structure
-
-```
-auto-daily-logs/
-├── 📁 notes/              # Learning notes by month
-├── 📁 snippets/           # Code snippets collection
-├── 📝 autonomous_logs.txt # Main activity log
-├── 💡 daily_quotes.txt    # Daily inspiration
-├── 📊 README.md           # This file (auto-updated)
-├── ⚙️  bot_config.json    # Bot configuration
-└── 📈 bot_status.json     # Runtime statistics
-```
-
-## 🚀 How It Works
-
-1. **GitHub Actions** triggers automatically
-2. **Random timing** - commits at natural hours
-3. **Multiple updates** - 2-5 commits per day
-4. **Diverse content** - quotes, notes, snippets
-5. **Auto stats** - README updates with metrics
-
-## 📈 Activity Breakdown
-
-- 📝 Main logs updated daily
-- 💡 Random quote added
-- 📚 Learning note documented
-- 💻 Code snippet saved
-- 📊 Stats auto-refreshed
-
-## ⚙️ Configuration
-
-Edit `bot_config.json` to customize:
-
-```json
-{{
-  "bot_name": "{stats['bot_name']}",
-  "version": "3.0",
-  "commits_per_day": {{"min": 2, "max": 5}},
-  "enabled": true
-}}
-```
-
-## 🎯 Benefits
-
-✅ **Natural patterns** - Looks like real activity
-✅ **Diverse content** - Multiple file types
-✅ **Auto maintenance** - Zero user intervention
-✅ **Professional** - Clean, documented code
-✅ **Insightful** - Real learning value
-
----
-
-**🤖 100% Autonomous | Last updated: {stats['last_run']} UTC**
-"""
-
-        self.readme_file.write_text(readme_content, encoding='utf-8')
+        if not self.write_readme(README_TEMPLATE, stats):
+            print("README stats unchanged")
+            return None
         print("README stats updated")
         return "README.md"
 
@@ -287,36 +266,10 @@ Edit `bot_config.json` to customize:
         }
         return stats
 
-    def get_total_runs(self):
-        """📈 Get total number of runs"""
-        if self.status_file.exists():
-            try:
-                with open(self.status_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return data.get('total_runs', 0)
-            except Exception:
-                pass
-        return 0
-
     def calculate_uptime(self):
         """⏱️ Calculate bot uptime in days"""
-        if not self.log_file.exists():
-            return 0
-
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-
-            if len(lines) < 1:
-                return 0
-
-            # Parse first timestamp
-            first_line = lines[0]
-            if "at " in first_line:
-                first_date_str = first_line.split("at ")[1].split(" UTC")[0]
-                first_date = datetime.strptime(first_date_str, "%Y-%m-%d %H:%M:%S")
-                current_date = self.get_utc_timestamp().replace(tzinfo=None)
-                return (current_date - first_date).days
+            return self.log_index.uptime_days(self.get_utc_timestamp())
         except Exception:
             pass
 
@@ -334,62 +287,45 @@ Edit `bot_config.json` to customize:
             "uptime_days": self.calculate_uptime()
         }
 
-        with open(self.status_file, 'w', encoding='utf-8') as f:
-            json.dump(status, f, indent=2)
-
+        self.state.replace_status(status)
+        self.state.increment("total_runs")
         print(f"Status updated: Run #{status['total_runs']}")
 
-    def run(self):
-        """🚀 Main enhanced bot execution"""
-        if not self.config.get("enabled", True):
-            print("Bot is disabled in configuration")
-            return False
+    def run_mode(self):
+        """📋 Mode recorded for this run"""
+        return "enhanced_autonomous"
 
+    def print_banner(self):
+        """🚀 Start banner"""
         print("=" * 50)
         print(f"Bot: {self.config['bot_name']} v{self.config['version']}")
         print(f"Mode: Enhanced Autonomous")
         print("=" * 50)
 
-        try:
-            # Ensure directory structure
-            self.ensure_directories()
-
-            modified_files = []
-
-            # Core updates (always)
-            modified_files.append(self.update_main_log())
-            modified_files.append(self.update_readme_stats())
-
-            # Random diverse content (select 1-2)
-            content_updates = [
-                self.update_daily_quote,
-                self.update_learning_notes,
-                self.update_code_snippet
-            ]
-
-            num_updates = random.randint(1, 2)
-            selected_updates = random.sample(content_updates, num_updates)
-
-            for update_func in selected_updates:
-                file_path = update_func()
-                modified_files.append(file_path)
-                print(f"Updated: {file_path}")
-
-            # Update status
-            self.update_status()
-            modified_files.append("bot_status.json")
-
-            print("\nEnhanced operation completed successfully")
-            print(f"Modified files: {len(modified_files)}")
-            print(f"Files: {', '.join(modified_files)}")
-
-            return True
+    def prepare(self):
+        """📁 Ensure directory structure"""
+        self.ensure_directories()
+
+    def output_dirs(self):
+        """📁 Directories the content stages write to"""
+        return [".", self.notes_dir, self.snippets_dir]
+
+    def build_pipeline(self, pipeline):
+        """🧩 Log, README stats and 1-2 random content updates"""
+        # Core updates (always), README stats read the fresh log
+        pipeline.add("log", self.update_main_log)
+        pipeline.add("readme", self.update_readme_stats, depends=["log"])
+
+        # Random diverse content (select 1-2), independent of each other
+        content_updates = {
+            "quote": self.update_daily_quote,
+            "notes": self.update_learning_notes,
+            "snippet": self.update_code_snippet
+        }
 
-        except Exception as e:
-            print(f"Enhanced operation failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+        num_updates = random.randint(1, 2)
+        for name in random.sample(list(content_updates), num_updates):
+            pipeline.add(name, content_updates[name])
 
 def main():
     """Main execution function"""
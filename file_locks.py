@@ -0,0 +1,128 @@
+"""
+File locks and atomic appends
+Advisory per-file locks (fcntl.flock, msvcrt on Windows) held only around
+read-modify-write sections, and appends done as one O_APPEND write so
+concurrent bot processes never interleave or tear lines.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Lock files live outside the tree so atomic renames never replace a locked inode
+LOCK_DIR = Path(".bot_cache") / "locks"
+
+# msvcrt has no blocking wait without a retry limit, poll instead
+POLL_INTERVAL = 0.05
+
+# Lock files held by the current thread, nested locked() calls pass through
+_held = threading.local()
+
+
+def lock_path(path):
+    """Lock file guarding path, one per absolute path"""
+    path = Path(path).resolve()
+    digest = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:12]
+    return LOCK_DIR / f"{path.name}.{digest}.lock"
+
+
+def acquire(fd, shared):
+    """Block until the lock on fd is held"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        # Byte-range lock on the first byte, always exclusive
+        while True:
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+
+
+def release(fd):
+    """Drop the lock on fd"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def locked(path, shared=False):
+    """Hold the advisory lock of path for the duration of the block
+
+    Locks are per open file description, so threads of one process
+    exclude each other too. A thread already holding the lock re-enters
+    without taking it again.
+    """
+    lock_file = lock_path(path)
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = set()
+    if lock_file in held:
+        yield
+        return
+
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        acquire(fd, shared)
+        held.add(lock_file)
+        try:
+            yield
+        finally:
+            held.discard(lock_file)
+            release(fd)
+    finally:
+        os.close(fd)
+
+
+def append_bytes(path, data):
+    """Append data with a single O_APPEND write, returning the end offset
+
+    The kernel positions every O_APPEND write at the current end of file,
+    so concurrent appenders never overwrite or interleave each other.
+    """
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        written = os.write(fd, data)
+        # Regular files only write short on a full disk, finish rather than tear
+        while written < len(data):
+            written += os.write(fd, data[written:])
+        return os.lseek(fd, 0, os.SEEK_END)
+    finally:
+        os.close(fd)
+
+
+def append_text(path, text):
+    """Append UTF-8 text with a single O_APPEND write"""
+    return append_bytes(path, text.encode('utf-8'))
+
+
+def append_with_header(path, header, text=""):
+    """Append text, starting the file with header when it does not exist yet
+
+    The existence check and the write share the file's lock, so two
+    first runs never both write the header.
+    """
+    with locked(path):
+        if not os.path.exists(path):
+            text = header + text
+        return append_text(path, text)
@@ -0,0 +1,217 @@
+"""
+Near-duplicate detection for generated content
+64-bit SimHash fingerprints of every entry, stored in an append-only
+JSON Lines sidecar next to the notes, with banded lookup and
+per-subject coverage counts.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+from pathlib import Path
+
+from file_locks import append_text, locked
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+TAIL_PATTERN = re.compile(r"[a-z0-9_]+\Z")
+
+
+def iter_word_lists(chunks):
+    """Lowercase words of each chunk of text, words split across chunks rejoined"""
+    carry = ""
+    for chunk in chunks:
+        chunk = carry + chunk.lower()
+        # A word touching the end may continue in the next chunk
+        tail = TAIL_PATTERN.search(chunk)
+        carry = tail.group(0) if tail else ""
+        yield WORD_PATTERN.findall(chunk, 0, len(chunk) - len(carry))
+    if carry:
+        yield [carry]
+
+
+def count_bits(counts, shingles):
+    """Add the set bits of every shingle's 64-bit hash to per-position counts"""
+    rows = [format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'),
+                   "064b") for shingle in shingles]
+    for position, column in enumerate(zip(*rows)):
+        counts[position] += column.count("1")
+    return len(rows)
+
+
+def simhash(text):
+    """64-bit SimHash over word shingles of text, a string or an iterable of chunks
+
+    Chunks are hashed one at a time, so a streamed response is never held whole.
+    """
+    chunks = [text] if isinstance(text, str) else text
+    counts = [0] * FINGERPRINT_BITS
+    total = 0
+    words = []
+
+    for chunk_words in iter_word_lists(chunks):
+        # The last words of the previous chunk start this chunk's shingles
+        words = words[-(SHINGLE_SIZE - 1):] + chunk_words
+        total += count_bits(counts, [" ".join(words[i:i + SHINGLE_SIZE])
+                                     for i in range(len(words) - SHINGLE_SIZE + 1)])
+
+    if total == 0:
+        # Fewer words than a shingle, the words themselves are the only one
+        total = count_bits(counts, [" ".join(words)])
+
+    # Most significant bit first
+    majority = total / 2
+    bits = "".join("1" if count > majority else "0" for count in counts)
+    return int(bits, 2)
+
+
+def hamming_distance(a, b):
+    """Number of differing bits"""
+    return bin(a ^ b).count("1")
+
+
+def match_subject(title, text, subjects):
+    """Subject an existing entry was written for, its title when none fits
+
+    A subject named in the title wins, otherwise the one with the largest
+    share of its words in the text, at least half of them.
+    """
+    lowered = title.lower()
+    for subject in subjects:
+        if subject.lower() in lowered:
+            return subject
+
+    words = set(WORD_PATTERN.findall(text.lower()))
+    best, best_share = title, 0.0
+    for subject in subjects:
+        subject_words = WORD_PATTERN.findall(subject.lower())
+        if not subject_words:
+            continue
+        share = sum(word in words for word in subject_words) / len(subject_words)
+        if share >= 0.5 and share > best_share:
+            best, best_share = subject, share
+    return best
+
+
+class FingerprintIndex:
+    """SimHash index of one content kind with subject coverage"""
+
+    def __init__(self, index_file, max_distance=3):
+        self.index_file = Path(index_file)
+        self.max_distance = max_distance
+
+        # Pigeonhole: within max_distance bits, at least one band matches exactly
+        self.band_count = max_distance + 1
+        self.band_width = FINGERPRINT_BITS // self.band_count
+
+        self.entries = []
+        self.coverage = {}
+        self.buckets = {}
+        self.loaded = self.load()
+
+    def load(self):
+        """Load the sidecar, False when it does not exist yet"""
+        if not self.index_file.exists():
+            return False
+
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self.insert(json.loads(line))
+                except (ValueError, KeyError):
+                    # Torn or hand-edited line, skip it
+                    continue
+        return True
+
+    def reload(self):
+        """Replace the in-memory entries with the sidecar on disk"""
+        self.entries, self.coverage, self.buckets = [], {}, {}
+        self.loaded = self.load()
+
+    def save(self):
+        """Rewrite the whole sidecar via temp file and rename"""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        with locked(self.index_file):
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in self.entries)
+            os.replace(tmp_file, self.index_file)
+
+    def append(self, entry):
+        """Append one entry line to the sidecar"""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        # A concurrent rewrite would drop the line, wait for it
+        with locked(self.index_file):
+            append_text(self.index_file, json.dumps(entry) + "\n")
+
+    def bands(self, fingerprint):
+        """Bucket keys of a fingerprint"""
+        mask = (1 << self.band_width) - 1
+        return [(band, fingerprint >> (band * self.band_width) & mask) for band in range(self.band_count)]
+
+    def insert(self, entry):
+        """Add an entry to the in-memory structures"""
+        position = len(self.entries)
+        self.entries.append(entry)
+        self.coverage[entry["subject"]] = self.coverage.get(entry["subject"], 0) + 1
+
+        fingerprint = int(entry["fingerprint"], 16)
+        for key in self.bands(fingerprint):
+            self.buckets.setdefault(key, []).append(position)
+
+    def add(self, fingerprint, subject, path, generated, save=True):
+        """Record the simhash() fingerprint of a written entry"""
+        entry = {
+            "fingerprint": f"{fingerprint:016x}",
+            "subject": subject,
+            "path": str(path),
+            "generated": generated
+        }
+        self.insert(entry)
+        if save:
+            self.append(entry)
+
+    def remove_path(self, path):
+        """Forget entries of a file that is being rewritten"""
+        path = str(path)
+        if not any(entry["path"] == path for entry in self.entries):
+            return
+
+        with locked(self.index_file):
+            # Keep entries other processes appended since this one loaded
+            self.reload()
+            entries = [entry for entry in self.entries if entry["path"] != path]
+            self.entries, self.coverage, self.buckets = [], {}, {}
+            for entry in entries:
+                self.insert(entry)
+            self.save()
+
+    def find_near_duplicate(self, fingerprint):
+        """Closest existing entry within max_distance of a fingerprint, or None"""
+        best, best_distance = None, self.max_distance + 1
+
+        seen = set()
+        for key in self.bands(fingerprint):
+            for position in self.buckets.get(key, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+
+                distance = hamming_distance(fingerprint, int(self.entries[position]["fingerprint"], 16))
+                if distance < best_distance:
+                    best, best_distance = self.entries[position], distance
+
+        return best
+
+    def least_covered(self, subjects, pending=None):
+        """Random pick among the subjects with the fewest entries
+
+        pending counts entries not in the index yet, such as spooled items.
+        """
+        pending = pending or {}
+        counts = {subject: self.coverage.get(subject, 0) + pending.get(subject, 0) for subject in subjects}
+        fewest = min(counts.values())
+        return random.choice([subject for subject in subjects if counts[subject] == fewest])
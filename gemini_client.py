@@ -0,0 +1,335 @@
+"""
+Resilient Gemini client
+Wraps a GenerativeModel with a token-bucket rate limiter, jittered
+exponential retry of transient errors, a circuit breaker whose state
+survives between runs in bot_status.json and an optional token budget.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+from metrics import response_usage
+from stream_segment import SegmentAbandoned
+from token_ledger import estimate_tokens
+
+# Error class names (google.api_core and builtins) worth another attempt
+TRANSIENT_ERRORS = {
+    "DeadlineExceeded",
+    "InternalServerError",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "TooManyRequests",
+    "GatewayTimeout",
+    "TimeoutError",
+    "ConnectionError",
+}
+
+DEFAULT_RESILIENCE = {
+    "requests_per_minute": 10,
+    "max_retries": 3,
+    "retry_base_delay": 1.0,
+    "retry_max_delay": 20.0,
+    "failure_threshold": 3,
+    "cooldown_minutes": 60
+}
+
+
+class CircuitOpenError(Exception):
+    """Gemini is skipped while the breaker is open"""
+
+
+class RateLimitError(Exception):
+    """No request token became available within the deadline"""
+
+
+def is_transient(error):
+    """Whether an error is worth retrying"""
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a steady rate"""
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait):
+        """Claim a token, returning the seconds to wait or None past max_wait"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """Closed, open and half-open breaker over consecutive failures"""
+
+    def __init__(self, state=None, failure_threshold=3, cooldown_seconds=3600):
+        state = state or {}
+        self.state = state.get("state", "closed")
+        self.failures = state.get("failures", 0)
+        self.opened_at = state.get("opened_at")
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go out now, admitting one probe when half-open"""
+        with self.lock:
+            if self.state == "closed":
+                return True
+
+            if self.state == "open":
+                opened = datetime.strptime(self.opened_at, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+                if (datetime.now(timezone.utc) - opened).total_seconds() < self.cooldown_seconds:
+                    return False
+                self.state = "half_open"
+
+            # Half-open: a single probe decides
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def release(self):
+        """Give back an unused half-open probe slot"""
+        with self.lock:
+            self.probing = False
+
+    def record_success(self):
+        """Close the breaker"""
+        with self.lock:
+            self.state, self.failures, self.opened_at, self.probing = "closed", 0, None, False
+
+    def record_failure(self):
+        """Count a failure, opening the breaker at the threshold or on a failed probe"""
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            self.probing = False
+
+    def to_dict(self):
+        """State persisted in the status file"""
+        return {"state": self.state, "failures": self.failures, "opened_at": self.opened_at}
+
+
+class GeminiClient:
+    """Rate limited, retrying, circuit-broken access to a Gemini model"""
+
+    def __init__(self, model, settings=None, breaker_state=None, metrics=None, ledger=None):
+        settings = {**DEFAULT_RESILIENCE, **(settings or {})}
+        self.model = model
+        self.metrics = metrics
+        self.ledger = ledger
+        self.bucket = TokenBucket(settings["requests_per_minute"])
+        self.breaker = CircuitBreaker(
+            breaker_state,
+            failure_threshold=settings["failure_threshold"],
+            cooldown_seconds=settings["cooldown_minutes"] * 60
+        )
+        self.max_retries = settings["max_retries"]
+        self.base_delay = settings["retry_base_delay"]
+        self.max_delay = settings["retry_max_delay"]
+
+    def record_call(self, started, prompt, response=None, response_bytes=0, error=None, streamed=False):
+        """Report one generate_content call to the run metrics"""
+        if self.metrics is not None:
+            tokens = response_usage(response) if response is not None else None
+            self.metrics.record_call(started, prompt, response_bytes, tokens, error, streamed)
+
+    def output_limit(self):
+        """Budget-derived max_output_tokens, None without a ledger"""
+        if self.ledger is None:
+            return None
+        return self.ledger.output_limit()
+
+    def request_kwargs(self, deadline, max_tokens):
+        """generate_content options for one attempt"""
+        kwargs = {"request_options": {"timeout": max(1.0, deadline - time.monotonic())}}
+        if max_tokens is not None:
+            kwargs["generation_config"] = {"max_output_tokens": max_tokens}
+        return kwargs
+
+    def charge(self, prompt, response, output_size):
+        """Book a successful call's tokens, estimated when not reported"""
+        if self.ledger is None:
+            return
+        tokens = response_usage(response)
+        self.ledger.charge(tokens.get("prompt", estimate_tokens(len(prompt))),
+                           tokens.get("response", estimate_tokens(output_size)))
+
+    def backoff(self, attempt):
+        """Full-jitter exponential delay before a retry"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def admit(self, deadline):
+        """Breaker and rate-limit checks, returning the wait before sending"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Gemini circuit open, using fallback")
+
+        wait = self.bucket.reserve(deadline - time.monotonic())
+        if wait is None:
+            # Not a Gemini failure, keep the probe for a later call
+            self.breaker.release()
+            raise RateLimitError("Gemini request quota exhausted")
+        return wait
+
+    def next_delay(self, error, attempt, deadline):
+        """Retry delay after a failed attempt, None when giving up
+
+        A retry is another request, it claims its own rate-limit token.
+        """
+        if attempt >= self.max_retries or not is_transient(error):
+            return None
+        delay = self.backoff(attempt)
+        remaining = deadline - time.monotonic()
+        if delay >= remaining:
+            return None
+        wait = self.bucket.reserve(remaining)
+        if wait is None:
+            return None
+        return max(delay, wait)
+
+    def generate(self, prompt, timeout):
+        """Response text for prompt, all attempts within timeout seconds"""
+        deadline = time.monotonic() + timeout
+        max_tokens = self.output_limit()
+        time.sleep(self.admit(deadline))
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.model.generate_content(prompt, **self.request_kwargs(deadline, max_tokens))
+                text = response.text
+            except Exception as e:
+                self.record_call(started, prompt, error=e)
+                delay = self.next_delay(e, attempt, deadline)
+                if delay is None:
+                    self.breaker.record_failure()
+                    raise
+                print(f"Gemini transient error, retry {attempt + 1} in {delay:.1f}s: {e}")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.record_call(started, prompt, response, len(text.encode('utf-8')))
+            self.charge(prompt, response, len(text))
+            self.breaker.record_success()
+            return text
+
+    async def generate_async(self, prompt, timeout, executor=None):
+        """Async variant, using the SDK's async API when it has one"""
+        deadline = time.monotonic() + timeout
+        max_tokens = self.output_limit()
+        await asyncio.sleep(self.admit(deadline))
+
+        attempt = 0
+        while True:
+            kwargs = self.request_kwargs(deadline, max_tokens)
+            started = time.perf_counter()
+            try:
+                if hasattr(self.model, "generate_content_async"):
+                    response = await self.model.generate_content_async(prompt, **kwargs)
+                else:
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(
+                        executor,
+                        lambda: self.model.generate_content(prompt, **kwargs)
+                    )
+                text = response.text
+            except asyncio.CancelledError as e:
+                # Abandoned at the caller's deadline
+                self.record_call(started, prompt, error=e)
+                self.breaker.record_failure()
+                raise
+            except Exception as e:
+                self.record_call(started, prompt, error=e)
+                delay = self.next_delay(e, attempt, deadline)
+                if delay is None:
+                    self.breaker.record_failure()
+                    raise
+                print(f"Gemini transient error, retry {attempt + 1} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self.record_call(started, prompt, response, len(text.encode('utf-8')))
+            self.charge(prompt, response, len(text))
+            self.breaker.record_success()
+            return text
+
+    def generate_stream(self, prompt, timeout, segment):
+        """Stream the response for prompt into segment chunk by chunk"""
+        deadline = time.monotonic() + timeout
+        max_tokens = self.output_limit()
+        time.sleep(self.admit(deadline))
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            received = 0
+            chunk = None
+            try:
+                response = self.model.generate_content(
+                    prompt,
+                    stream=True,
+                    **self.request_kwargs(deadline, max_tokens)
+                )
+                for chunk in response:
+                    segment.write(chunk.text)
+                    received += len(chunk.text.encode('utf-8'))
+                if segment.abandoned:
+                    raise SegmentAbandoned(str(segment.path))
+            except SegmentAbandoned as e:
+                # Failure already counted by the caller that gave up
+                self.record_call(started, prompt, response_bytes=received, error=e, streamed=True)
+                segment.discard()
+                raise
+            except Exception as e:
+                self.record_call(started, prompt, response_bytes=received, error=e, streamed=True)
+                delay = self.next_delay(e, attempt, deadline)
+                if delay is None:
+                    self.breaker.record_failure()
+                    raise
+                print(f"Gemini transient error, retry {attempt + 1} in {delay:.1f}s: {e}")
+                segment.reset()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            # Usage metadata arrives with the final chunk
+            usage_source = response if response_usage(response) else chunk
+            self.record_call(started, prompt, usage_source, received, streamed=True)
+            self.charge(prompt, usage_source, segment.size)
+            # A caller that gave up already counted a failure, do not close the breaker over it
+            if not segment.abandoned:
+                self.breaker.record_success()
+            return segment.size
+
+    async def generate_stream_async(self, prompt, timeout, segment, executor=None):
+        """Run generate_stream on the executor, abandoning the segment on cancellation"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, self.generate_stream, prompt, timeout, segment)
+        except asyncio.CancelledError:
+            # Abandon first, a worker finishing late then skips record_success
+            segment.abandon()
+            self.breaker.record_failure()
+            raise
@@ -0,0 +1,133 @@
+"""
+Batched git commit engine
+Commits an explicit manifest of paths with git plumbing: one hash-object
+for every blob, one update-index, then write-tree, commit-tree and a
+compare-and-swap update-ref. No shell, no working tree scan.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+ZERO_SHA = "0" * 40
+
+
+class GitError(Exception):
+    """A git plumbing command failed"""
+
+
+class GitCommitEngine:
+    """Stage and commit exactly the given paths"""
+
+    def __init__(self, repo_dir=".", git_dir=None, index_file=None, git="git"):
+        self.repo_dir = Path(repo_dir).resolve()
+        self.git_dir = git_dir
+        self.index_file = index_file
+        self.executable = git
+
+    def git(self, *args, input=None):
+        """Run one git command, returning stdout"""
+        env = dict(os.environ)
+        if self.git_dir:
+            env["GIT_DIR"] = str(Path(self.git_dir).resolve())
+            env["GIT_WORK_TREE"] = str(self.repo_dir)
+        if self.index_file:
+            env["GIT_INDEX_FILE"] = str(Path(self.index_file).resolve())
+
+        result = subprocess.run(
+            [self.executable, *args],
+            cwd=self.repo_dir,
+            env=env,
+            input=input,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise GitError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def head(self):
+        """Commit HEAD points at, None on an unborn branch"""
+        try:
+            return self.git("rev-parse", "--verify", "-q", "HEAD^{commit}").strip()
+        except GitError:
+            return None
+
+    def relative(self, path):
+        """Repository-relative posix path"""
+        path = Path(path)
+        if path.is_absolute():
+            path = path.resolve().relative_to(self.repo_dir)
+        return path.as_posix()
+
+    def expand(self, paths):
+        """Files behind the manifest, directories listed by git, tracked deletions kept
+
+        Inside directories, ignored files and the *.tmp files of atomic
+        writes in flight are left out; explicit file paths are always kept.
+        """
+        files = []
+        directories = []
+        for path in dict.fromkeys(self.relative(path) for path in paths if path):
+            if (self.repo_dir / path).is_dir():
+                directories.append(path)
+            else:
+                files.append(path)
+
+        if directories:
+            listed = self.git("ls-files", "-z", "--cached", "--others", "--exclude-standard",
+                              "--exclude=*.tmp", "--", *directories).split("\0")
+            files.extend(path for path in listed if path)
+        return list(dict.fromkeys(files))
+
+    def stage(self, paths):
+        """Write blobs and index entries for every path in two git calls"""
+        files = self.expand(paths)
+        present = [path for path in files if (self.repo_dir / path).is_file()]
+        missing = [path for path in files if not (self.repo_dir / path).exists()]
+
+        shas = []
+        if present:
+            shas = self.git("hash-object", "-w", "--stdin-paths", input="\n".join(present) + "\n").split()
+
+        entries = []
+        for path, sha in zip(present, shas):
+            mode = "100755" if os.access(self.repo_dir / path, os.X_OK) else "100644"
+            entries.append(f"{mode} {sha}\t{path}")
+        # Mode 0 removes the entry
+        entries.extend(f"0 {ZERO_SHA}\t{path}" for path in missing)
+
+        if entries:
+            self.git("update-index", "--index-info", input="\n".join(entries) + "\n")
+        return present + missing
+
+    def commit(self, paths, message):
+        """Commit the manifest on top of HEAD, None when nothing changed"""
+        parent = self.head()
+
+        # A private index starts from the parent tree, read without a checkout
+        if self.index_file and not Path(self.index_file).exists():
+            if parent:
+                self.git("read-tree", parent)
+            else:
+                self.git("read-tree", "--empty")
+
+        self.stage(paths)
+        tree = self.git("write-tree").strip()
+
+        if parent and tree == self.git("rev-parse", f"{parent}^{{tree}}").strip():
+            return None
+
+        args = ["commit-tree", tree, "-F", "-"]
+        if parent:
+            args[2:2] = ["-p", parent]
+        commit = self.git(*args, input=message + "\n").strip()
+
+        # Fails instead of clobbering a HEAD that moved meanwhile
+        self.git("update-ref", "-m", f"commit: {message}", "HEAD", commit, parent or ZERO_SHA)
+        return commit
+
+    def push(self, remote="origin", branch=None):
+        """Push HEAD to the remote branch"""
+        refspec = f"HEAD:refs/heads/{branch}" if branch else "HEAD"
+        self.git("push", remote, refspec)
@@ -0,0 +1,232 @@
+"""
+Sidecar index for autonomous_logs.txt
+Keeps first/last timestamps, entry count and recent byte offsets
+so uptime and run stats never have to re-read the log body.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from file_locks import append_bytes, locked
+from run_events import split_entry
+from state_store import atomic_write_json
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Offsets kept for "last N entries" lookups
+RECENT_OFFSETS = 64
+
+
+def parse_log_timestamp(line):
+    """Parse the timestamp of a log entry line, None if it has none"""
+    parts = split_entry(line)
+    if not parts:
+        return None
+
+    try:
+        return datetime.strptime(parts[1], TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+class LogIndex:
+    """Persistent index over an append-only log file"""
+
+    def __init__(self, log_file, index_file=None):
+        self.log_file = Path(log_file)
+        self.index_file = Path(index_file) if index_file else self.log_file.with_suffix(".idx.json")
+        self.data = self.load()
+
+    def empty_index(self):
+        """Index describing an empty log"""
+        return {
+            "version": 1,
+            "log_size": 0,
+            "entry_count": 0,
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "hot_first_timestamp": None,
+            "recent_offsets": [],
+            "archived_entries": 0,
+            "archived_first_timestamp": None,
+            "archived_last_timestamp": None
+        }
+
+    def reset(self):
+        """Forget the live log, keeping totals of rotated segments"""
+        data = self.empty_index()
+        for key in ("archived_entries", "archived_first_timestamp", "archived_last_timestamp"):
+            data[key] = self.data.get(key, data[key])
+
+        data["entry_count"] = data["archived_entries"]
+        data["first_timestamp"] = data["archived_first_timestamp"]
+        data["last_timestamp"] = data["archived_last_timestamp"]
+        self.data = data
+
+    def set_archive(self, entries, first_timestamp, last_timestamp):
+        """Record rotated segment totals and re-index the live log"""
+        self.data["archived_entries"] = entries
+        self.data["archived_first_timestamp"] = first_timestamp
+        self.data["archived_last_timestamp"] = last_timestamp
+        self.reset()
+        if self.log_file.exists():
+            self.scan_from(0)
+        self.save()
+
+    def load(self):
+        """Load the sidecar, falling back to an empty index"""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return {**self.empty_index(), **json.load(f)}
+            except Exception:
+                pass
+        return self.empty_index()
+
+    def reload(self):
+        """Re-read the sidecar, dropping whatever this process holds in memory"""
+        self.data = self.load()
+
+    def save(self):
+        """Write the sidecar via temp file and rename"""
+        atomic_write_json(self.index_file, self.data)
+
+    def log_size(self):
+        """Current size of the log file, None if it does not exist"""
+        try:
+            return self.log_file.stat().st_size
+        except OSError:
+            return None
+
+    def sync(self):
+        """Bring the index up to date with the log on disk
+
+        Only bytes appended since the last sync are scanned. When the size
+        differs the sidecar is re-read under the log's lock first, another
+        process may have indexed or rotated since this one loaded it. A log
+        that is still smaller than indexed (rewritten by hand) is re-indexed
+        from scratch on top of the rotated segment totals.
+        """
+        size = self.log_size()
+        if size == self.data["log_size"] or (size is None and not self.data["log_size"]):
+            return False
+
+        with locked(self.log_file):
+            self.data = self.load()
+            size = self.log_size()
+
+            if size is None:
+                if self.data["log_size"]:
+                    self.reset()
+                    self.save()
+                return False
+
+            if size == self.data["log_size"]:
+                return True
+
+            if size < self.data["log_size"]:
+                self.reset()
+
+            self.scan_from(self.data["log_size"])
+            self.save()
+            return True
+
+    def scan_from(self, start):
+        """Index every entry line from byte offset start to end of file"""
+        last_entry = None
+        with open(self.log_file, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                if self.record(raw.decode('utf-8', errors='replace'), offset, parse_last=False):
+                    last_entry = raw
+                offset += len(raw)
+        self.data["log_size"] = offset
+
+        # Only the newest timestamp matters, parse it once per scan
+        if last_entry:
+            self.record_last_timestamp(last_entry.decode('utf-8', errors='replace'))
+
+    def record(self, line, offset, parse_last=True):
+        """Account one raw log line found at offset, True if it is an entry"""
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return False
+
+        self.data["entry_count"] += 1
+
+        recent = self.data["recent_offsets"]
+        recent.append(offset)
+        if len(recent) > RECENT_OFFSETS:
+            del recent[:-RECENT_OFFSETS]
+
+        if not self.data["hot_first_timestamp"]:
+            timestamp = parse_log_timestamp(line)
+            if timestamp:
+                self.data["hot_first_timestamp"] = timestamp.strftime(TIMESTAMP_FORMAT)
+                if not self.data["first_timestamp"]:
+                    self.data["first_timestamp"] = self.data["hot_first_timestamp"]
+
+        if parse_last:
+            self.record_last_timestamp(line)
+        return True
+
+    def record_last_timestamp(self, line):
+        """Remember the timestamp of the newest entry"""
+        timestamp = parse_log_timestamp(line)
+        if timestamp:
+            self.data["last_timestamp"] = timestamp.strftime(TIMESTAMP_FORMAT)
+
+    def append(self, entry):
+        """Append one entry line to the log and update the index in O(1)"""
+        with locked(self.log_file):
+            self.sync()
+
+            raw = f"{entry}\n".encode('utf-8')
+            end = append_bytes(self.log_file, raw)
+
+            self.data["log_size"] = end
+            self.record(entry, end - len(raw))
+            self.save()
+
+    @property
+    def entry_count(self):
+        """Number of entries, rotated segments included"""
+        self.sync()
+        return self.data["entry_count"]
+
+    @property
+    def first_timestamp(self):
+        """Timestamp of the first entry as naive UTC datetime"""
+        self.sync()
+        value = self.data["first_timestamp"]
+        return datetime.strptime(value, TIMESTAMP_FORMAT) if value else None
+
+    @property
+    def last_timestamp(self):
+        """Timestamp of the latest entry as naive UTC datetime"""
+        self.sync()
+        value = self.data["last_timestamp"]
+        return datetime.strptime(value, TIMESTAMP_FORMAT) if value else None
+
+    def uptime_days(self, now):
+        """Whole days between the first entry and now"""
+        first = self.first_timestamp
+        if not first:
+            return 0
+        return (now.replace(tzinfo=None) - first).days
+
+    def tail(self, count=10):
+        """Return the last count entries of the live log (at most RECENT_OFFSETS)"""
+        self.sync()
+        offsets = self.data["recent_offsets"][-count:] if count > 0 else []
+        if not offsets:
+            return []
+
+        entries = []
+        with open(self.log_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                entries.append(f.readline().decode('utf-8', errors='replace').strip())
+        return entries
@@ -0,0 +1,223 @@
+"""
+Segmented activity log
+Rotates closed months (or an oversized live file) of autonomous_logs.txt
+into gzip segments under logs/, with a manifest and a reader that
+iterates, tails and seeks across segments and the live file.
+"""
+
+import gzip
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+from file_locks import locked
+from log_index import LogIndex, parse_log_timestamp
+from state_store import atomic_write_json
+
+
+class SegmentedLog:
+    """Live log file plus compressed monthly segments"""
+
+    def __init__(self, log_file, segments_dir="logs", index=None, max_bytes=1024 * 1024, enabled=True):
+        self.log_file = Path(log_file)
+        self.segments_dir = Path(segments_dir)
+        self.manifest_file = self.segments_dir / "manifest.json"
+        self.index = index or LogIndex(self.log_file)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.manifest = self.load_manifest()
+
+    @classmethod
+    def from_config(cls, log_file, index, config):
+        """Build from the log_rotation section of the bot config"""
+        rotation = config.get("log_rotation", {})
+        return cls(
+            log_file,
+            segments_dir=rotation.get("segments_dir", "logs"),
+            index=index,
+            max_bytes=rotation.get("max_bytes", 1024 * 1024),
+            enabled=rotation.get("enabled", True)
+        )
+
+    def load_manifest(self):
+        """Load the segment list, empty when nothing was rotated yet"""
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {"version": 1, "segments": []}
+
+    def segment_path(self, segment):
+        """Path of a manifest segment"""
+        return self.segments_dir / segment["name"]
+
+    def needs_rotation(self, now):
+        """O(1) check against the index: closed month or oversized live file"""
+        if not self.enabled:
+            return False
+
+        self.index.sync()
+        hot_first = self.index.data["hot_first_timestamp"]
+        if hot_first and hot_first[:7] < now.strftime("%Y-%m"):
+            return True
+        return bool(self.max_bytes) and self.index.data["log_size"] > self.max_bytes
+
+    def append(self, entry, now):
+        """Rotate when due, then append an entry to the live log
+
+        Both happen under the log's lock, so concurrent runs neither rotate
+        twice nor index each other's half-written entries. Manifest and index
+        are re-read first, another process may have rotated in the meantime.
+        """
+        with locked(self.log_file):
+            self.manifest = self.load_manifest()
+            self.index.reload()
+            if self.needs_rotation(now):
+                self.rotate(now)
+            self.index.append(entry)
+
+    def rotate(self, now):
+        """Move finished entries of the live log into monthly segments
+
+        Entries of closed months always move. When the live file is over
+        max_bytes the current month moves too; gzip members appended to
+        an existing segment read back as one stream.
+        """
+        if not self.log_file.exists():
+            return []
+
+        current_month = now.strftime("%Y-%m")
+        oversized = bool(self.max_bytes) and self.log_file.stat().st_size > self.max_bytes
+
+        header, keep, by_month = [], [], {}
+        month = None
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                stripped = line.strip()
+                if not stripped or stripped.startswith('#'):
+                    if month is None:
+                        header.append(line)
+                    continue
+
+                timestamp = parse_log_timestamp(stripped)
+                if timestamp:
+                    month = timestamp.strftime("%Y-%m")
+                month = month or current_month
+
+                if month < current_month or oversized:
+                    by_month.setdefault(month, []).append(line if line.endswith("\n") else line + "\n")
+                else:
+                    keep.append(line)
+
+        if not by_month:
+            return []
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        segments = {segment["month"]: segment for segment in self.manifest["segments"]}
+
+        for month, lines in sorted(by_month.items()):
+            segment = segments.setdefault(month, {
+                "name": f"{month}.txt.gz",
+                "month": month,
+                "entries": 0,
+                "bytes": 0,
+                "first_timestamp": None,
+                "last_timestamp": None
+            })
+
+            data = "".join(lines).encode('utf-8')
+            with open(self.segment_path(segment), 'ab') as f:
+                f.write(gzip.compress(data, mtime=0))
+
+            stamps = [parse_log_timestamp(line) for line in (lines[0], lines[-1])]
+            segment["entries"] += len(lines)
+            segment["bytes"] += len(data)
+            if stamps[0] and not segment["first_timestamp"]:
+                segment["first_timestamp"] = stamps[0].strftime("%Y-%m-%d %H:%M:%S")
+            if stamps[1]:
+                segment["last_timestamp"] = stamps[1].strftime("%Y-%m-%d %H:%M:%S")
+
+        self.manifest["segments"] = [segments[month] for month in sorted(segments)]
+        atomic_write_json(self.manifest_file, self.manifest)
+
+        # Rewrite the live file with its header and the entries still open
+        tmp_file = self.log_file.with_name(self.log_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(header)
+            if header and header[-1].strip():
+                f.write("\n")
+            f.writelines(keep)
+        os.replace(tmp_file, self.log_file)
+
+        self.index.set_archive(
+            sum(segment["entries"] for segment in self.manifest["segments"]),
+            self.manifest["segments"][0]["first_timestamp"],
+            self.manifest["segments"][-1]["last_timestamp"]
+        )
+
+        rotated = sorted(by_month)
+        print(f"Log rotated: {', '.join(rotated)} -> {self.segments_dir}/")
+        return rotated
+
+    def iter_segment(self, segment):
+        """Entry lines of one compressed segment"""
+        with gzip.open(self.segment_path(segment), 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield line.rstrip("\n")
+
+    def iter_live(self):
+        """Entry lines of the live log file"""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped and not stripped.startswith('#'):
+                    yield line.rstrip("\n")
+
+    def iter_entries(self, segments=None):
+        """Every entry line, oldest first, across segments and the live file"""
+        for segment in self.manifest["segments"] if segments is None else segments:
+            yield from self.iter_segment(segment)
+        yield from self.iter_live()
+
+    def seek(self, since):
+        """Entry lines with a timestamp at or after since (naive UTC datetime)
+
+        Segments that end before since are skipped without decompressing.
+        """
+        since_str = since.strftime("%Y-%m-%d %H:%M:%S")
+        segments = [segment for segment in self.manifest["segments"]
+                    if not segment["last_timestamp"] or segment["last_timestamp"] >= since_str]
+
+        started = False
+        for line in self.iter_entries(segments):
+            if not started:
+                timestamp = parse_log_timestamp(line)
+                if not timestamp or timestamp < since:
+                    continue
+                started = True
+            yield line
+
+    def tail(self, count=10):
+        """Last count entries, reaching into segments when the live log is short"""
+        self.index.sync()
+        live_entries = self.index.data["entry_count"] - self.index.data["archived_entries"]
+
+        if live_entries >= count:
+            entries = self.index.tail(count)
+            if len(entries) == count:
+                return entries
+            # More than the index keeps offsets for
+            return list(deque(self.iter_live(), maxlen=count))
+
+        entries = list(self.iter_live())
+        for segment in reversed(self.manifest["segments"]):
+            if len(entries) >= count:
+                break
+            entries = list(self.iter_segment(segment)) + entries
+        return entries[-count:] if count > 0 else []
@@ -0,0 +1,304 @@
+"""
+Run metrics
+Collects per-stage wall time and bytes written plus every Gemini call of a
+run, then exports a JSON record of the run and a Prometheus textfile with
+cumulative latency histograms for the node exporter's textfile collector.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from file_locks import locked
+from state_store import atomic_write_json
+
+# Histogram bucket bounds in seconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+GEMINI_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+HISTOGRAMS = {
+    "bot_stage_duration_seconds": ("Wall time of a bot update stage", STAGE_BUCKETS),
+    "bot_run_duration_seconds": ("Wall time of a whole bot run", STAGE_BUCKETS),
+    "bot_gemini_request_duration_seconds": ("Latency of one generate_content call", GEMINI_BUCKETS)
+}
+
+COUNTERS = {
+    "bot_runs_total": "Bot runs by result",
+    "bot_stage_bytes_written_total": "Bytes written by a bot update stage",
+    "bot_gemini_requests_total": "generate_content calls by result",
+    "bot_gemini_prompt_bytes_total": "Prompt bytes sent to Gemini",
+    "bot_gemini_response_bytes_total": "Response bytes received from Gemini",
+    "bot_gemini_tokens_total": "Tokens reported in the response usage metadata",
+    "bot_content_fallbacks_total": "Template content used after a failed AI generation",
+    "bot_content_repairs_total": "Section repairs of malformed AI content by result"
+}
+
+GAUGES = {
+    "bot_last_run_timestamp_seconds": "Unix time of the last finished run"
+}
+
+
+def response_usage(response):
+    """Token counts from a response's usage_metadata, empty when absent"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+
+    tokens = {}
+    for key, field in (("prompt", "prompt_token_count"),
+                       ("response", "candidates_token_count"),
+                       ("total", "total_token_count")):
+        value = getattr(usage, field, None)
+        if isinstance(value, int):
+            tokens[key] = value
+    return tokens
+
+
+def snapshot_files(directories):
+    """(size, mtime_ns) of the files directly inside each directory"""
+    files = {}
+    for directory in directories:
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files[os.path.normpath(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def bytes_written(paths, before):
+    """Bytes written to paths since the before snapshot
+
+    Growth counts as appended bytes, a file that shrank or kept its size
+    but changed counts as rewritten in full.
+    """
+    total = 0
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        previous = before.get(os.path.normpath(path))
+        if previous is None:
+            total += stat.st_size
+        elif previous == (stat.st_size, stat.st_mtime_ns):
+            continue
+        elif stat.st_size > previous[0]:
+            # Appended
+            total += stat.st_size - previous[0]
+        else:
+            # Rewritten in place
+            total += stat.st_size
+    return total
+
+
+def label_key(labels):
+    """Stable series key for a label dict"""
+    return ",".join(f'{name}="{value}"' for name, value in sorted(labels.items()))
+
+
+class RunMetrics:
+    """Thread-safe metrics of a single run"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.stages = {}
+        self.calls = []
+        self.fallbacks = {}
+        self.repairs = {}
+        self.lock = threading.Lock()
+
+    def record_stage(self, name, ms, written):
+        """Wall time and bytes written of one stage"""
+        with self.lock:
+            self.stages[name] = {"ms": ms, "bytes": written}
+
+    def record_call(self, started, prompt, response_bytes=0, tokens=None, error=None, streamed=False):
+        """One generate_content call, successful or not"""
+        call = {
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            "success": error is None,
+            "streamed": streamed,
+            "prompt_bytes": len(prompt.encode('utf-8')),
+            "response_bytes": response_bytes,
+            "tokens": tokens or {}
+        }
+        if error is not None:
+            call["error"] = type(error).__name__
+        with self.lock:
+            self.calls.append(call)
+
+    def record_fallback(self, kind):
+        """Template content was used in place of failed AI content"""
+        with self.lock:
+            self.fallbacks[kind] = self.fallbacks.get(kind, 0) + 1
+
+    def record_repair(self, kind, fixed):
+        """Malformed AI content went through a section repair"""
+        with self.lock:
+            counts = self.repairs.setdefault(kind, {"fixed": 0, "failed": 0})
+            counts["fixed" if fixed else "failed"] += 1
+
+    def gemini_totals(self):
+        """Summed Gemini usage of the run"""
+        tokens = {}
+        for call in self.calls:
+            for key, value in call["tokens"].items():
+                tokens[key] = tokens.get(key, 0) + value
+        return {
+            "calls": len(self.calls),
+            "failed": sum(1 for call in self.calls if not call["success"]),
+            "ms": round(sum(call["ms"] for call in self.calls), 3),
+            "prompt_bytes": sum(call["prompt_bytes"] for call in self.calls),
+            "response_bytes": sum(call["response_bytes"] for call in self.calls),
+            "tokens": tokens
+        }
+
+    def to_dict(self, timestamp, mode, success, duration_ms):
+        """Per-run metrics record"""
+        with self.lock:
+            return {
+                "timestamp": timestamp,
+                "bot": self.bot,
+                "mode": mode,
+                "success": success,
+                "duration_ms": duration_ms,
+                "stages": dict(self.stages),
+                "gemini": {**self.gemini_totals(), "requests": list(self.calls)},
+                "fallbacks": dict(self.fallbacks),
+                "repairs": {kind: dict(counts) for kind, counts in self.repairs.items()}
+            }
+
+
+class MetricsExporter:
+    """Accumulates runs into histograms and writes the JSON and textfile outputs"""
+
+    def __init__(self, directory=".bot_cache/metrics", enabled=True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.state_file = self.directory / "state.json"
+        self.record_file = self.directory / "last_run.json"
+        self.textfile = self.directory / "bot_metrics.prom"
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the metrics section of the bot config"""
+        settings = config.get("metrics", {})
+        return cls(settings.get("dir", ".bot_cache/metrics"), settings.get("enabled", True))
+
+    def load_state(self):
+        """Cumulative series, empty on first use"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {"histograms": {}, "counters": {}, "gauges": {}}
+
+    @staticmethod
+    def observe(state, name, labels, value):
+        """Add one observation to a cumulative histogram series"""
+        buckets = HISTOGRAMS[name][1]
+        series = state["histograms"].setdefault(name, {}).setdefault(
+            label_key(labels), {"buckets": [0] * len(buckets), "count": 0, "sum": 0.0})
+
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                series["buckets"][i] += 1
+        series["count"] += 1
+        series["sum"] += value
+
+    @staticmethod
+    def increment(state, name, labels, value=1):
+        """Add to a counter series"""
+        series = state["counters"].setdefault(name, {})
+        key = label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def accumulate(self, state, record, now):
+        """Fold one run record into the cumulative series"""
+        bot = record["bot"]
+        result = "success" if record["success"] else "failure"
+
+        self.increment(state, "bot_runs_total", {"bot": bot, "result": result})
+        self.observe(state, "bot_run_duration_seconds", {"bot": bot}, record["duration_ms"] / 1000)
+        state["gauges"].setdefault("bot_last_run_timestamp_seconds", {})[label_key({"bot": bot})] = now
+
+        for stage, values in record["stages"].items():
+            labels = {"bot": bot, "stage": stage}
+            self.observe(state, "bot_stage_duration_seconds", labels, values["ms"] / 1000)
+            self.increment(state, "bot_stage_bytes_written_total", labels, values["bytes"])
+
+        for call in record["gemini"]["requests"]:
+            labels = {"bot": bot, "result": "success" if call["success"] else "error"}
+            self.observe(state, "bot_gemini_request_duration_seconds", labels, call["ms"] / 1000)
+            self.increment(state, "bot_gemini_requests_total", labels)
+            self.increment(state, "bot_gemini_prompt_bytes_total", {"bot": bot}, call["prompt_bytes"])
+            self.increment(state, "bot_gemini_response_bytes_total", {"bot": bot}, call["response_bytes"])
+            for kind, count in call["tokens"].items():
+                self.increment(state, "bot_gemini_tokens_total", {"bot": bot, "type": kind}, count)
+
+        for kind, count in record["fallbacks"].items():
+            self.increment(state, "bot_content_fallbacks_total", {"bot": bot, "kind": kind}, count)
+
+        for kind, counts in record.get("repairs", {}).items():
+            for result, count in counts.items():
+                if count:
+                    self.increment(state, "bot_content_repairs_total",
+                                   {"bot": bot, "kind": kind, "result": result}, count)
+
+    @staticmethod
+    def render(state):
+        """Prometheus text exposition of the cumulative series"""
+        lines = []
+
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            series = state["histograms"].get(name)
+            if not series:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for key, values in sorted(series.items()):
+                prefix = key + "," if key else ""
+                for bound, count in zip(buckets, values["buckets"]):
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {values["count"]}')
+                lines.append(f"{name}_sum{{{key}}} {values['sum']:.6f}")
+                lines.append(f"{name}_count{{{key}}} {values['count']}")
+
+        for kinds, metric_type in ((COUNTERS, "counter"), (GAUGES, "gauge")):
+            section = state["counters"] if metric_type == "counter" else state["gauges"]
+            for name, help_text in kinds.items():
+                series = section.get(name)
+                if not series:
+                    continue
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{{{key}}} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, record, now=None):
+        """Write the run record and refresh the textfile"""
+        if not self.enabled:
+            return False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Cumulative series are read-modify-write, concurrent runs take turns
+        with locked(self.state_file):
+            state = self.load_state()
+            self.accumulate(state, record, now if now is not None else time.time())
+
+            atomic_write_json(self.record_file, record)
+            atomic_write_json(self.state_file, state)
+
+            # The collector may read at any time, only ever expose a complete file
+            tmp_file = self.textfile.with_name(self.textfile.name + ".tmp")
+            tmp_file.write_text(self.render(state), encoding='utf-8')
+            os.replace(tmp_file, self.textfile)
+        return True
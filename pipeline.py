@@ -0,0 +1,85 @@
+"""
+Stage pipeline
+Runs bot update stages as a dependency graph on a thread pool, starting
+each stage as soon as its dependencies have finished and recording the
+wall time of every stage.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class PipelineError(Exception):
+    """A stage raised, the remaining stages were not started"""
+
+    def __init__(self, stage, error):
+        super().__init__(f"stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class Stage:
+    """One named unit of work and the stages it waits for"""
+
+    def __init__(self, name, func, depends=()):
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+
+
+class Pipeline:
+    """Dependency-ordered stage executor"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+
+    def add(self, name, func, depends=()):
+        """Register a stage, its dependencies must already be registered"""
+        if name in self.stages:
+            raise ValueError(f"duplicate stage '{name}'")
+        unknown = [dep for dep in depends if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"stage '{name}' depends on unknown {', '.join(unknown)}")
+
+        self.stages[name] = Stage(name, func, depends)
+        return self
+
+    def execute(self, stage):
+        """Run one stage and time it"""
+        start = time.perf_counter()
+        try:
+            return stage.func()
+        finally:
+            self.timings[stage.name] = round((time.perf_counter() - start) * 1000, 3)
+
+    def run(self):
+        """Run every stage, independent ones in parallel, and return their results"""
+        pending = dict(self.stages)
+        running = {}
+        failure = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if failure is None:
+                    for name, stage in list(pending.items()):
+                        if all(dep in self.results for dep in stage.depends):
+                            running[executor.submit(self.execute, stage)] = name
+                            del pending[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        failure = failure or (name, e)
+
+        if failure:
+            raise PipelineError(*failure)
+        return self.results
@@ -0,0 +1,160 @@
+"""
+Dirty-checked README rendering
+Compiles a README layout once. Volatile stats live in marked blocks that
+are spliced into the existing README, the rest of the file is rendered
+only when the layout or a stable stat changes. The bookkeeping (layout
+and stats hashes, last write) is returned to the caller, not stored in
+the README.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from string import Formatter
+
+from file_locks import locked
+from state_store import atomic_write_text
+
+# Invisible in rendered markdown, each marker on a line of its own
+BLOCK_START = "<!-- readme-stats -->"
+BLOCK_END = "<!-- /readme-stats -->"
+
+
+def short_hash(text):
+    """Short stable digest of text"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def split_blocks(text):
+    """(outside pieces, block bodies) of text, None when the markers do not pair up
+
+    Outside pieces keep the markers, so joining pieces and bodies
+    alternately gives back text.
+    """
+    outside, blocks = [], []
+    piece_start = search_from = 0
+    while True:
+        start = text.find(BLOCK_START, search_from)
+        stray_end = text.find(BLOCK_END, search_from, len(text) if start < 0 else start)
+        if stray_end >= 0:
+            return None
+        if start < 0:
+            outside.append(text[piece_start:])
+            return outside, blocks
+
+        body_start = start + len(BLOCK_START)
+        end = text.find(BLOCK_END, body_start)
+        if end < 0 or BLOCK_START in text[body_start:end]:
+            return None
+        outside.append(text[piece_start:body_start])
+        blocks.append(text[body_start:end])
+        piece_start, search_from = end, end + len(BLOCK_END)
+
+
+def render_parts(parts, stats):
+    """Text of precompiled Formatter parts for stats"""
+    out = []
+    for literal, field, spec, conversion in parts:
+        out.append(literal)
+        if field is None:
+            continue
+        value = stats[field]
+        if conversion == "r":
+            value = repr(value)
+        elif conversion == "s":
+            value = str(value)
+        out.append(format(value, spec or ""))
+    return "".join(out)
+
+
+class ReadmeTemplate:
+    """Precompiled README layout with volatile and stable fields"""
+
+    def __init__(self, layout, volatile=()):
+        pieces = split_blocks(layout)
+        if pieces is None:
+            raise ValueError("README layout has unpaired stats block markers")
+        outside, blocks = pieces
+
+        self.parts = list(Formatter().parse(layout))
+        self.block_parts = [list(Formatter().parse(block)) for block in blocks]
+        self.layout_hash = short_hash(layout)
+        self.volatile = set(volatile)
+
+        # A volatile field outside the blocks would go stale between full renders
+        stray = {field for piece in outside for _, field, _, _ in Formatter().parse(piece)} & self.volatile
+        if stray:
+            raise ValueError(f"Volatile README fields outside stats blocks: {', '.join(sorted(stray))}")
+
+    def render(self, stats):
+        """Full README text for stats"""
+        return render_parts(self.parts, stats)
+
+    def render_blocks(self, stats):
+        """Text of every stats block for stats"""
+        return [render_parts(parts, stats) for parts in self.block_parts]
+
+    def stats_hash(self, stats):
+        """Digest of the fields whose change forces a rewrite"""
+        stable = {key: value for key, value in stats.items() if key not in self.volatile}
+        return short_hash(json.dumps(stable, sort_keys=True, default=str))
+
+    def splice(self, text, stats):
+        """text with its stats blocks re-rendered, None when its blocks do not match the layout"""
+        pieces = split_blocks(text)
+        if pieces is None or len(pieces[1]) != len(self.block_parts):
+            return None
+
+        outside, _ = pieces
+        out = []
+        for piece, block in zip(outside, self.render_blocks(stats)):
+            out.append(piece)
+            out.append(block)
+        out.append(outside[-1])
+        return "".join(out)
+
+    def is_dirty(self, state, stats, now, min_interval_hours=12):
+        """Whether README needs a refresh, given the state of the last write"""
+        if state.get("layout") != self.layout_hash or state.get("stats") != self.stats_hash(stats):
+            return True
+
+        try:
+            updated = datetime.strptime(state["updated"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            return True
+        return (now - updated).total_seconds() >= min_interval_hours * 3600
+
+    def write(self, path, stats, now, state=None, min_interval_hours=12):
+        """Refresh README when dirty, returning (file changed, state to keep)
+
+        Only the stats blocks are replaced while layout and stable stats
+        match state; the file goes through a temp file and rename, so a
+        failed render or a reader never meets a truncated README.
+        """
+        state = state or {}
+        if not self.is_dirty(state, stats, now, min_interval_hours):
+            return False, state
+
+        with locked(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    current = f.read()
+            except OSError:
+                current = None
+
+            text = None
+            if current is not None and state.get("layout") == self.layout_hash \
+                    and state.get("stats") == self.stats_hash(stats):
+                text = self.splice(current, stats)
+            if text is None:
+                text = self.render(stats)
+
+            changed = text != current
+            if changed:
+                atomic_write_text(path, text)
+
+        return changed, {
+            "layout": self.layout_hash,
+            "stats": self.stats_hash(stats),
+            "updated": now.strftime('%Y-%m-%d %H:%M:%S')
+        }
@@ -0,0 +1,103 @@
+"""
+On-disk cache for Gemini responses
+SQLite store keyed by a hash of model name + full prompt,
+with a TTL and size-bounded LRU eviction.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class ResponseCache:
+    """Prompt/response cache shared by all generate_ai_* calls"""
+
+    def __init__(self, db_path, ttl_seconds=7200, max_entries=200):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model_name, prompt):
+        """Cache key for a model/prompt pair"""
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, model_name, prompt):
+        """Return a fresh cached response, or None on a miss"""
+        key = self.make_key(model_name, prompt)
+        now = time.time()
+
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and now - row[1] <= self.ttl_seconds:
+                self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                self.hits += 1
+                return row[0]
+
+            if row:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+            self.misses += 1
+            return None
+
+    def put(self, model_name, prompt, response):
+        """Store a response and evict expired and least recently used entries"""
+        self.put_chunks(model_name, prompt, [response])
+
+    def put_chunks(self, model_name, prompt, chunks):
+        """Store a response arriving in pieces, never held whole in memory"""
+        key = self.make_key(model_name, prompt)
+        now = time.time()
+
+        with self.lock:
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_used)"
+                    " VALUES (?, ?, '', ?, ?)",
+                    (key, model_name, now, now)
+                )
+                for chunk in chunks:
+                    self.conn.execute("UPDATE responses SET response = response || ? WHERE key = ?", (chunk, key))
+            except BaseException:
+                # A half-read response must not be committed with the next write
+                self.conn.rollback()
+                raise
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.conn.execute(
+                "DELETE FROM responses WHERE key NOT IN"
+                " (SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database"""
+        self.conn.close()
@@ -0,0 +1,169 @@
+"""
+Structured run events
+Append-only JSON Lines log with one typed record per bot run, plus a
+streaming parser for every historical autonomous_logs.txt line format.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from file_locks import append_text, locked
+
+# Exact legacy line prefixes: (prefix, bot, version, mode)
+LEGACY_FORMATS = (
+    ("🤖 Autonomous update at ", "autonomous", "2.0", "autonomous"),
+    ("Autonomous update at ", "autonomous", "2.0", "autonomous"),
+    ("✅ Update at ", "enhanced", "3.0", "enhanced_autonomous"),
+    ("[OK] Update at ", "enhanced", "3.0", "enhanced_autonomous"),
+    ("[Template] Update at ", "ai", "4.0", "template"),
+    ("[AI] Update at ", "ai", "4.0", "ai_enhanced"),
+    ("Update at ", "daily_commit", "1.0", "daily_commit"),
+)
+
+# Every format ends with 'YYYY-MM-DD HH:MM:SS UTC'
+TIMESTAMP_LENGTH = 19
+SUFFIX = " UTC"
+
+
+def make_event(timestamp, bot, version, mode, success=True, duration_ms=None,
+               files=None, api_calls=0, api_latency_ms=None, stage_ms=None, source="run"):
+    """Build a run event record with the full field set"""
+    return {
+        "timestamp": timestamp,
+        "bot": bot,
+        "version": version,
+        "mode": mode,
+        "success": success,
+        "duration_ms": duration_ms,
+        "files": files or [],
+        "api_calls": api_calls,
+        "api_latency_ms": api_latency_ms,
+        "stage_ms": stage_ms,
+        "source": source
+    }
+
+
+def split_entry(line):
+    """Split an entry line into (prefix, timestamp string), None if it has none
+
+    Uses fixed-width slicing only, no regular expressions or strptime.
+    """
+    line = line.strip()
+    if not line.endswith(SUFFIX) or len(line) < TIMESTAMP_LENGTH + len(SUFFIX):
+        return None
+
+    timestamp = line[-TIMESTAMP_LENGTH - len(SUFFIX):-len(SUFFIX)]
+    if timestamp[4] != "-" or timestamp[10] != " " or timestamp[13] != ":":
+        return None
+
+    return line[:-TIMESTAMP_LENGTH - len(SUFFIX)], timestamp
+
+
+def parse_legacy_line(line):
+    """Run event for one legacy log line, None if it is not an entry"""
+    parts = split_entry(line)
+    if not parts:
+        return None
+
+    head, timestamp = parts
+    for prefix, bot, version, mode in LEGACY_FORMATS:
+        if head == prefix:
+            return make_event(timestamp, bot, version, mode, source="legacy")
+    return None
+
+
+class RunEventLog:
+    """Append-only JSON Lines file of run events"""
+
+    def __init__(self, events_file="run_events.jsonl"):
+        self.events_file = Path(events_file)
+
+    def append(self, event):
+        """Append one event as a single write"""
+        # Shares the lock with migrate(), whose rewrite would drop the line
+        with locked(self.events_file):
+            append_text(self.events_file, json.dumps(event, ensure_ascii=False) + "\n")
+
+    def iter_events(self):
+        """Stream every event, skipping torn lines"""
+        if not self.events_file.exists():
+            return
+        with open(self.events_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def migrate(self, legacy_lines):
+        """Ingest legacy text entries older than their bot's first native event
+
+        Bots that never record native events, like daily_commit.py, keep
+        every legacy entry. Rewrites the event file once, legacy records first, so running
+        the migration again never duplicates runs. Appends wait for the
+        rewrite under the event file's lock.
+        """
+        legacy = []
+        with locked(self.events_file):
+            native = [event for event in self.iter_events() if event.get("source") != "legacy"]
+            cutoffs = {}
+            for event in native:
+                bot = event["bot"]
+                if bot not in cutoffs or event["timestamp"] < cutoffs[bot]:
+                    cutoffs[bot] = event["timestamp"]
+
+            for line in legacy_lines:
+                event = parse_legacy_line(line)
+                if not event:
+                    continue
+                cutoff = cutoffs.get(event["bot"])
+                if cutoff is None or event["timestamp"] < cutoff:
+                    legacy.append(event)
+
+            tmp_file = self.events_file.with_name(self.events_file.name + ".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for event in legacy + native:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            os.replace(tmp_file, self.events_file)
+
+        return len(legacy)
+
+    def summarize(self):
+        """Run statistics computed from the typed records"""
+        summary = {
+            "runs": 0,
+            "failed_runs": 0,
+            "first_run": None,
+            "last_run": None,
+            "by_bot": {},
+            "by_mode": {},
+            "avg_duration_ms": None,
+            "avg_api_latency_ms": None
+        }
+        durations, latencies = [], []
+
+        for event in self.iter_events():
+            summary["runs"] += 1
+            if not event.get("success", True):
+                summary["failed_runs"] += 1
+
+            timestamp = event["timestamp"]
+            if summary["first_run"] is None or timestamp < summary["first_run"]:
+                summary["first_run"] = timestamp
+            if summary["last_run"] is None or timestamp > summary["last_run"]:
+                summary["last_run"] = timestamp
+
+            summary["by_bot"][event["bot"]] = summary["by_bot"].get(event["bot"], 0) + 1
+            summary["by_mode"][event["mode"]] = summary["by_mode"].get(event["mode"], 0) + 1
+
+            if event.get("duration_ms") is not None:
+                durations.append(event["duration_ms"])
+            if event.get("api_latency_ms") is not None:
+                latencies.append(event["api_latency_ms"])
+
+        if durations:
+            summary["avg_duration_ms"] = round(sum(durations) / len(durations), 1)
+        if latencies:
+            summary["avg_api_latency_ms"] = round(sum(latencies) / len(latencies), 1)
+        return summary
@@ -0,0 +1,180 @@
+"""
+Full-text search over ai_notes/ and coding_challenges/
+SQLite FTS5 index with one row per entry, maintained incrementally
+from the byte offset each file was last indexed up to.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+
+GENERATED_PATTERN = re.compile(rb"^\*Generated: (.+?) UTC\*[ \t]*\r?$", re.MULTILINE)
+SEPARATOR = ("\n\n" + "=" * 60 + "\n\n").encode('utf-8')
+HEADING_PATTERN = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+CHALLENGE_TITLE_PATTERN = re.compile(r"^#\s+Challenge:\s*(.+)$", re.MULTILINE)
+CHALLENGE_DATE_PATTERN = re.compile(r"challenge_(\d{4}-\d{2}-\d{2})")
+
+
+def extract_title(text):
+    """Challenge title or first markdown heading of an entry"""
+    match = CHALLENGE_TITLE_PATTERN.search(text) or HEADING_PATTERN.search(text)
+    return match.group(1).strip() if match else ""
+
+
+def split_note_entries(data, base_offset=0):
+    """Split monthly notes bytes into (offset, generated, text) entries
+
+    Every entry starts at its '*Generated: ... UTC*' line and ends at
+    the next separator or the end of the data.
+    """
+    markers = list(GENERATED_PATTERN.finditer(data))
+    entries = []
+
+    for i, match in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(data)
+        chunk = data[match.start():end]
+        if chunk.endswith(SEPARATOR):
+            chunk = chunk[:-len(SEPARATOR)]
+
+        entries.append((
+            base_offset + match.start(),
+            match.group(1).decode('utf-8', errors='replace'),
+            chunk[match.end() - match.start():].decode('utf-8', errors='replace').strip()
+        ))
+
+    return entries
+
+
+class SearchIndex:
+    """Inverted index over generated notes and challenges"""
+
+    def __init__(self, notes_dir="ai_notes", challenges_dir="coding_challenges",
+                 db_path=".bot_cache/search.sqlite3", archive=None):
+        self.notes_dir = Path(notes_dir)
+        self.challenges_dir = Path(challenges_dir)
+        self.db_path = Path(db_path)
+        self.archive = archive
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Bots write from a pipeline stage thread, one stage at a time
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS indexed_files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5("
+            " title, body, path UNINDEXED, byte_offset UNINDEXED,"
+            " generated UNINDEXED, kind UNINDEXED,"
+            " tokenize = 'porter unicode61')"
+        )
+        self.conn.commit()
+
+    def sync(self):
+        """Index everything written since the last sync, returns new entries"""
+        added = 0
+        for path in sorted(self.notes_dir.glob("learning_*.md")):
+            added += self.sync_file(path)
+        for path in sorted(self.challenges_dir.glob("challenge_*.md")):
+            added += self.sync_file(path)
+
+        if self.archive is not None:
+            for key in self.archive.paths():
+                if not Path(key).exists():
+                    added += self.sync_archived(key)
+        return added
+
+    def sync_archived(self, key):
+        """Index an archived file unless its original bytes already are"""
+        size = self.archive.size(key)
+        row = self.conn.execute("SELECT size FROM indexed_files WHERE path = ?", (key,)).fetchone()
+        # Archived files never change, a full index of the original is current
+        if row and row[0] == size:
+            return 0
+
+        self.conn.execute("DELETE FROM entries WHERE path = ?", (key,))
+        return self.index_data(key, self.archive.read_bytes(key), 0, 0)
+
+    def sync_file(self, path):
+        """Bring one notes or challenge file up to date"""
+        path = Path(path)
+        stat = path.stat()
+        key = path.as_posix()
+
+        row = self.conn.execute(
+            "SELECT size, mtime_ns FROM indexed_files WHERE path = ?", (key,)
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return 0
+
+        is_note = path.name.startswith("learning_")
+
+        # Notes only grow, challenge files are rewritten in place
+        if row and is_note and stat.st_size > row[0]:
+            start = row[0]
+        else:
+            start = 0
+            self.conn.execute("DELETE FROM entries WHERE path = ?", (key,))
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read()
+
+        return self.index_data(key, data, start, stat.st_mtime_ns)
+
+    def index_data(self, key, data, start, mtime_ns):
+        """Insert the entries of a file's bytes from offset start onwards"""
+        path = Path(key)
+        is_note = path.name.startswith("learning_")
+        if is_note:
+            entries = [(offset, generated, text, "learning_note")
+                       for offset, generated, text in split_note_entries(data, start)]
+        else:
+            match = CHALLENGE_DATE_PATTERN.search(path.name)
+            text = data.decode('utf-8', errors='replace')
+            entries = [(0, match.group(1) if match else "", text, "coding_challenge")]
+
+        self.conn.executemany(
+            "INSERT INTO entries (title, body, path, byte_offset, generated, kind)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(extract_title(text), text, key, offset, generated, kind)
+             for offset, generated, text, kind in entries]
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO indexed_files (path, size, mtime_ns) VALUES (?, ?, ?)",
+            (key, start + len(data), mtime_ns)
+        )
+        self.conn.commit()
+        return len(entries)
+
+    @staticmethod
+    def build_query(text):
+        """Quote every term so user input never hits FTS5 syntax"""
+        terms = text.split()
+        return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+    def search(self, text, limit=10):
+        """Ranked hits for a free-text query"""
+        query = self.build_query(text)
+        if not query:
+            return []
+
+        rows = self.conn.execute(
+            "SELECT path, byte_offset, generated, kind, title,"
+            " snippet(entries, 1, '[', ']', '...', 12), bm25(entries, 5.0, 1.0)"
+            " FROM entries WHERE entries MATCH ?"
+            " ORDER BY bm25(entries, 5.0, 1.0) LIMIT ?",
+            (query, limit)
+        ).fetchall()
+
+        return [
+            {"path": path, "offset": offset, "generated": generated, "kind": kind,
+             "title": title, "snippet": snippet, "score": round(-score, 3)}
+            for path, offset, generated, kind, title, snippet, score in rows
+        ]
+
+    def close(self):
+        """Close the underlying database"""
+        self.conn.close()
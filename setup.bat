@@ -13,7 +13,7 @@ echo 📋 Current directory: %cd%
 echo.
 
 echo 🧪 Testing bot locally...
-python autonomous_bot.py
+python botctl.py run --bot autonomous
 
 echo.
 echo 🔧 Adding remote repository...
@@ -0,0 +1,216 @@
+"""
+Shared bot state
+Loads bot_config.json and bot_status.json once per process, keeps them
+in memory and flushes changes with an atomic write-temp-and-rename. Status
+counters are merged with the file on disk under its lock, not overwritten.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from file_locks import locked
+
+# Config keys shared by every bot version, each bot overrides what differs
+DEFAULT_CONFIG = {
+    "bot_name": "blogecoin Bot",
+    "version": "4.0",
+    "mode": "ai_enhanced",
+    "commits_per_day": {"min": 2, "max": 5},
+    "log_rotation": {"enabled": True, "max_bytes": 1048576},
+    "readme": {"min_interval_hours": 12},
+    "pipeline": {"max_workers": 4},
+    "metrics": {"enabled": True, "dir": ".bot_cache/metrics"},
+    # Same slots as the GitHub workflows, in UTC
+    "daemon": {
+        "bots": ["ai"],
+        "schedule": ["09:00", "14:00", "18:00", "22:00"],
+        "jitter_minutes": 30,
+        "poll_seconds": 60
+    },
+    "enabled": True
+}
+
+_stores = {}
+
+
+def atomic_write_text(path, text):
+    """Write text to path via fsynced temp file and rename"""
+    path = Path(path)
+    tmp_file = path.with_name(path.name + ".tmp")
+
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+    # Persist the rename itself where the platform allows it
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_json(path, data):
+    """Write JSON to path via fsynced temp file and rename"""
+    atomic_write_text(path, json.dumps(data, indent=2))
+
+
+def merge_defaults(defaults, values):
+    """Merge values over defaults, nested sections key by key at every depth
+
+    Nested sections are always copied, so callers never share a dict with
+    the defaults.
+    """
+    merged = {**defaults, **values}
+    for key, default in defaults.items():
+        value = values.get(key, {})
+        if isinstance(default, dict) and isinstance(value, dict):
+            merged[key] = merge_defaults(default, value)
+    return merged
+
+
+def counter_path(key):
+    """Tuple of nested status keys from 'a.b.c' or a tuple"""
+    return tuple(key.split(".")) if isinstance(key, str) else tuple(key)
+
+
+def get_counter(data, path):
+    """Counter value at a nested path, 0 when absent"""
+    for key in path:
+        if not isinstance(data, dict):
+            return 0
+        data = data.get(key, {})
+    return data if isinstance(data, (int, float)) else 0
+
+
+def set_counter(data, path, value):
+    """Store a counter at a nested path, creating sections on the way"""
+    for key in path[:-1]:
+        if not isinstance(data.get(key), dict):
+            data[key] = {}
+        data = data[key]
+    data[path[-1]] = value
+
+
+class StateStore:
+    """In-memory view of the config and status files"""
+
+    def __init__(self, config_file="bot_config.json", status_file="bot_status.json"):
+        self.config_file = Path(config_file)
+        self.status_file = Path(status_file)
+        self.config_mtime = self.mtime(self.config_file)
+        self.status_mtime = self.mtime(self.status_file)
+        self.config_data = self.read_json(self.config_file)
+        self.status = self.read_json(self.status_file) or {}
+        # Bumped on every config reload so long-lived bots know to rebuild
+        self.config_version = 0
+        self.config_dirty = False
+        self.status_dirty = False
+        self.counters = {}
+
+    @staticmethod
+    def mtime(path):
+        """Modification time in ns, None if the file is missing"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def read_json(path):
+        """Parse a JSON file, None if missing or unreadable"""
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return None
+
+    def load_config(self, overrides=None):
+        """Bot config merged over the shared and bot-specific defaults
+
+        A missing config file is created from the defaults on the next flush.
+        """
+        defaults = merge_defaults(DEFAULT_CONFIG, overrides or {})
+
+        if self.config_data is None:
+            self.config_data = defaults
+            self.config_dirty = True
+            return dict(defaults)
+
+        return merge_defaults(defaults, self.config_data)
+
+    def refresh(self):
+        """Re-read files changed on disk since they were loaded or written
+
+        Long-running processes call this before each run; unchanged files
+        cost one stat each. Pending changes are never discarded.
+        """
+        mtime = self.mtime(self.config_file)
+        if mtime != self.config_mtime and not self.config_dirty:
+            self.config_mtime = mtime
+            self.config_data = self.read_json(self.config_file)
+            self.config_version += 1
+
+        mtime = self.mtime(self.status_file)
+        if mtime != self.status_mtime and not self.status_dirty:
+            self.status_mtime = mtime
+            self.status = self.read_json(self.status_file) or {}
+
+    def replace_status(self, status):
+        """Replace the status record, written on the next flush"""
+        self.status = status
+        self.status_dirty = True
+
+    def increment(self, key, amount=1):
+        """Add to a status counter, merged with concurrent runs on flush
+
+        key is a top-level name or a dotted/tuple path into nested sections.
+        """
+        path = counter_path(key)
+        self.counters[path] = self.counters.get(path, 0) + amount
+        self.status_dirty = True
+
+    def merge_status(self):
+        """Own status with every counter set to the on-disk value plus our increments"""
+        on_disk = self.read_json(self.status_file) or {}
+        status = dict(self.status)
+        for path, amount in self.counters.items():
+            value = get_counter(on_disk, path) + amount
+            set_counter(status, path, round(value, 6) if isinstance(value, float) else value)
+        return status
+
+    def flush(self):
+        """Write every changed file atomically
+
+        The status file is re-read under its lock so increments of runs that
+        flushed since this process loaded it are kept, other fields are ours.
+        """
+        if self.config_dirty:
+            with locked(self.config_file):
+                # Only a missing config is written, another run may have created it
+                if not self.config_file.exists():
+                    atomic_write_json(self.config_file, self.config_data)
+                self.config_mtime = self.mtime(self.config_file)
+            self.config_dirty = False
+
+        if self.status_dirty:
+            with locked(self.status_file):
+                self.status = self.merge_status()
+                atomic_write_json(self.status_file, self.status)
+                self.status_mtime = self.mtime(self.status_file)
+            self.counters = {}
+            self.status_dirty = False
+
+
+def get_state_store(config_file="bot_config.json", status_file="bot_status.json"):
+    """Process-wide StateStore for a config/status file pair"""
+    key = (str(Path(config_file).resolve()), str(Path(status_file).resolve()))
+    if key not in _stores:
+        _stores[key] = StateStore(config_file, status_file)
+    return _stores[key]
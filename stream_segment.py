@@ -0,0 +1,121 @@
+"""
+Streamed content segments
+Temp files that receive generated text chunk by chunk and are spliced
+onto their target file only once the response is complete, or dropped
+when generation fails or is abandoned.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from file_locks import locked
+
+COPY_CHUNK = 64 * 1024
+
+
+class SegmentAbandoned(Exception):
+    """The consumer gave up on the stream before it finished"""
+
+
+class StreamSegment:
+    """Temp file collecting one streamed response"""
+
+    def __init__(self, segments_dir=".bot_cache/stream"):
+        segments_dir = Path(segments_dir)
+        segments_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(suffix=".part", dir=segments_dir)
+        self.path = Path(name)
+        self.file = os.fdopen(fd, 'w+', encoding='utf-8')
+        self.size = 0
+        self.abandoned = False
+
+    def write(self, text):
+        """Write a chunk straight to disk"""
+        if self.abandoned:
+            raise SegmentAbandoned(str(self.path))
+        self.file.write(text)
+        self.file.flush()
+        self.size += len(text)
+
+    def reset(self):
+        """Drop everything written so far, before a retry"""
+        self.file.seek(0)
+        self.file.truncate()
+        self.size = 0
+
+    def abandon(self):
+        """Mark the segment unwanted, the writer stops at its next chunk"""
+        self.abandoned = True
+
+    def read_text(self):
+        """Full segment text"""
+        self.file.seek(0)
+        return self.file.read()
+
+    def iter_chunks(self, size=COPY_CHUNK):
+        """Segment text in pieces of at most size characters"""
+        self.file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.read(size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def iter_lines(self):
+        """Segment text line by line"""
+        self.file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            yield from f
+
+    def discard(self):
+        """Close and delete the segment"""
+        if not self.file.closed:
+            self.file.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def splice_append(self, target, prefix=""):
+        """Append prefix and segment to target, truncating back on failure
+
+        The copy takes several writes, so it runs under the target's lock;
+        other appenders of the file take the same lock and the truncate
+        never cuts off their data.
+        """
+        self.file.flush()
+        with locked(target), open(target, 'ab') as out:
+            size = out.seek(0, os.SEEK_END)
+            try:
+                out.write(prefix.encode('utf-8'))
+                with open(self.path, 'rb') as segment:
+                    shutil.copyfileobj(segment, out, COPY_CHUNK)
+                out.flush()
+                os.fsync(out.fileno())
+            except BaseException:
+                out.truncate(size)
+                raise
+        self.discard()
+
+    def splice_replace(self, target, prefix=""):
+        """Replace target with prefix and segment via rename"""
+        target = Path(target)
+        tmp_file = target.with_name(target.name + ".tmp")
+        self.file.flush()
+        # The temp name is fixed per target, writers of the same file take turns
+        with locked(target):
+            try:
+                with open(tmp_file, 'wb') as out:
+                    out.write(prefix.encode('utf-8'))
+                    with open(self.path, 'rb') as segment:
+                        shutil.copyfileobj(segment, out, COPY_CHUNK)
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(tmp_file, target)
+            finally:
+                if tmp_file.exists():
+                    tmp_file.unlink()
+        self.discard()
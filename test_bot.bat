@@ -9,7 +9,7 @@ echo.
 
 cd /d "%~dp0"
 
-python autonomous_bot.py
+python botctl.py run --bot autonomous
 
 echo.
 echo ============================================
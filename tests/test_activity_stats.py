@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from activity_stats import KIND_AI, KIND_TEMPLATE, analyze, load_activity
+from log_segments import SegmentedLog
+
+
+def test_runs_are_loaded_across_segments_and_analyzed(tmp_path):
+    log_file = tmp_path / "autonomous_logs.txt"
+    log = SegmentedLog(log_file, tmp_path / "logs")
+    log.append("[AI] Update at 2026-09-30 09:00:00 UTC", datetime(2026, 9, 30, 9))
+    log.append("[Template] Update at 2026-10-01 09:00:00 UTC", datetime(2026, 10, 1, 9))
+    with open(log_file, 'ab') as f:
+        # Hand-edited: CRLF, an out-of-order entry and a line without a timestamp
+        f.write(b"[AI] Update at 2026-10-03 22:30:00 UTC\r\n")
+        f.write(b"Update at 2026-10-01 14:00:00 UTC\n")
+        f.write(b"Update pending\n")
+
+    seconds, kinds = load_activity(log_file, tmp_path / "logs")
+    assert [datetime.fromtimestamp(int(value), timezone.utc).strftime("%m-%d %H:%M") for value in seconds] == \
+        ["09-30 09:00", "10-01 09:00", "10-01 14:00", "10-03 22:30"]
+    assert kinds.tolist() == [KIND_AI, KIND_TEMPLATE, 0, KIND_AI]
+
+    report = analyze(seconds, kinds, gap_hours=24, window_days=2, expected_per_day=2)
+    assert (report["runs"], report["ai_ratio"]) == (4, round(2 / 3, 4))
+    assert report["runs_per_hour"][9] == 2
+    assert report["gaps"] == [{"from": "2026-10-01 14:00:00", "to": "2026-10-03 22:30:00", "hours": 56.5}]
+    assert [(day["date"], day["runs"], day["rolling_success_rate"]) for day in report["daily"]] == [
+        ("2026-09-30", 1, 0.5),
+        ("2026-10-01", 2, 0.75),
+        ("2026-10-02", 0, 0.5),
+        ("2026-10-03", 1, 0.25),
+    ]
+    assert report["success_rate"] == 0.5
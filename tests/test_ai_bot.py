@@ -0,0 +1,210 @@
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_bot_v4 import AIBot
+from fingerprints import match_subject, simhash
+from gemini_client import GeminiClient
+from stream_segment import StreamSegment
+
+OLD_NOTE = """# Git best practices
+
+## Overview
+Small focused commits with descriptive messages keep history readable and make
+bisecting regressions cheap, rebasing local work keeps the main branch linear.
+"""
+
+NEW_NOTE = """# Git best practices
+
+## Overview
+Protect the default branch, require reviews, and sign tags for releases so every
+deployed artifact can be traced back to an approved and verified revision.
+"""
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class Model:
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        text = self.texts.pop(0)
+        if stream:
+            return iter([Response(text[i:i + 16]) for i in range(0, len(text), 16)])
+        return Response(text)
+
+
+class SlowNoteModel:
+    """Async model that answers challenges at once and hangs on notes"""
+
+    def __init__(self, text):
+        self.text = text
+        self.prompts = []
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if "learning note" in prompt:
+            await asyncio.sleep(30)
+        return Response(self.text)
+
+
+def distinct_texts(count, seed=7):
+    rng = random.Random(seed)
+    words = [f"word{n}" for n in range(400)]
+    return [" ".join(rng.choice(words) for _ in range(60)) for _ in range(count)]
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    bot = AIBot()
+    bot.ensure_directories()
+    bot.config["ai_features"] = {**bot.config["ai_features"], "validation": {"enabled": False}}
+    return bot
+
+
+def enable_ai(bot, model):
+    bot.ai_enabled = True
+    bot.model = model
+    bot.response_cache = bot.setup_response_cache()
+    bot.gemini = GeminiClient(model, {"requests_per_minute": 600})
+
+
+def test_match_subject_prefers_title_then_words():
+    topics = ["String processing", "Hash table applications", "Array manipulation"]
+    assert match_subject("Challenge: Array manipulation", "", topics) == "Array manipulation"
+    assert match_subject("Challenge: Two Sum", "Use a hash table keyed by value", topics) == \
+        "Hash table applications"
+    assert match_subject("Challenge: Tower of Hanoi", "Move the disks", topics) == "Challenge: Tower of Hanoi"
+
+
+def test_seeded_challenges_count_towards_their_type(bot):
+    header = bot.challenge_header("2026-10-16")
+    Path("coding_challenges/challenge_2026-10-16.md").write_text(
+        header + "# Challenge: Longest Palindrome\n\n## Problem\nGiven a string, process each "
+                 "character and return the longest palindromic substring.\n", encoding='utf-8')
+
+    index = bot.get_fingerprint_index("coding_challenge")
+    assert index.coverage == {"String processing": 1}
+    assert bot.choose_subject("coding_challenge", ["String processing", "Graph algorithms"]) == "Graph algorithms"
+
+
+def test_spooled_duplicates_are_skipped_before_generating(bot):
+    bot.record_fingerprint("learning_note", "Git best practices", simhash(OLD_NOTE),
+                           Path("ai_notes/learning_2026-10.md"), "2026-10-01 09:00:00")
+    bot.spool.push("learning_note", "Git best practices", OLD_NOTE, "2026-10-16 09:00:00")
+    bot.spool.push("learning_note", "Git best practices", NEW_NOTE, "2026-10-16 09:00:00")
+
+    assert bot.take_spooled("learning_note", bot.generate_fallback_note)["content"] == NEW_NOTE
+    assert bot.take_spooled("learning_note", bot.generate_fallback_note) is None
+
+
+def test_cached_duplicate_is_regenerated(bot):
+    model = Model([NEW_NOTE])
+    enable_ai(bot, model)
+    bot.store_cached_text(bot.build_learning_note_prompt("Git best practices"), OLD_NOTE)
+    bot.record_fingerprint("learning_note", "Git best practices", simhash(OLD_NOTE),
+                           Path("ai_notes/learning_2026-10.md"), "2026-10-01 09:00:00")
+
+    assert bot.generate_ai_learning_note("Git best practices") == NEW_NOTE
+    assert model.calls == 1
+    assert bot.update_ai_learning_note("Git best practices", NEW_NOTE)
+
+
+def test_streamed_note_is_never_read_whole(bot, monkeypatch):
+    note = NEW_NOTE + """
+## Key Concepts
+Branch protection rules.
+
+## Practical Example
+```bash
+git tag -s v1.0
+```
+
+## Key Takeaways
+- Review every change
+"""
+    enable_ai(bot, Model([note]))
+    bot.config["ai_features"] = {**bot.config["ai_features"], "streaming": True, "validation": {"enabled": True}}
+
+    def read_text(segment):
+        raise AssertionError("streamed segment read into memory")
+    monkeypatch.setattr(StreamSegment, "read_text", read_text)
+
+    segment = bot.generate_ai_learning_note("Git best practices")
+    assert isinstance(segment, StreamSegment)
+    notes_file = Path(bot.update_ai_learning_note("Git best practices", segment))
+
+    assert notes_file.read_text(encoding='utf-8').endswith(note)
+    assert bot.get_cached_text(bot.build_learning_note_prompt("Git best practices")) == note
+    match = bot.get_fingerprint_index("learning_note").find_near_duplicate(simhash(note))
+    assert match["path"] == notes_file.as_posix()
+
+
+def test_hung_generation_falls_back_at_its_deadline(bot):
+    challenge = distinct_texts(1)[0]
+    model = SlowNoteModel(challenge)
+    enable_ai(bot, model)
+    bot.config["ai_features"] = {**bot.config["ai_features"], "generation_timeout": 0.5}
+
+    started = time.monotonic()
+    paths = bot.run_ai_updates([bot.update_ai_learning_note, bot.update_coding_challenge])
+    assert time.monotonic() - started < 5
+    assert len(model.prompts) == 2
+
+    note_file, challenge_file = (Path(path) for path in paths)
+    assert "Exploring" in note_file.read_text(encoding='utf-8')
+    assert challenge_file.read_text(encoding='utf-8').endswith(challenge)
+
+
+def test_prefetch_spreads_picks_over_batch_and_spool(bot):
+    texts = distinct_texts(7)
+    enable_ai(bot, Model(texts[1:]))
+    bot.learning_topics = ["Git best practices", "Security best practices", "Performance optimization"]
+    bot.challenge_types = ["Array manipulation", "Graph algorithms", "Bit manipulation", "Dynamic programming"]
+    bot.spool.push("coding_challenge", "Array manipulation", texts[0], "2026-10-16 09:00:00")
+
+    assert bot.prefetch(3)
+    notes = [item["subject"] for item in bot.spool.items("learning_note")]
+    challenges = [item["subject"] for item in bot.spool.items("coding_challenge")]
+    assert sorted(notes) == sorted(bot.learning_topics)
+    assert sorted(challenges) == sorted(bot.challenge_types)
+
+
+def test_prefetch_drops_items_duplicating_the_spool(bot):
+    texts = distinct_texts(3)
+    enable_ai(bot, Model([texts[0], texts[0], texts[1], texts[2]]))
+    bot.learning_topics = ["Git best practices", "Security best practices"]
+    bot.challenge_types = ["Array manipulation"]
+
+    assert bot.prefetch(2)
+    assert [item["content"] for item in bot.spool.items("learning_note")] == [texts[0]]
+    assert [item["content"] for item in bot.spool.items("coding_challenge")] == texts[1:]
+
+
+def test_readme_state_is_kept_in_the_status_record(bot):
+    assert bot.update_readme() == "README.md"
+    bot.finish_status()
+
+    readme = Path("README.md").read_text(encoding='utf-8')
+    assert readme.startswith("# AI-Powered Autonomous Bot v4.0\n")
+    status = json.loads(Path("bot_status.json").read_text(encoding='utf-8'))
+    assert set(status["readme"]) == {"layout", "stats", "updated"}
+
+    # Within the interval only the run counter changed, the README is left alone
+    bot.refresh()
+    assert bot.update_readme() is None
+    bot.finish_status()
+    assert json.loads(Path("bot_status.json").read_text(encoding='utf-8'))["readme"] == status["readme"]
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from archive_store import ArchiveStore, read_content
+from search_index import SEPARATOR
+
+SEP = SEPARATOR.decode('utf-8')
+BODY = "# Git rebasing\n\n## Overview\nRebase keeps history linear.\n"
+
+
+def test_closed_months_round_trip_through_the_archive(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path("ai_notes").mkdir()
+    Path("coding_challenges").mkdir()
+    notes = {
+        "ai_notes/learning_2026-08.md": "# AI Learning Notes - August 2026\n\n"
+                                        "*Generated: 2026-08-01 09:00:00 UTC*\n\n" + BODY,
+        "ai_notes/learning_2026-09.md": "# AI Learning Notes - September 2026\n\n"
+                                        "*Generated: 2026-09-01 09:00:00 UTC*\n\n" + BODY + SEP
+                                        + "*Generated: 2026-09-02 09:00:00 UTC*\n\n# Caching\n\nKeep it warm.\n",
+        "coding_challenges/challenge_2026-09-30.md": "# Daily Coding Challenge - 2026-09-30\n\n"
+                                                     "*Auto-generated by AI Bot*\n\n# Challenge: Two Sum\n",
+        "ai_notes/learning_2026-10.md": "*Generated: 2026-10-01 09:00:00 UTC*\n\n" + BODY,
+    }
+    for path, text in notes.items():
+        Path(path).write_text(text, encoding='utf-8')
+
+    store = ArchiveStore("archive")
+    moved = store.archive_closed("ai_notes", "coding_challenges", "2026-10")
+    assert sorted(moved) == sorted(path for path in notes if "2026-10" not in path)
+    assert Path("ai_notes/learning_2026-10.md").exists()
+
+    # The repeated note body is stored once
+    assert len(list(Path("archive/blobs").rglob("*.z"))) == 3
+
+    reopened = ArchiveStore("archive")
+    for path in moved:
+        assert not Path(path).exists()
+        assert reopened.read_text(path) == notes[path]
+        assert read_content(path, reopened) == notes[path].encode('utf-8')
+    assert reopened.find("learning_note", "2026-09") == ["ai_notes/learning_2026-09.md"]
+    assert reopened.find("coding_challenge", "2026-09-30") == ["coding_challenges/challenge_2026-09-30.md"]
+    assert store.archive_closed("ai_notes", "coding_challenges", "2026-10") == []
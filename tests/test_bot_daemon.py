@@ -0,0 +1,67 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import bot_daemon
+from bot_daemon import BotDaemon
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Rng:
+    def uniform(self, low, high):
+        return 600
+
+
+class Bot:
+    def __init__(self, clock):
+        self.clock = clock
+        self.runs = []
+
+    def refresh(self):
+        pass
+
+    def run(self):
+        self.runs.append(self.clock())
+        return True
+
+
+def write_config(path, daemon, mtime_ns):
+    path.write_text(json.dumps({"daemon": daemon}), encoding='utf-8')
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_config_change_in_jitter_window_keeps_the_slot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / "bot_config.json"
+    daemon = {"bots": ["ai"], "schedule": ["09:00"], "jitter_minutes": 30, "poll_seconds": 60}
+    write_config(config_file, daemon, 10 ** 18)
+
+    clock = Clock(datetime(2026, 10, 17, 8, 59, tzinfo=timezone.utc))
+    bot = Bot(clock)
+    changes = []
+
+    async def wait_for(awaitable, timeout):
+        # Poll timeouts move the fake clock instead of sleeping
+        awaitable.close()
+        clock.now += timedelta(seconds=timeout)
+        if not changes and clock.now >= datetime(2026, 10, 17, 9, 5, tzinfo=timezone.utc):
+            changes.append(clock.now)
+            write_config(config_file, {**daemon, "poll_seconds": 120}, 2 * 10 ** 18)
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(bot_daemon.asyncio, "wait_for", wait_for)
+    scheduler = BotDaemon(lambda name: bot, clock=clock, rng=Rng())
+    asyncio.run(scheduler.serve(max_runs=1))
+
+    # The change landed between the slot start and its jittered due time
+    assert changes == [datetime(2026, 10, 17, 9, 5, tzinfo=timezone.utc)]
+    assert scheduler.settings["poll_seconds"] == 120
+    assert bot.runs == [datetime(2026, 10, 17, 9, 10, tzinfo=timezone.utc)]
@@ -0,0 +1,23 @@
+from content_spool import ContentSpool
+
+
+def test_items_come_back_in_order_across_instances(tmp_path):
+    producer = ContentSpool(tmp_path / "spool")
+    consumer = ContentSpool(tmp_path / "spool")
+    for subject in ("Git", "Security", "Testing"):
+        producer.push("learning_note", subject, f"# {subject}\n", "2026-10-17 09:00:00")
+    producer.push("coding_challenge", "Arrays", "# Challenge: Arrays\n", "2026-10-17 09:00:00")
+
+    assert [item["subject"] for item in consumer.items("learning_note")] == ["Git", "Security", "Testing"]
+    assert consumer.pop("learning_note") == \
+        {"subject": "Git", "content": "# Git\n", "generated": "2026-10-17 09:00:00"}
+
+    # A corrupt item is skipped, its file removed with it
+    consumer.item_file("learning_note", 1).write_text("{not json", encoding='utf-8')
+    assert consumer.pop("learning_note")["subject"] == "Testing"
+    assert consumer.pop("learning_note") is None
+    assert list((tmp_path / "spool" / "learning_note").iterdir()) == []
+
+    producer.push("learning_note", "Caching", "# Caching\n", "2026-10-17 14:00:00")
+    assert consumer.pop("learning_note")["subject"] == "Caching"
+    assert consumer.size("coding_challenge") == 1
@@ -0,0 +1,59 @@
+import io
+
+from content_validator import close_fences, is_valid, repair_prompt, splice_sections, validate
+
+BROKEN = """# Challenge: Two Sum
+
+## Problem
+Return the indices of two numbers adding up to target.
+
+## Solution
+Use a hash map.
+
+## Explanation
+Store each value's index while scanning.
+"""
+
+REPAIR = """Here are the sections:
+
+## Solution
+```python
+def two_sum(nums, target):
+    seen = {}
+    for i, n in enumerate(nums):
+        if target - n in seen:
+            return [seen[target - n], i]
+        seen[n] = i
+```
+
+## Analysis
+- Time Complexity: O(n)
+- Space Complexity: O(n)
+
+## Problem
+Not asked for, must be ignored.
+"""
+
+
+def test_repair_splices_only_the_named_sections():
+    report = validate(BROKEN, "coding_challenge")
+    assert report == {"title": True, "missing": ["Analysis"], "broken": ["Solution"]}
+    assert validate(io.StringIO(BROKEN), "coding_challenge") == report
+
+    prompt = repair_prompt("coding_challenge", "Two Sum", BROKEN, report["missing"] + report["broken"])
+    assert "## Solution\n```python" in prompt and "Use a hash map." not in prompt
+
+    fixed = splice_sections(BROKEN, REPAIR, ["Solution", "Analysis"], "coding_challenge")
+    assert is_valid(validate(fixed, "coding_challenge"))
+    assert [line for line in fixed.splitlines() if line.startswith("## ")] == \
+        ["## Problem", "## Solution", "## Analysis", "## Explanation"]
+    assert "Return the indices" in fixed and "Not asked for" not in fixed
+    assert "Use a hash map." not in fixed
+
+
+def test_unclosed_fence_is_broken_and_closed():
+    text = "# Git\n\n## Overview\nIntro\n\n## Practical Example\n```bash\ngit tag -s v1.0\n"
+    report = validate(text, "learning_note")
+    assert report["missing"] == ["Key Concepts", "Key Takeaways"]
+    assert report["broken"] == ["Practical Example"]
+    assert close_fences(text).endswith("git tag -s v1.0\n```\n")
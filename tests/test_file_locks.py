@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from conftest import REPO_DIR
+from log_index import LogIndex
+from log_segments import SegmentedLog
+
+# Builds its log objects, waits for the go file, then appends entries
+APPENDER = """
+import sys, time
+from datetime import datetime
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from log_index import LogIndex
+from log_segments import SegmentedLog
+
+index = LogIndex("autonomous_logs.txt")
+log = SegmentedLog("autonomous_logs.txt", index=index)
+Path(f"ready-{sys.argv[2]}").touch()
+while not Path("go").exists():
+    time.sleep(0.01)
+for i in range(int(sys.argv[3])):
+    log.append(f"[OK] Update at 2026-10-17 12:00:{i:02d} UTC", datetime(2026, 10, 17, 12))
+"""
+
+
+def write_log(path, months):
+    lines = ["# Test log\n", "\n"]
+    for month in months:
+        for day in range(1, 11):
+            lines.append(f"[OK] Update at {month}-{day:02d} 10:00:00 UTC\n")
+    path.write_text("".join(lines), encoding='utf-8')
+
+
+def test_processes_append_to_one_rotated_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_log(tmp_path / "autonomous_logs.txt", ["2026-08", "2026-09"])
+    count = 15
+
+    workers = [subprocess.Popen([sys.executable, "-c", APPENDER, str(REPO_DIR), str(n), str(count)])
+               for n in range(2)]
+    deadline = time.monotonic() + 30
+    while not all((tmp_path / f"ready-{n}").exists() for n in range(2)):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    # Both hold an index of the unrotated log when the first append rotates it
+    (tmp_path / "go").touch()
+    assert all(worker.wait(timeout=60) == 0 for worker in workers)
+
+    index = LogIndex("autonomous_logs.txt")
+    log = SegmentedLog("autonomous_logs.txt", index=index)
+    assert [segment["month"] for segment in log.manifest["segments"]] == ["2026-08", "2026-09"]
+    assert sum(segment["entries"] for segment in log.manifest["segments"]) == 20
+    assert index.entry_count == 20 + 2 * count
+    assert index.data["archived_entries"] == 20
+    assert index.first_timestamp == datetime(2026, 8, 1, 10)
+    assert index.uptime_days(datetime(2026, 10, 17, 12)) == 77
+    assert len(list(log.iter_entries())) == 20 + 2 * count
+    assert json.loads((tmp_path / "autonomous_logs.idx.json").read_text())["log_size"] == \
+        os.path.getsize(tmp_path / "autonomous_logs.txt")
+
+
+def test_stale_reader_keeps_rotated_totals(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_log(tmp_path / "autonomous_logs.txt", ["2026-09"])
+    stale = LogIndex("autonomous_logs.txt")
+    assert stale.entry_count == 10
+
+    writer = SegmentedLog("autonomous_logs.txt", index=LogIndex("autonomous_logs.txt"))
+    writer.append("[OK] Update at 2026-10-17 12:00:00 UTC", datetime(2026, 10, 17, 12))
+
+    # The smaller live file means another process rotated, not a hand edit
+    assert stale.entry_count == 11
+    assert stale.first_timestamp == datetime(2026, 9, 1, 10)
+
+
+def test_spool_instances_never_pop_the_same_item(tmp_path, monkeypatch):
+    from content_spool import ContentSpool
+
+    monkeypatch.chdir(tmp_path)
+    ContentSpool("ai_spool").push("learning_note", "a", "first", "t1")
+    first, second = ContentSpool("ai_spool"), ContentSpool("ai_spool")
+    first.push("learning_note", "b", "second", "t2")
+
+    assert first.pop("learning_note")["subject"] == "a"
+    assert second.pop("learning_note")["subject"] == "b"
+    assert first.pop("learning_note") is None
+
+
+def test_archive_keeps_entries_of_another_store(tmp_path, monkeypatch):
+    from archive_store import ArchiveStore
+
+    monkeypatch.chdir(tmp_path)
+    notes = Path("ai_notes")
+    notes.mkdir()
+    (tmp_path / "coding_challenges").mkdir()
+    (notes / "learning_2026-08.md").write_text("# August\n", encoding='utf-8')
+
+    stale = ArchiveStore()
+    assert stale.paths() == []
+
+    assert ArchiveStore().archive_closed(notes, "coding_challenges", "2026-10") == ["ai_notes/learning_2026-08.md"]
+    (notes / "learning_2026-09.md").write_text("# September\n", encoding='utf-8')
+    assert stale.archive_closed(notes, "coding_challenges", "2026-10") == ["ai_notes/learning_2026-09.md"]
+
+    store = ArchiveStore()
+    assert store.paths() == ["ai_notes/learning_2026-08.md", "ai_notes/learning_2026-09.md"]
+    assert store.read_text("ai_notes/learning_2026-08.md") == "# August\n"
+
+
+# Waits for the go file, then starts the shared file or appends to it
+HEADER_WRITER = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from file_locks import append_with_header
+
+Path(f"ready-{sys.argv[2]}").touch()
+while not Path("go").exists():
+    time.sleep(0.01)
+for i in range(20):
+    append_with_header("daily_quotes.txt", "# Daily Quotes\\n\\n", f"quote {sys.argv[2]}-{i}\\n")
+"""
+
+
+def test_concurrent_first_writers_share_one_header(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    workers = [subprocess.Popen([sys.executable, "-c", HEADER_WRITER, str(REPO_DIR), str(n)]) for n in range(4)]
+    deadline = time.monotonic() + 30
+    while not all((tmp_path / f"ready-{n}").exists() for n in range(4)):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    (tmp_path / "go").touch()
+    assert all(worker.wait(timeout=60) == 0 for worker in workers)
+
+    lines = (tmp_path / "daily_quotes.txt").read_text(encoding='utf-8').splitlines()
+    assert lines[:2] == ["# Daily Quotes", ""]
+    assert lines.count("# Daily Quotes") == 1
+    assert sorted(lines[2:]) == sorted(f"quote {n}-{i}" for n in range(4) for i in range(20))
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from gemini_client import GeminiClient
+from stream_segment import StreamSegment
+
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FlakyModel:
+    """Times out failures times, then answers"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError("deadline exceeded")
+        return iter([Chunk("streamed "), Chunk("text")]) if stream else Chunk("text")
+
+
+class AsyncFlakyModel:
+    """Async-only model that times out failures times, then answers"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError("deadline exceeded")
+        return Chunk("text")
+
+
+class CountingBucket:
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.reserved = 0
+
+    def reserve(self, max_wait):
+        wait = self.bucket.reserve(max_wait)
+        if wait is not None:
+            self.reserved += 1
+        return wait
+
+
+def make_client(model, **settings):
+    return GeminiClient(model, {"retry_base_delay": 0.0, "retry_max_delay": 0.0, **settings})
+
+
+def test_every_attempt_claims_a_token(tmp_path):
+    model = FlakyModel(2)
+    client = make_client(model, requests_per_minute=600)
+    client.bucket = CountingBucket(client.bucket)
+    assert client.generate("prompt", 10) == "text"
+    assert model.calls == client.bucket.reserved == 3
+
+    model = FlakyModel(1)
+    client = make_client(model, requests_per_minute=600)
+    client.bucket = CountingBucket(client.bucket)
+    segment = StreamSegment(tmp_path)
+    assert client.generate_stream("prompt", 10, segment) == len("streamed text")
+    assert model.calls == client.bucket.reserved == 2
+    segment.discard()
+
+
+def test_async_retry_claims_a_token_and_closes_the_breaker():
+    model = AsyncFlakyModel(1)
+    client = make_client(model, requests_per_minute=600, failure_threshold=3)
+    client.bucket = CountingBucket(client.bucket)
+    client.breaker.failures = 2
+
+    assert asyncio.run(client.generate_async("prompt", 10)) == "text"
+    assert model.calls == client.bucket.reserved == 2
+    # The retried error is not a breaker failure, the success closes it
+    assert client.breaker.to_dict() == {"state": "closed", "failures": 0, "opened_at": None}
+
+
+def test_retries_stop_when_the_quota_is_spent():
+    model = FlakyModel(5)
+    client = make_client(model, requests_per_minute=1)
+    with pytest.raises(TimeoutError):
+        client.generate("prompt", 5)
+    assert model.calls == 1
+    assert client.breaker.failures == 1
+
+
+def test_late_stream_completion_keeps_the_abandoning_failure(tmp_path):
+    client = make_client(FlakyModel(0), failure_threshold=3)
+    client.breaker.failures = 2
+    segment = StreamSegment(tmp_path)
+
+    def abandon(*args):
+        # The caller gives up between the worker's last chunk and its success
+        segment.abandon()
+        client.breaker.record_failure()
+    client.charge = abandon
+
+    client.generate_stream("prompt", 10, segment)
+    assert client.breaker.state == "open"
+    assert client.breaker.failures == 3
+    segment.discard()
@@ -0,0 +1,60 @@
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from content_validator import is_valid, validate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from gemini_standin import StandinServer, StandinState  # noqa: E402
+
+PROMPT = """Write a concise technical learning note about: Caching
+
+Format:
+# Caching
+
+## Overview
+## Key Concepts
+## Practical Example
+## Key Takeaways
+"""
+
+
+def post(server, method, query=""):
+    body = json.dumps({"contents": [{"parts": [{"text": PROMPT}], "role": "user"}]}).encode('utf-8')
+    request = urllib.request.Request(f"{server.endpoint}/v1beta/models/gemini-2.5-flash:{method}{query}",
+                                     data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.read().decode('utf-8')
+
+
+def test_standin_replies_in_layout_then_rate_limits():
+    server = StandinServer(StandinState("fixed:1", requests_per_minute=2, stream_chunks=3, seed=1)).start()
+    try:
+        reply = json.loads(post(server, "generateContent"))
+        text = reply["candidates"][0]["content"]["parts"][0]["text"]
+        assert is_valid(validate(text, "learning_note"))
+        assert reply["usageMetadata"]["candidatesTokenCount"] == len(text) // 4
+
+        events = [json.loads(line[len("data: "):]) for line in
+                  post(server, "streamGenerateContent", "?alt=sse").splitlines() if line.startswith("data: ")]
+        assert len(events) == 3
+        assert "usageMetadata" in events[-1] and "usageMetadata" not in events[0]
+        streamed = "".join(event["candidates"][0]["content"]["parts"][0]["text"] for event in events)
+        assert is_valid(validate(streamed, "learning_note"))
+
+        with pytest.raises(urllib.error.HTTPError) as info:
+            post(server, "generateContent")
+        assert info.value.code == 429
+        assert json.loads(info.value.read())["error"]["status"] == "RESOURCE_EXHAUSTED"
+
+        stats = server.state.stats()
+        assert stats["by_status"] == {"200": 2, "429": 1}
+        assert stats["streamed"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
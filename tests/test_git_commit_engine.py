@@ -0,0 +1,72 @@
+import subprocess
+
+import pytest
+
+from git_commit_engine import GitCommitEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Test Bot")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "bot@example.com")
+    git_dir = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(git_dir)], check=True)
+    work = tmp_path / "work"
+    work.mkdir()
+    return GitCommitEngine(work, git_dir=git_dir, index_file=tmp_path / "index")
+
+
+def tree_of(engine, commit):
+    listing = engine.git("ls-tree", "-r", "--name-only", commit).split("\n")
+    return [path for path in listing if path]
+
+
+def test_commits_manifest_into_bare_repository(engine):
+    work = engine.repo_dir
+    (work / "log.txt").write_text("Update at 2026-10-17 12:00:00 UTC\n")
+    (work / "notes").mkdir()
+    (work / "notes" / "a.md").write_text("# A\n")
+    (work / "untracked.txt").write_text("left alone\n")
+
+    first = engine.commit(["log.txt", "notes"], "First run")
+    assert first and engine.head() == first
+    assert tree_of(engine, first) == ["log.txt", "notes/a.md"]
+    assert engine.git("rev-list", "--parents", "-n", "1", first).split() == [first]
+    assert engine.git("log", "-1", "--format=%s", first).strip() == "First run"
+
+    (work / "log.txt").write_text("Update at 2026-10-17 18:00:00 UTC\n")
+    (work / "notes" / "a.md").unlink()
+    (work / "notes" / "b.md").write_text("# B\n")
+
+    second = engine.commit(["log.txt", "notes"], "Second run")
+    assert engine.git("rev-list", "--parents", "-n", "1", second).split() == [second, first]
+    assert tree_of(engine, second) == ["log.txt", "notes/b.md"]
+    assert engine.git("show", f"{second}:log.txt") == "Update at 2026-10-17 18:00:00 UTC\n"
+
+
+def test_nothing_to_commit_returns_none(engine):
+    (engine.repo_dir / "log.txt").write_text("Update at 2026-10-17 12:00:00 UTC\n")
+    first = engine.commit(["log.txt"], "First run")
+
+    assert engine.commit(["log.txt"], "Same content") is None
+    assert engine.commit([], "Empty manifest") is None
+    assert engine.head() == first
+
+
+def test_directories_skip_temp_and_ignored_files(engine):
+    work = engine.repo_dir
+    (work / ".gitignore").write_text("*.log\n")
+    (work / "notes").mkdir()
+    (work / "notes" / "a.md").write_text("# A\n")
+    (work / "notes" / "a.md.tmp").write_text("# A, half written\n")
+    (work / "notes" / "debug.log").write_text("ignored\n")
+
+    first = engine.commit([".gitignore", "notes"], "First run")
+    assert tree_of(engine, first) == [".gitignore", "notes/a.md"]
+
+    # A committed file under a new ignore rule is still updated
+    (work / ".gitignore").write_text("*.log\n*.md\n")
+    (work / "notes" / "a.md").write_text("# A, edited\n")
+    second = engine.commit(["notes"], "Second run")
+    assert engine.git("show", f"{second}:notes/a.md") == "# A, edited\n"
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from log_index import LogIndex
+
+
+def entry(day):
+    return f"[AUTO] Update at 2026-10-{day:02d} 09:00:00 UTC"
+
+
+def test_index_matches_a_full_scan_after_appends(tmp_path):
+    log_file = tmp_path / "autonomous_logs.txt"
+    log_file.write_text("# Autonomous Bot Activity Log\n\n" + entry(1) + "\n", encoding='utf-8')
+
+    index = LogIndex(log_file)
+    for day in (2, 3):
+        index.append(entry(day))
+    # Another writer appends behind this index's back
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(entry(4) + "\n")
+
+    assert index.entry_count == 4
+    assert index.tail(2) == [entry(3), entry(4)]
+    assert index.last_timestamp == datetime(2026, 10, 4, 9)
+    assert index.uptime_days(datetime(2026, 10, 11, 9)) == 10
+
+    fresh = LogIndex(log_file, tmp_path / "rescan.idx.json")
+    fresh.sync()
+    assert fresh.data == index.data
+
+    # A log rewritten shorter is indexed from scratch
+    log_file.write_text(entry(5) + "\n", encoding='utf-8')
+    assert index.entry_count == 1
+    assert index.first_timestamp == index.last_timestamp == datetime(2026, 10, 5, 9)
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from log_segments import SegmentedLog
+
+
+def entry(month, day):
+    return f"[AUTO] Update at 2026-{month:02d}-{day:02d} 09:00:00 UTC"
+
+
+def test_closed_months_rotate_into_readable_segments(tmp_path):
+    log_file = tmp_path / "autonomous_logs.txt"
+    log_file.write_text("# Autonomous Bot Activity Log\n\n", encoding='utf-8')
+    log = SegmentedLog(log_file, tmp_path / "logs", max_bytes=0)
+
+    for day in (1, 2, 3):
+        log.append(entry(9, day), datetime(2026, 9, day, 9))
+    log.append(entry(10, 1), datetime(2026, 10, 1, 9))
+
+    assert [segment["name"] for segment in log.manifest["segments"]] == ["2026-09.txt.gz"]
+    assert log_file.read_text(encoding='utf-8') == "# Autonomous Bot Activity Log\n\n" + entry(10, 1) + "\n"
+    assert log.index.entry_count == 4
+    assert log.index.first_timestamp == datetime(2026, 9, 1, 9)
+
+    assert list(log.iter_entries()) == [entry(9, 1), entry(9, 2), entry(9, 3), entry(10, 1)]
+    assert log.tail(2) == [entry(9, 3), entry(10, 1)]
+    assert list(log.seek(datetime(2026, 9, 2, 12))) == [entry(9, 3), entry(10, 1)]
+
+
+def test_oversized_live_log_appends_to_the_month_segment(tmp_path):
+    log_file = tmp_path / "autonomous_logs.txt"
+    log = SegmentedLog(log_file, tmp_path / "logs", max_bytes=100)
+
+    for day in range(1, 9):
+        log.append(entry(10, day), datetime(2026, 10, day, 9))
+
+    segment, = log.manifest["segments"]
+    assert segment["month"] == "2026-10"
+    assert segment["entries"] + len(list(log.iter_live())) == 8
+    # Two gzip members in one segment read back as one stream
+    assert segment["entries"] > 2
+    assert list(log.iter_entries()) == [entry(10, day) for day in range(1, 9)]
+    assert log.index.entry_count == 8
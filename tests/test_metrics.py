@@ -0,0 +1,55 @@
+import json
+import os
+import time
+
+from metrics import MetricsExporter, RunMetrics, bytes_written, snapshot_files
+
+
+def run_record(success):
+    metrics = RunMetrics("ai")
+    metrics.record_stage("notes", 20.0, 512)
+    metrics.record_call(time.perf_counter(), "prompt é", response_bytes=300, tokens={"prompt": 4, "response": 75})
+    metrics.record_call(time.perf_counter(), "prompt", error=TimeoutError("deadline"))
+    metrics.record_fallback("learning_note")
+    return metrics.to_dict("2026-10-17 09:00:00", "ai_enhanced", success, 1500.0)
+
+
+def test_runs_accumulate_into_the_textfile(tmp_path):
+    exporter = MetricsExporter(tmp_path / "metrics")
+    assert exporter.export(run_record(True), now=100)
+    assert exporter.export(run_record(False), now=200)
+
+    record = json.loads((tmp_path / "metrics" / "last_run.json").read_text(encoding='utf-8'))
+    assert record["gemini"]["calls"] == 2 and record["gemini"]["failed"] == 1
+    assert record["gemini"]["prompt_bytes"] == len("prompt é".encode('utf-8')) + len("prompt")
+    assert record["gemini"]["requests"][1]["error"] == "TimeoutError"
+
+    lines = (tmp_path / "metrics" / "bot_metrics.prom").read_text(encoding='utf-8').splitlines()
+    assert 'bot_runs_total{bot="ai",result="failure"} 1' in lines
+    assert 'bot_runs_total{bot="ai",result="success"} 1' in lines
+    assert 'bot_stage_duration_seconds_bucket{bot="ai",stage="notes",le="0.025"} 2' in lines
+    assert 'bot_stage_duration_seconds_bucket{bot="ai",stage="notes",le="0.01"} 0' in lines
+    assert 'bot_stage_duration_seconds_count{bot="ai",stage="notes"} 2' in lines
+    assert 'bot_gemini_requests_total{bot="ai",result="error"} 2' in lines
+    assert 'bot_gemini_tokens_total{bot="ai",type="response"} 150' in lines
+    assert 'bot_content_fallbacks_total{bot="ai",kind="learning_note"} 2' in lines
+    assert 'bot_last_run_timestamp_seconds{bot="ai"} 200' in lines
+    assert sorted(path.name for path in (tmp_path / "metrics").iterdir()) == \
+        ["bot_metrics.prom", "last_run.json", "state.json"]
+
+
+def test_bytes_written_counts_appends_and_rewrites(tmp_path):
+    log_file = tmp_path / "log.txt"
+    challenge = tmp_path / "challenge.md"
+    log_file.write_text("a" * 100)
+    challenge.write_text("b" * 50)
+    before = snapshot_files([tmp_path])
+
+    with open(log_file, 'a') as f:
+        f.write("a" * 20)
+    challenge.write_text("c" * 40)
+    os.utime(challenge, ns=(0, before[os.path.normpath(challenge)][1] + 1))
+    (tmp_path / "new.md").write_text("d" * 7)
+
+    paths = [log_file, challenge, tmp_path / "new.md", tmp_path / "missing.md"]
+    assert bytes_written(paths, before) == 20 + 40 + 7
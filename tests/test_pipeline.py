@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from pipeline import Pipeline, PipelineError
+
+
+def test_stages_follow_the_graph_and_run_side_by_side():
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def stage(name, meet=False):
+        def run():
+            if meet:
+                # Only passes when both independent stages run at once
+                barrier.wait()
+            order.append(name)
+            return name.upper()
+        return run
+
+    pipeline = Pipeline(max_workers=2)
+    pipeline.add("load", stage("load"))
+    pipeline.add("notes", stage("notes", meet=True), depends=["load"])
+    pipeline.add("challenge", stage("challenge", meet=True), depends=["load"])
+    pipeline.add("readme", stage("readme"), depends=["notes", "challenge"])
+
+    assert pipeline.run() == {"load": "LOAD", "notes": "NOTES", "challenge": "CHALLENGE", "readme": "README"}
+    assert order[0] == "load" and order[-1] == "readme"
+    assert set(pipeline.timings) == set(pipeline.stages)
+
+    with pytest.raises(ValueError):
+        pipeline.add("commit", stage("commit"), depends=["push"])
+
+
+def test_failed_stage_stops_its_dependents():
+    ran = []
+
+    def fail():
+        raise OSError("disk full")
+
+    pipeline = Pipeline()
+    pipeline.add("notes", fail)
+    pipeline.add("readme", lambda: ran.append("readme"), depends=["notes"])
+
+    with pytest.raises(PipelineError) as info:
+        pipeline.run()
+    assert info.value.stage == "notes"
+    assert isinstance(info.value.error, OSError)
+    assert ran == []
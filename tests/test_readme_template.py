@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from readme_template import ReadmeTemplate
+
+NOW = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+
+LAYOUT = """# Bot
+
+Mode: {mode}
+
+<!-- readme-stats -->
+Runs: {total_runs}
+<!-- /readme-stats -->
+"""
+
+
+def test_splices_only_the_stats_block(tmp_path):
+    readme = tmp_path / "README.md"
+    template = ReadmeTemplate(LAYOUT, volatile=("total_runs",))
+
+    changed, state = template.write(readme, {"total_runs": 1, "mode": "ai"}, NOW)
+    assert changed
+    assert readme.read_text(encoding='utf-8') == template.render({"total_runs": 1, "mode": "ai"})
+    assert not readme.read_text(encoding='utf-8').startswith("<!--")
+
+    # Text outside the block is kept as edited
+    readme.write_text(readme.read_text(encoding='utf-8').replace("# Bot", "# My bot"), encoding='utf-8')
+
+    assert template.write(readme, {"total_runs": 2, "mode": "ai"}, NOW + timedelta(hours=1), state) == \
+        (False, state)
+    changed, state = template.write(readme, {"total_runs": 3, "mode": "ai"}, NOW + timedelta(hours=13), state)
+    assert changed
+    assert readme.read_text(encoding='utf-8') == "# My bot\n\nMode: ai\n\n" \
+        "<!-- readme-stats -->\nRuns: 3\n<!-- /readme-stats -->\n"
+    assert state["updated"] == "2026-10-18 01:00:00"
+
+    # A stable stat renders the whole file again
+    changed, _ = template.write(readme, {"total_runs": 4, "mode": "template"}, NOW + timedelta(hours=14), state)
+    assert changed
+    assert readme.read_text(encoding='utf-8').startswith("# Bot\n\nMode: template\n")
+    assert [path.name for path in tmp_path.iterdir()] == ["README.md"]
+
+
+def test_unmarked_readme_is_rendered_whole(tmp_path):
+    readme = tmp_path / "README.md"
+    readme.write_text("# Old README\n", encoding='utf-8')
+    template = ReadmeTemplate(LAYOUT, volatile=("total_runs",))
+    state = {"layout": template.layout_hash, "stats": template.stats_hash({"total_runs": 1, "mode": "ai"})}
+
+    assert template.write(readme, {"total_runs": 1, "mode": "ai"}, NOW, state)[0]
+    assert readme.read_text(encoding='utf-8') == template.render({"total_runs": 1, "mode": "ai"})
+
+
+def test_volatile_fields_must_sit_in_blocks():
+    with pytest.raises(ValueError):
+        ReadmeTemplate("Runs: {total_runs}\n", volatile=("total_runs",))
+
+
+def test_failed_render_keeps_previous_readme(tmp_path):
+    readme = tmp_path / "README.md"
+    template = ReadmeTemplate(LAYOUT)
+    template.write(readme, {"total_runs": 1, "mode": "ai"}, NOW)
+    previous = readme.read_text(encoding='utf-8')
+
+    with pytest.raises(KeyError):
+        template.write(readme, {"total_runs": 2}, NOW)
+    assert readme.read_text(encoding='utf-8') == previous
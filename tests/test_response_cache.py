@@ -0,0 +1,53 @@
+import pytest
+
+import response_cache
+from response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_round_trip_ttl_and_lru_eviction(tmp_path, monkeypatch):
+    clock = Clock(1000.0)
+    monkeypatch.setattr(response_cache, "time", clock)
+    cache = ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60, max_entries=2)
+
+    cache.put("gemini", "a", "answer a")
+    clock.now += 1
+    cache.put_chunks("gemini", "b", ["answer ", "b"])
+    assert cache.get("gemini", "b") == "answer b"
+    assert cache.get("other-model", "b") is None
+
+    # a is now the least recently used entry
+    clock.now += 1
+    assert cache.get("gemini", "a") == "answer a"
+    clock.now += 1
+    cache.put("gemini", "c", "answer c")
+    assert len(cache) == 2
+    assert cache.get("gemini", "b") is None
+
+    clock.now += 61
+    assert cache.get("gemini", "a") is None
+    assert (cache.hits, cache.misses) == (2, 3)
+    cache.close()
+
+
+def test_failed_stream_is_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+
+    def chunks():
+        yield "half an "
+        raise TimeoutError("stream dropped")
+
+    with pytest.raises(TimeoutError):
+        cache.put_chunks("gemini", "prompt", chunks())
+    cache.put("gemini", "other", "answer")
+
+    assert cache.get("gemini", "prompt") is None
+    assert len(cache) == 1
+    cache.close()
@@ -0,0 +1,34 @@
+import json
+
+from run_events import RunEventLog, make_event
+
+
+def test_migrate_keeps_legacy_entries_of_bots_without_native_events(tmp_path):
+    events = RunEventLog(tmp_path / "run_events.jsonl")
+    events.append(make_event("2026-10-01 09:00:00", "ai", "4.0", "ai_enhanced"))
+    events.append(make_event("2026-10-02 09:00:00", "ai", "4.0", "ai_enhanced"))
+
+    # log.txt from daily_commit.py interleaved with the AI bot's activity log
+    legacy_lines = [
+        "Update at 2026-09-30 08:00:00 UTC\n",
+        "Update at 2026-10-01 12:00:00 UTC\n",
+        "Update at 2026-10-03 12:00:00 UTC\n",
+        "[AI] Update at 2026-09-30 09:00:00 UTC\n",
+        "[AI] Update at 2026-10-01 09:00:00 UTC\n",
+        "[AI] Update at 2026-10-02 09:00:01 UTC\n",
+    ]
+
+    assert events.migrate(legacy_lines) == 4
+    records = [json.loads(line) for line in (tmp_path / "run_events.jsonl").read_text().splitlines()]
+    assert [(event["bot"], event["timestamp"], event["source"]) for event in records] == [
+        ("daily_commit", "2026-09-30 08:00:00", "legacy"),
+        ("daily_commit", "2026-10-01 12:00:00", "legacy"),
+        ("daily_commit", "2026-10-03 12:00:00", "legacy"),
+        ("ai", "2026-09-30 09:00:00", "legacy"),
+        ("ai", "2026-10-01 09:00:00", "run"),
+        ("ai", "2026-10-02 09:00:00", "run"),
+    ]
+
+    # A second migration rewrites the same legacy records instead of adding more
+    assert events.migrate(legacy_lines) == 4
+    assert events.summarize()["runs"] == 6
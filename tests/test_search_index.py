@@ -0,0 +1,46 @@
+import os
+
+from search_index import SEPARATOR, SearchIndex
+
+SEP = SEPARATOR.decode('utf-8')
+
+
+def note(generated, title, body):
+    return f"*Generated: {generated} UTC*\n\n# {title}\n\n{body}\n"
+
+
+def test_appended_notes_are_indexed_at_their_offsets(tmp_path):
+    notes_dir = tmp_path / "ai_notes"
+    challenges_dir = tmp_path / "coding_challenges"
+    notes_dir.mkdir()
+    challenges_dir.mkdir()
+    notes_file = notes_dir / "learning_2026-10.md"
+    notes_file.write_text("# AI Learning Notes - October 2026\n\n"
+                          + note("2026-10-01 09:00:00", "Git rebasing", "Rebase keeps history linear."),
+                          encoding='utf-8')
+    challenge_file = challenges_dir / "challenge_2026-10-01.md"
+    challenge_file.write_text("# Challenge: Two Sum\n\nUse a hash map.\n", encoding='utf-8')
+
+    index = SearchIndex(notes_dir, challenges_dir, tmp_path / "search.sqlite3")
+    assert index.sync() == 2
+    assert index.sync() == 0
+
+    with open(notes_file, 'a', encoding='utf-8') as f:
+        f.write(SEP + note("2026-10-02 09:00:00", "Memoization", "Cache pure function results."))
+    assert index.sync() == 1
+
+    hit, = index.search("memoization")
+    assert (hit["title"], hit["generated"], hit["kind"]) == ("Memoization", "2026-10-02 09:00:00", "learning_note")
+    with open(notes_file, 'rb') as f:
+        f.seek(hit["offset"])
+        assert f.readline() == b"*Generated: 2026-10-02 09:00:00 UTC*\n"
+    assert [hit["title"] for hit in index.search("rebase")] == ["Git rebasing"]
+
+    # A rewritten challenge replaces its old entry
+    challenge_file.write_text("# Challenge: Three Sum\n\nSort, then two pointers.\n", encoding='utf-8')
+    stat = challenge_file.stat()
+    os.utime(challenge_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert index.sync() == 1
+    assert index.search("hash map") == []
+    assert [hit["title"] for hit in index.search("pointers")] == ["Three Sum"]
+    index.close()
@@ -0,0 +1,33 @@
+import json
+
+from state_store import DEFAULT_CONFIG, StateStore, merge_defaults
+
+
+def test_partial_nested_sections_keep_their_defaults(tmp_path):
+    config_file = tmp_path / "bot_config.json"
+    config_file.write_text(json.dumps({
+        "ai_features": {"response_cache": {"ttl_hours": 6}, "resilience": {"max_retries": 5}},
+        "daemon": {"jitter_minutes": 5}
+    }), encoding='utf-8')
+    store = StateStore(config_file, tmp_path / "bot_status.json")
+
+    config = store.load_config({"ai_features": {
+        "streaming": False,
+        "response_cache": {"enabled": True, "ttl_hours": 2, "max_entries": 200},
+        "resilience": {"requests_per_minute": 10, "max_retries": 3}
+    }})
+    assert config["ai_features"] == {
+        "streaming": False,
+        "response_cache": {"enabled": True, "ttl_hours": 6, "max_entries": 200},
+        "resilience": {"requests_per_minute": 10, "max_retries": 5}
+    }
+    assert config["daemon"] == {**DEFAULT_CONFIG["daemon"], "jitter_minutes": 5}
+
+
+def test_merged_sections_never_share_the_defaults():
+    merged = merge_defaults(DEFAULT_CONFIG, {})
+    merged["daemon"]["bots"] = ["enhanced"]
+    merged["metrics"]["enabled"] = False
+
+    assert DEFAULT_CONFIG["daemon"]["bots"] == ["ai"]
+    assert DEFAULT_CONFIG["metrics"]["enabled"] is True
@@ -0,0 +1,52 @@
+import pytest
+
+import stream_segment
+from stream_segment import SegmentAbandoned, StreamSegment
+
+
+def test_segment_round_trip_and_splices(tmp_path):
+    segment = StreamSegment(tmp_path / "stream")
+    segment.write("discarded by the retry")
+    segment.reset()
+    for chunk in ("# Café notes\n", "ü" * 5000, "\nend\n"):
+        segment.write(chunk)
+
+    text = "# Café notes\n" + "ü" * 5000 + "\nend\n"
+    assert segment.size == len(text)
+    assert "".join(segment.iter_chunks(1000)) == text
+    assert "".join(segment.iter_lines()) == text
+
+    notes = tmp_path / "notes.md"
+    notes.write_text("# Header\n", encoding='utf-8')
+    segment.splice_append(notes, prefix="\n---\n")
+    assert notes.read_text(encoding='utf-8') == "# Header\n\n---\n" + text
+    assert list((tmp_path / "stream").iterdir()) == []
+
+    segment = StreamSegment(tmp_path / "stream")
+    segment.write("# Challenge\n")
+    challenge = tmp_path / "challenge.md"
+    challenge.write_text("old\n", encoding='utf-8')
+    segment.splice_replace(challenge, prefix="*Generated*\n")
+    assert challenge.read_text(encoding='utf-8') == "*Generated*\n# Challenge\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["challenge.md", "notes.md", "stream"]
+
+
+def test_failed_splice_leaves_the_target_untouched(tmp_path, monkeypatch):
+    notes = tmp_path / "notes.md"
+    notes.write_text("# Header\n", encoding='utf-8')
+    segment = StreamSegment(tmp_path / "stream")
+    segment.write("new entry\n")
+
+    def copy_half(source, out, size):
+        out.write(source.read(4))
+        raise OSError("disk full")
+    monkeypatch.setattr(stream_segment.shutil, "copyfileobj", copy_half)
+
+    with pytest.raises(OSError):
+        segment.splice_append(notes, prefix="\n")
+    assert notes.read_text(encoding='utf-8') == "# Header\n"
+
+    segment.abandon()
+    with pytest.raises(SegmentAbandoned):
+        segment.write("late chunk")
+    segment.discard()
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from gemini_client import GeminiClient
+from token_ledger import BudgetExhaustedError, TokenLedger
+
+SETTINGS = {"daily_tokens": 1000, "monthly_tokens": 1500, "max_output_tokens": 400,
+            "reduced_output_tokens": 100, "reduce_at": 0.5, "retention_days": 30}
+
+
+class Model:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        raise AssertionError("called over budget")
+
+
+def test_budget_shrinks_then_stops_output():
+    now = [datetime(2026, 10, 16, 9, tzinfo=timezone.utc)]
+    ledger = TokenLedger({"2026-08-01": {"input": 5, "output": 5, "calls": 1, "usd": 0.0}},
+                         SETTINGS, clock=lambda: now[0])
+
+    assert ledger.output_limit() == 400
+    ledger.charge(300, 300)
+    assert ledger.output_limit() == 100
+    assert ledger.usage()["day"] == {"tokens": 600, "calls": 1, "usd": round((300 * 0.30 + 300 * 2.50) / 1e6, 6)}
+
+    # The next day starts fresh, the month keeps counting
+    now[0] = datetime(2026, 10, 17, 9, tzinfo=timezone.utc)
+    assert ledger.output_limit() == 400
+    ledger.charge(400, 500)
+    assert ledger.usage()["month"]["tokens"] == 1500
+    with pytest.raises(BudgetExhaustedError):
+        ledger.output_limit()
+
+    model = Model()
+    with pytest.raises(BudgetExhaustedError):
+        GeminiClient(model, ledger=ledger).generate("prompt", 5)
+    assert model.calls == 0
+
+    assert list(ledger.to_dict()) == ["2026-10-16", "2026-10-17"]
+    assert ("2026-10-17", "output", 500) in ledger.increments()
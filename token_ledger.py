@@ -0,0 +1,127 @@
+"""
+Token ledger
+Rolling per-day record of Gemini input and output tokens and their cost,
+kept in bot_status.json, with the daily and monthly budget checks that
+set the output limit of the next request.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_BUDGET = {
+    "enabled": True,
+    "daily_tokens": 200000,
+    "monthly_tokens": 4000000,
+    "max_output_tokens": 2048,
+    "reduced_output_tokens": 1024,
+    "reduce_at": 0.8,
+    "input_usd_per_million": 0.30,
+    "output_usd_per_million": 2.50,
+    "retention_days": 62
+}
+
+
+class BudgetExhaustedError(Exception):
+    """The daily or monthly token budget is used up, using fallback"""
+
+
+def estimate_tokens(size):
+    """Rough token count of size characters when no usage metadata came back"""
+    return max(1, size // 4)
+
+
+class TokenLedger:
+    """Per-day token totals with budget-derived output limits"""
+
+    def __init__(self, days=None, settings=None, clock=None):
+        self.settings = {**DEFAULT_BUDGET, **(settings or {})}
+        self.days = {day: dict(entry) for day, entry in (days or {}).items()}
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.lock = threading.Lock()
+        # This process's own charges, merged into the status file as increments
+        self.charged = {}
+
+    def day_key(self):
+        """Ledger key of the current day"""
+        return self.clock().strftime("%Y-%m-%d")
+
+    def cost(self, input_tokens, output_tokens):
+        """USD cost of a token count at the configured prices"""
+        return round(input_tokens * self.settings["input_usd_per_million"] / 1e6
+                     + output_tokens * self.settings["output_usd_per_million"] / 1e6, 6)
+
+    def charge(self, input_tokens, output_tokens):
+        """Book one successful call on today's entry"""
+        with self.lock:
+            entry = self.days.setdefault(self.day_key(), {"input": 0, "output": 0, "calls": 0, "usd": 0.0})
+            entry["input"] += input_tokens
+            entry["output"] += output_tokens
+            entry["calls"] += 1
+            entry["usd"] = self.cost(entry["input"], entry["output"])
+
+            own = self.charged.setdefault(self.day_key(), {"input": 0, "output": 0, "calls": 0, "usd": 0.0})
+            own["input"] += input_tokens
+            own["output"] += output_tokens
+            own["calls"] += 1
+            own["usd"] = self.cost(own["input"], own["output"])
+
+    def usage(self):
+        """Token totals of today and of the current month"""
+        today = self.day_key()
+        month = today[:7]
+        with self.lock:
+            day_entry = self.days.get(today, {})
+            month_entries = [entry for day, entry in self.days.items() if day.startswith(month)]
+
+        def total(entries, key):
+            return sum(entry.get(key, 0) for entry in entries)
+
+        return {
+            "day": {
+                "tokens": day_entry.get("input", 0) + day_entry.get("output", 0),
+                "calls": day_entry.get("calls", 0),
+                "usd": day_entry.get("usd", 0.0)
+            },
+            "month": {
+                "tokens": total(month_entries, "input") + total(month_entries, "output"),
+                "calls": total(month_entries, "calls"),
+                "usd": round(total(month_entries, "usd"), 6)
+            }
+        }
+
+    def output_limit(self):
+        """max_output_tokens for the next call, raising once the budget is spent"""
+        if not self.settings["enabled"]:
+            return self.settings["max_output_tokens"]
+
+        usage = self.usage()
+        daily, monthly = self.settings["daily_tokens"], self.settings["monthly_tokens"]
+        remaining = min(daily - usage["day"]["tokens"], monthly - usage["month"]["tokens"])
+        if remaining <= 0:
+            raise BudgetExhaustedError(
+                f"Gemini token budget reached ({usage['day']['tokens']}/{daily} today, "
+                f"{usage['month']['tokens']}/{monthly} this month)"
+            )
+
+        spent = max(usage["day"]["tokens"] / daily, usage["month"]["tokens"] / monthly)
+        limit = self.settings["max_output_tokens"]
+        if spent >= self.settings["reduce_at"]:
+            limit = self.settings["reduced_output_tokens"]
+        return min(limit, remaining)
+
+    def increments(self):
+        """(day, field, amount) of this process's charges for every kept day
+
+        Days without own charges come with 0 so their totals are still
+        refreshed from the status file rather than overwritten.
+        """
+        days = self.to_dict()
+        with self.lock:
+            return [(day, field, self.charged.get(day, {}).get(field, 0))
+                    for day in days for field in ("input", "output", "calls", "usd")]
+
+    def to_dict(self):
+        """Entries persisted in the status file, older days dropped"""
+        cutoff = (self.clock() - timedelta(days=self.settings["retention_days"])).strftime("%Y-%m-%d")
+        with self.lock:
+            return {day: dict(entry) for day, entry in sorted(self.days.items()) if day > cutoff}